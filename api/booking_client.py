@@ -1,65 +1,180 @@
 import requests
+import httpx
+import importlib.util
 import json
+import re
+import functools
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
 from typing import Dict, List, Any, Optional
 from datetime import datetime, date
 import logging
+import time
+
+try:
+    import msgspec
+except ImportError:  # optional fast path for destination parsing
+    msgspec = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bounds for concurrent fan-out against RapidAPI
+MAX_BATCH_WORKERS = 16
+MAX_IN_FLIGHT_REQUESTS = 16
+# HTTP/2 multiplexing needs the optional h2 package
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Largest response body we are willing to buffer and decode
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024
+
+BOOKING_URL_TEMPLATE = "https://www.booking.com/flights?{qs}"
+_CABIN_MAPPING = {
+    "ECONOMY": "economy",
+    "PREMIUM_ECONOMY": "premium_economy",
+    "BUSINESS": "business",
+    "FIRST": "first"
+}
+_DEFAULT_CABIN = "economy"
+_IATA_RE = re.compile(r'^[A-Z]{3}$')
+# IATA metropolitan-area codes; Booking.com lists these as cities, not
+# airports, so they still go through the destination lookup
+_METRO_CODES = frozenset({
+    "BJS", "BUE", "CHI", "DTT", "JKT", "LON", "MIL", "MOW", "NYC", "OSA", "PAR",
+    "REK", "RIO", "ROM", "SAO", "SEL", "STO", "TYO", "WAS", "YEA", "YMQ", "YTO",
+})
+_DEST_KEYS = (
+    "id", "type", "name", "code", "city", "cityName", "regionName",
+    "country", "countryName", "distanceToCity", "photoUri"
+)
+
+if msgspec is not None:
+    class Destination(msgspec.Struct):
+        """Destination fields we keep from searchDestination; other keys are skipped while decoding"""
+        id: Any = None
+        type: Any = None  # CITY or AIRPORT
+        name: Any = None
+        code: Any = None
+        city: Any = None
+        cityName: Any = None
+        regionName: Any = None
+        country: Any = None
+        countryName: Any = None
+        distanceToCity: Any = None
+        photoUri: Any = None
+
+    class DestinationResponse(msgspec.Struct):
+        """Envelope of the searchDestination response"""
+        status: Optional[bool] = False
+        message: Optional[str] = ""
+        data: Optional[List[Destination]] = None
+
+@functools.cache
+def _default_headers() -> Dict[str, str]:
+    """Read RAPID_API_KEY once per process and build the RapidAPI headers"""
+    import os
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+    
+    api_key = os.getenv('RAPID_API_KEY')
+    if not api_key:
+        raise ValueError("RAPID_API_KEY environment variable is required")
+    return {
+        'x-rapidapi-host': 'booking-com15.p.rapidapi.com',
+        'x-rapidapi-key': api_key
+    }
+
+class ApiResult:
+    """Outcome of a Booking.com API call; success is an attribute, not a key in the payload"""
+    
+    __slots__ = ("ok", "data", "error")
+    
+    def __init__(self, ok: bool, data: Any = None, error: Optional[str] = None):
+        self.ok = ok
+        self.data = data
+        self.error = error
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict form for JSON callers: the payload on success, {"error": ...} on failure"""
+        return self.data if self.ok else {"error": self.error}
+
 class BookingComClient:
     """Client for Booking.com Rapid API integration"""
     
+    __slots__ = ("base_url", "headers", "session", "_limiter", "_ahttp")
+    
     def __init__(self):
-        import os
-        from dotenv import load_dotenv
-        
-        load_dotenv()
-        
         self.base_url = "https://booking-com15.p.rapidapi.com"
-        api_key = os.getenv('RAPID_API_KEY')
-        if not api_key:
-            raise ValueError("RAPID_API_KEY environment variable is required")
-        self.headers = {
-            'x-rapidapi-host': 'booking-com15.p.rapidapi.com',
-            'x-rapidapi-key': api_key
-        }
+        # Shared across instances; treat as read-only
+        self.headers = _default_headers()
+        # Shared pooled session; urllib3 connection pools are thread-safe
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Caps in-flight requests across all threads using this client
+        self._limiter = threading.BoundedSemaphore(MAX_IN_FLIGHT_REQUESTS)
+        # Async client for multiplexed bulk lookups, created on first use
+        self._ahttp = None
     
-    def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Make a request to the Booking.com API"""
+    def _make_request(self, endpoint: str, params: Dict[str, Any] = None, decode_type: Any = None) -> ApiResult:
+        """
+        Make a request to the Booking.com API
+        
+        When decode_type is a msgspec Struct type, the body is decoded straight
+        into it; otherwise the parsed JSON dict is returned as data.
+        """
         try:
             url = f"{self.base_url}{endpoint}"
-            logger.info(f"Making API request to: {url}")
-            logger.info(f"Parameters: {params}")
+            logger.debug("Making API request to: %s params=%s", url, params)
             
-            response = requests.get(url, headers=self.headers, params=params)
+            with self._limiter:
+                start = time.perf_counter()
+                response = self.session.get(url, params=params)
+                elapsed_ms = (time.perf_counter() - start) * 1000
             
-            logger.info(f"Response status: {response.status_code}")
-            logger.info(f"Response headers: {dict(response.headers)}")
+            logger.info("%s -> %s in %.0fms", endpoint, response.status_code, elapsed_ms)
             
-            # Log response content for debugging (first 500 chars)
-            response_text = response.text[:500]
-            logger.info(f"Response content (first 500 chars): {response_text}")
+            # Header/body dumps are only worth their cost when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response headers: %s", response.headers)
+                logger.debug("Response content (first 500 chars): %s", response.text[:500])
             
             response.raise_for_status()
             
+            # Bail out before decoding bodies we cannot or should not parse
+            content_type = response.headers.get('content-type', '')
+            if 'json' not in content_type:
+                logger.error("Non-JSON response from %s: %s %s", endpoint, content_type, response.text[:200])
+                return ApiResult(ok=False, error=f"Non-JSON response: {content_type}")
+            
+            content_length = response.headers.get('content-length')
+            if content_length and content_length.isdigit() and int(content_length) > MAX_RESPONSE_BYTES:
+                logger.error("Response from %s too large: %s bytes", endpoint, content_length)
+                return ApiResult(ok=False, error=f"Response too large: {content_length} bytes")
+            
+            if decode_type is not None:
+                try:
+                    return ApiResult(ok=True, data=msgspec.json.decode(response.content, type=decode_type))
+                except (msgspec.DecodeError, msgspec.ValidationError) as e:
+                    logger.error("Typed decode error: %s", e)
+                    return ApiResult(ok=False, error=f"Invalid JSON response: {str(e)}")
+            
             try:
-                result = response.json()
-                logger.info(f"Successfully parsed JSON response")
-                return result
+                return ApiResult(ok=True, data=response.json())
             except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error: {e}")
-                logger.error(f"Full response text: {response.text}")
-                return {"error": f"Invalid JSON response: {str(e)}"}
+                logger.error("JSON decode error: %s", e)
+                logger.debug("Full response text: %s", response.text)
+                return ApiResult(ok=False, error=f"Invalid JSON response: {str(e)}")
                 
         except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
+            logger.error("API request failed: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response status: {e.response.status_code}")
-                logger.error(f"Response text: {e.response.text}")
-                return {"error": f"API request failed: {e.response.status_code} - {e.response.text}"}
-            return {"error": f"API request failed: {str(e)}"}
+                logger.error("Response status: %s", e.response.status_code)
+                logger.debug("Response text: %s", e.response.text)
+                return ApiResult(ok=False, error=f"API request failed: {e.response.status_code} - {e.response.text}")
+            return ApiResult(ok=False, error=f"API request failed: {str(e)}")
     
     def search_destination(self, query: str) -> Dict[str, Any]:
         """
@@ -75,29 +190,36 @@ class BookingComClient:
         params = {"query": query}
         
         logger.info(f"Destination search requested for: {query}")
+        
+        if msgspec is not None:
+            result = self._make_request(endpoint, params, decode_type=DestinationResponse)
+            if not result.ok:
+                return result.to_dict()
+            return self._format_destination_struct(result.data)
+        
         result = self._make_request(endpoint, params)
         
-        if "error" in result:
-            return result
+        if not result.ok:
+            return result.to_dict()
         
-        # Extract and format the results
+        return self._format_destination_dict(result.data)
+    
+    @staticmethod
+    def _format_destination_struct(result: Any) -> Dict[str, Any]:
+        """Format a decoded DestinationResponse struct"""
+        return {
+            "status": bool(result.status),
+            "message": result.message or "",
+            "destinations": msgspec.to_builtins(result.data) if result.status and result.data else []
+        }
+    
+    @staticmethod
+    def _format_destination_dict(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Format a searchDestination response parsed as a plain dict"""
+        # Keep only the documented destination fields
         destinations = []
         if result.get("status") and result.get("data"):
-            for item in result["data"]:
-                destination = {
-                    "id": item.get("id"),
-                    "type": item.get("type"),  # CITY or AIRPORT
-                    "name": item.get("name"),
-                    "code": item.get("code"),
-                    "city": item.get("city"),
-                    "cityName": item.get("cityName"),
-                    "regionName": item.get("regionName"),
-                    "country": item.get("country"),
-                    "countryName": item.get("countryName"),
-                    "distanceToCity": item.get("distanceToCity"),
-                    "photoUri": item.get("photoUri")
-                }
-                destinations.append(destination)
+            destinations = [{key: item.get(key) for key in _DEST_KEYS} for item in result["data"]]
         
         return {
             "status": result.get("status", False),
@@ -105,6 +227,63 @@ class BookingComClient:
             "destinations": destinations
         }
     
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the shared async HTTP client, creating it on first use"""
+        if self._ahttp is None or self._ahttp.is_closed:
+            self._ahttp = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                timeout=15.0
+            )
+        return self._ahttp
+    
+    async def _search_destination_async(self, client: httpx.AsyncClient, query: str) -> Dict[str, Any]:
+        """Run one searchDestination call on the shared async client"""
+        try:
+            response = await client.get("/api/v1/flights/searchDestination", params={"query": query})
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error("Bulk destination search failed for %s: %s", query, e)
+            return {"error": f"API request failed: {str(e)}"}
+        
+        content_type = response.headers.get('content-type', '')
+        if 'json' not in content_type:
+            return {"error": f"Non-JSON response: {content_type}", "body": response.text[:200]}
+        
+        try:
+            if msgspec is not None:
+                return self._format_destination_struct(
+                    msgspec.json.decode(response.content, type=DestinationResponse)
+                )
+            return self._format_destination_dict(response.json())
+        except (ValueError, TypeError) as e:
+            # msgspec.DecodeError/ValidationError and json.JSONDecodeError are ValueErrors
+            logger.error("Invalid destination response for %s: %s", query, e)
+            return {"error": f"Invalid JSON response: {str(e)}"}
+    
+    async def search_destinations_bulk(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Search several destinations concurrently over one pooled connection
+        
+        Args:
+            queries: Search queries (city names, airport codes, etc.)
+            
+        Returns:
+            List of search_destination-shaped results in the same order as queries
+        """
+        client = self._get_async_client()
+        return list(await asyncio.gather(*(
+            self._search_destination_async(client, query) for query in queries
+        )))
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client if one was opened"""
+        if self._ahttp is not None:
+            await self._ahttp.aclose()
+            self._ahttp = None
+    
     def search_flights(self, 
                       from_id: str,
                       to_id: str,
@@ -156,64 +335,12 @@ class BookingComClient:
         logger.info(f"Flight search requested: {from_id} to {to_id} on {depart_date}")
         result = self._make_request(endpoint, params)
         
-        if "error" in result:
-            return result
+        if not result.ok:
+            return result.to_dict()
         
         # Return the full response for now, will be processed based on actual response structure
-        return result
-    
-    def search_hotels(self,
-                     location: str,
-                     check_in: str,
-                     check_out: str,
-                     adults: int = 1,
-                     rooms: int = 1) -> Dict[str, Any]:
-        """
-        Search for hotels using Booking.com API
-        
-        Args:
-            location: Destination location
-            check_in: Check-in date (YYYY-MM-DD)
-            check_out: Check-out date (YYYY-MM-DD)
-            adults: Number of adult guests
-            rooms: Number of rooms
-        """
-        # This will be implemented once we have the specific endpoint details
-        logger.info(f"Hotel search requested: {location} from {check_in} to {check_out}")
-        return {"message": "Hotel search endpoint to be implemented with specific API details"}
-    
-    def search_activities(self,
-                         location: str,
-                         date: str,
-                         participants: int = 1) -> Dict[str, Any]:
-        """
-        Search for activities using Booking.com API
-        
-        Args:
-            location: Destination location
-            date: Activity date (YYYY-MM-DD)
-            participants: Number of participants
-        """
-        # This will be implemented once we have the specific endpoint details
-        logger.info(f"Activity search requested: {location} on {date}")
-        return {"message": "Activity search endpoint to be implemented with specific API details"}
+        return result.data
     
-    def search_restaurants(self,
-                          location: str,
-                          date: str,
-                          guests: int = 2) -> Dict[str, Any]:
-        """
-        Search for restaurants using Booking.com API
-        
-        Args:
-            location: Destination location
-            date: Reservation date (YYYY-MM-DD)
-            guests: Number of guests
-        """
-        # This will be implemented once we have the specific endpoint details
-        logger.info(f"Restaurant search requested: {location} on {date}")
-        return {"message": "Restaurant search endpoint to be implemented with specific API details"}
-
     def get_destination_id(self, query: str, destination_type: str = "AIRPORT") -> Optional[str]:
         """
         Get the first matching destination ID for a given query
@@ -243,6 +370,19 @@ class BookingComClient:
         
         return None
     
+    def _resolve_location_id(self, location: str) -> Optional[str]:
+        """
+        Resolve a location to a flight search ID, skipping the API for IATA codes
+        
+        Booking.com airport IDs take the form "<IATA>.AIRPORT", so a bare
+        three-letter airport code can be used directly without a destination
+        lookup. Metro codes such as NYC name cities and are looked up.
+        """
+        code = location.strip()
+        if _IATA_RE.match(code) and code not in _METRO_CODES:
+            return f"{code}.AIRPORT"
+        return self.get_destination_id(location, "AIRPORT")
+    
     def search_flights_by_location(self,
                                   from_location: str,
                                   to_location: str,
@@ -272,8 +412,8 @@ class BookingComClient:
             currency_code: Currency code (USD, EUR, AED, etc.)
         """
         # Get destination IDs
-        from_id = self.get_destination_id(from_location, "AIRPORT")
-        to_id = self.get_destination_id(to_location, "AIRPORT")
+        from_id = self._resolve_location_id(from_location)
+        to_id = self._resolve_location_id(to_location)
         
         if not from_id:
             return {"error": f"Could not find departure location: {from_location}"}
@@ -318,45 +458,24 @@ class BookingComClient:
         Returns:
             Booking.com URL for flight search
         """
-        # Base Booking.com flights URL
-        base_url = "https://www.booking.com/flights"
-        
-        # Build query parameters
-        params = []
-        
-        # Add locations
-        params.append(f"from={from_location}")
-        params.append(f"to={to_location}")
-        
-        # Add dates
-        params.append(f"departure={depart_date}")
+        params = [
+            ("from", from_location),
+            ("to", to_location),
+            ("departure", depart_date),
+        ]
         if return_date:
-            params.append(f"return={return_date}")
+            params.append(("return", return_date))
         
-        # Add passengers
-        params.append(f"adults={adults}")
+        params.append(("adults", adults))
         if children > 0:
-            params.append(f"children={children}")
-        
-        # Add cabin class
-        cabin_mapping = {
-            "ECONOMY": "economy",
-            "PREMIUM_ECONOMY": "premium_economy", 
-            "BUSINESS": "business",
-            "FIRST": "first"
-        }
-        cabin_param = cabin_mapping.get(cabin_class.upper(), "economy")
-        params.append(f"cabin={cabin_param}")
+            params.append(("children", children))
         
-        # Add trip type
-        trip_type = "roundtrip" if return_date else "oneway"
-        params.append(f"trip_type={trip_type}")
+        params.append(("cabin", _CABIN_MAPPING.get(cabin_class.upper(), _DEFAULT_CABIN)))
+        params.append(("trip_type", "roundtrip" if return_date else "oneway"))
         
-        # Construct final URL
-        query_string = "&".join(params)
-        booking_url = f"{base_url}?{query_string}"
+        booking_url = BOOKING_URL_TEMPLATE.format(qs=urlencode(params))
         
-        logger.info(f"Generated Booking.com URL: {booking_url}")
+        logger.debug("Generated Booking.com URL: %s", booking_url)
         return booking_url
     
     def get_flight_booking_info(self,
@@ -418,6 +537,47 @@ class BookingComClient:
             }
         }
     
+    def _safe_flight_booking_info(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Run get_flight_booking_info for one batch entry, turning failures into error dicts"""
+        try:
+            return self.get_flight_booking_info(**query)
+        except Exception as e:
+            logger.error("Batch flight booking lookup failed for %s: %s", query, e)
+            return {"error": f"Flight booking lookup failed: {str(e)}", "search_params": query}
+    
+    def get_flight_booking_info_batch(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run get_flight_booking_info for many queries concurrently
+        
+        Args:
+            queries: List of keyword-argument dicts for get_flight_booking_info
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        if not queries:
+            return []
+        
+        workers = min(MAX_BATCH_WORKERS, len(queries))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self._safe_flight_booking_info, queries))
+    
+    async def get_flight_booking_info_batch_async(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Async variant of get_flight_booking_info_batch for event-loop callers
+        
+        Args:
+            queries: List of keyword-argument dicts for get_flight_booking_info
+            
+        Returns:
+            List of results in the same order as queries
+        """
+        loop = asyncio.get_running_loop()
+        return list(await asyncio.gather(*(
+            loop.run_in_executor(None, self._safe_flight_booking_info, query)
+            for query in queries
+        )))
+    
     def generate_booking_links(self,
                               from_id: str,
                               to_id: str,
@@ -469,5 +629,24 @@ class BookingComClient:
                 "booking_url": None
             }
 
-# Global instance
-booking_client = BookingComClient() 
\ No newline at end of file
+@functools.cache
+def get_booking_client() -> BookingComClient:
+    """Return the shared client, constructing it on first use"""
+    return BookingComClient()
+
+async def aclose_booking_client() -> None:
+    """Close the shared client's async pool at shutdown, without building a client that was never used"""
+    if not get_booking_client.cache_info().currsize:
+        return
+    try:
+        await get_booking_client().aclose()
+    except Exception:
+        # Shutdown carries on with the rest of teardown
+        logger.exception("Error closing Booking.com client")
+
+def __getattr__(name: str):
+    # Keep `from api.booking_client import booking_client` working without
+    # paying for client construction at import time (PEP 562)
+    if name == "booking_client":
+        return get_booking_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -4,42 +4,431 @@ Chat Integration Router
 Connects the enhanced chat interface with the main trip planning flow
 """
 import uuid
+import asyncio
+import copy
+import json
 import logging
-from fastapi import APIRouter, HTTPException, Request
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+import functools
+from collections import OrderedDict
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import date, datetime, timedelta
 import re
 from dateutil import parser as date_parser
 
+try:
+    import re2
+except ImportError:  # optional linear-time matching of user-supplied text
+    re2 = None
+
+try:
+    import orjson
+except ImportError:  # optional faster response serialization
+    orjson = None
+
 from api.models import TripPlanningRequest, TripType, BudgetRange
 from api.enhanced_ai_provider import EnhancedAITripProvider
 from api.trip_planner_interface import TripPlanRequest
 from services.conversation_service import ConversationService
+from services.session_store import ConversationSessionStore
+from services.micro_batcher import AsyncBatcher
 from services.smart_destination_service import SmartDestinationService
 from services.enhanced_entity_extractor import enhanced_entity_extractor
 from services.contextual_followup_service import contextual_followup_service
+from services.keyword_scanner import build_keyword_automaton as _build_keyword_automaton, matched_categories
 
-router = APIRouter(prefix="/chat-integration", tags=["Chat Integration"])
+# Chat responses carry the trip request, plan and conversation_state; orjson
+# serializes them straight to bytes
+router = APIRouter(
+    prefix="/chat-integration", tags=["Chat Integration"],
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
+)
 logger = logging.getLogger(__name__)
 
+def _compile(pattern: str):
+    """Compile an extraction pattern, with RE2 when installed.
+
+    The route and "starting ..." patterns backtrack quadratically on long
+    repetitive input under the stdlib engine; RE2 matches in linear time.
+    """
+    if re2 is not None:
+        return re2.compile(pattern)
+    return re.compile(pattern)
+
+# Precompiled extraction patterns (compiled once at import, not per message)
+_FROM_TO_RE = _compile(r"from\s+([a-zA-Z\s]+?)\s+to\s+([a-zA-Z\s]+?)(?:\s*[,]?\s*(?:\d+|\s+travelers?|\s+starting|\s+from|\s+days?|\s+\$|\s+budget|$))")
+_GO_FROM_RE = _compile(r"go\s+from\s+([a-zA-Z\s]+)")
+_GO_TO_RES = [
+    _compile(r"go\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+in|\s+on|$)"),
+    _compile(r"want\s+to\s+go\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+in|\s+on|$)"),
+    _compile(r"travel\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+in|\s+on|$)"),
+    _compile(r"visit\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+in|\s+on|$)")
+]
+_DESTINATION_KEYWORD_RES = [
+    (keyword, _compile(rf"{keyword}\s+([a-zA-Z\s]+)"))
+    for keyword in ("visit", "travel to", "explore")
+]
+_PLAN_TRIP_RE = _compile(r"plan\s+(?:a\s+)?trip\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+visiting|\s+starting|\s+\d+|\s+travelers?|\s+days?|\s+\$|\s+budget|$)")
+_PLAN_TRIP_NO_ARTICLE_RE = _compile(r"plan\s+trip\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+visiting|\s+starting|\s+\d+|\s+travelers?|\s+days?|\s+\$|\s+budget|$)")
+# Non-city words trimmed from the end of a captured destination, per pattern family
+_ROUTE_TRAILING_WORDS = frozenset(['for', 'with', 'in', 'on', 'and', 'or', 'travelers', 'traveler', 'starting', 'from', 'days', 'day', 'budget'])
+_GO_TO_TRAILING_WORDS = frozenset(['for', 'with', 'in', 'on', 'and', 'or'])
+_PLAN_TRIP_TRAILING_WORDS = frozenset(['for', 'with', 'visiting', 'starting', 'from', 'days', 'day', 'budget', 'travelers', 'traveler'])
+# Context-aware city lookup for short replies (_extract_city_name)
+_CITY_FILLER_RE = _compile(r'\b(plan|trip|travel|go|visit|to|from|the|a|an)\b')
+_CAPITALIZED_WORDS_RE = _compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b')
+_KNOWN_CITIES = frozenset(['dallas', 'miami', 'new york', 'los angeles', 'chicago', 'houston', 'phoenix', 'philadelphia', 'san antonio', 'san diego', 'austin', 'jacksonville', 'fort worth', 'columbus', 'charlotte', 'san francisco', 'indianapolis', 'seattle', 'denver', 'washington', 'boston', 'el paso', 'nashville', 'detroit', 'oklahoma city', 'portland', 'las vegas', 'memphis', 'louisville', 'baltimore', 'milwaukee', 'albuquerque', 'tucson', 'fresno', 'sacramento', 'mesa', 'kansas city', 'atlanta', 'long beach', 'colorado springs', 'raleigh', 'virginia beach', 'omaha', 'oakland', 'minneapolis', 'tulsa', 'arlington', 'tampa', 'new orleans'])
+
+_WORD_TO_NUMBER = {
+    'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
+    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10'
+}
+_WORD_NUMBER_RE = _compile(r"\b(" + "|".join(_WORD_TO_NUMBER) + r")\b")
+# Traveler phrases fused into one alternation; _TRAVELER_PRIORITY keeps the
+# old pattern order (a head count beats "family" even when it comes later)
+_TRAVELER_RE = _compile(
+    r"(?P<people>\d+)\s+(?:people|travelers|guests|adults)"
+    r"|(?P<person>\d+)\s+(?:person|traveler|guest|adult)"
+    r"|(?P<solo>solo|alone|myself)"
+    r"|(?P<couple>couple|romantic|boyfriend|girlfriend)"
+    r"|(?P<family>family|kids|children)"
+    r"|(?P<starting>\d+)\s+starting"  # "for 2 starting"
+)
+_TRAVELER_PRIORITY = {"people": 0, "person": 1, "solo": 2, "couple": 3, "family": 4, "starting": 5}
+
+
+def _starting_head_count(match) -> Optional[int]:
+    # A bare number before "starting" is only trusted in a reasonable range
+    number = int(match.group("starting"))
+    return number if 1 <= number <= 20 else None
+
+
+# Traveler count for each named alternative of _TRAVELER_RE (None means keep looking)
+_TRAVELER_HANDLERS = {
+    "people": lambda match: int(match.group("people")),
+    "person": lambda match: int(match.group("person")),
+    "solo": lambda match: 1,
+    "couple": lambda match: 2,
+    "family": lambda match: 4,  # default family size when no head count is given
+    "starting": _starting_head_count,
+}
+
+_MONTH_NAMES = ['january', 'february', 'march', 'april', 'may', 'june',
+                'july', 'august', 'september', 'october', 'november', 'december']
+_MONTH_ABBR = ['jan', 'feb', 'mar', 'apr', 'may', 'jun',
+               'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+_MONTHS = {name: number for number, name in enumerate(_MONTH_NAMES, 1)}
+_MONTHS.update({abbr: number for number, abbr in enumerate(_MONTH_ABBR, 1)})
+_MONTH_ALT = "|".join(_MONTH_NAMES + _MONTH_ABBR[:4] + _MONTH_ABBR[5:])
+_DATE_RE = _compile(
+    r"(?P<mdy>(?P<mdy_month>\d{1,2})[/-](?P<mdy_day>\d{1,2})[/-](?P<mdy_year>\d{2,4}))"  # MM/DD/YYYY
+    rf"|(?P<month_day>(?P<md_month>{_MONTH_ALT})\s+(?P<md_day>\d{{1,2}})(?:st|nd|rd|th)?)"  # Month Day
+    rf"|(?P<day_month>(?P<dm_day>\d{{1,2}})\s+(?P<dm_month>{_MONTH_ALT})(?:st|nd|rd|th)?)"  # Day Month
+)
+
+_DOLLAR_RES = [_compile(p) for p in (
+    r"\$(\d+)(?:-\d+)?\s*(?:per\s+day|daily|budget)",
+    r"(\d+)(?:-\d+)?\s*dollars?\s*(?:per\s+day|daily|budget)",
+    r"budget\s*of\s*\$?(\d+)",
+    r"spend\s*\$?(\d+)",
+    r"^\$(\d+)$",  # Just "$2000"
+    r"^(\d+)\$$",  # Just "2000$"
+    r"^(\d+)$",    # Just "2000"
+    r"luxury\s*\(\$(\d+)\+/day\)",  # "Luxury ($300+/day)"
+    r"moderate\s*\(\$(\d+)-(\d+)/day\)",  # "Moderate ($100-300/day)"
+    r"budget-friendly\s*\(\$(\d+)-(\d+)/day\)",  # "Budget-friendly ($50-100/day)"
+    r"with\s*(\d+)\$",  # "with 3500$"
+    r"(\d+)\$\s*budget",  # "3500$ budget"
+    r"budget\s*(\d+)\$",  # "budget 3500$"
+    r"(\d+)\$\s*starting",  # "3500$ starting"
+    r"starting\s*(\d+)\$"   # "starting 3500$"
+)]
+
+_DURATION_RE = _compile(
+    r"for\s+(?P<for_days>\d+)\s+days?"  # "for 5 days"
+    r"|(?P<days>\d+)\s+days?"  # "5 days", "5 day trip"
+    r"|(?P<day_trip>\d+)-day\s+trip"  # "5-day trip"
+    r"|starting.*?(?P<starting>\d+)\s+days?"  # "starting ... 5 days"
+)
+_DURATION_PRIORITY = {"for_days": 0, "days": 1, "day_trip": 2, "starting": 3}
+
+# Keyword tables; dict order is the priority order (luxury wins over budget)
+_BUDGET_KEYWORDS = {
+    "luxury": ["luxury", "premium", "high end", "expensive", "upscale", "deluxe", "premium"],
+    "moderate": ["moderate", "reasonable", "standard", "mid-range", "comfortable", "balanced"],
+    "budget": ["budget", "cheap", "affordable", "low cost", "economy", "thrifty", "backpacker"]
+}
+_INTEREST_KEYWORDS = {
+    "beach": ["beach", "ocean", "sea", "coastal"],
+    "culture": ["culture", "museum", "history", "art", "heritage"],
+    "adventure": ["adventure", "hiking", "outdoor", "nature"],
+    "nightlife": ["nightlife", "party", "club", "bar"],
+    "shopping": ["shopping", "market", "mall", "retail"],
+    "food": ["food", "cuisine", "restaurant", "dining", "gastronomy"],
+    "relaxation": ["relax", "spa", "wellness", "peaceful"],
+    "romance": ["romantic", "couple", "honeymoon", "romance"]
+}
+_OCCASION_KEYWORDS = {
+    "anniversary": ["anniversary", "anniversary trip", "wedding anniversary"],
+    "birthday": ["birthday", "birthday trip", "birthday celebration"],
+    "honeymoon": ["honeymoon", "honeymoon trip"],
+    "graduation": ["graduation", "graduation trip", "graduation celebration"],
+    "wedding": ["wedding", "wedding trip", "wedding celebration"],
+    "celebration": ["celebration", "celebrate", "special occasion"],
+    "business": ["business", "business trip", "work", "work trip", "conference"],
+    "casual": ["casual", "casual trip", "getaway", "relaxation", "vacation"]
+}
+
+_BUDGET_AC = _build_keyword_automaton(_BUDGET_KEYWORDS)
+_INTEREST_AC = _build_keyword_automaton(_INTEREST_KEYWORDS)
+_OCCASION_AC = _build_keyword_automaton(_OCCASION_KEYWORDS)
+
+# Budget, interest and occasion keywords tagged by field, so _parse_message scans them in one pass
+_TRIP_KEYWORDS = {
+    **{("budget_range", category): keywords for category, keywords in _BUDGET_KEYWORDS.items()},
+    **{("interests", category): keywords for category, keywords in _INTEREST_KEYWORDS.items()},
+    **{("occasion", category): keywords for category, keywords in _OCCASION_KEYWORDS.items()},
+}
+_TRIP_KEYWORD_AC = _build_keyword_automaton(_TRIP_KEYWORDS)
+
+def _keyword_categories(message_lower: str, keyword_map: Dict[str, List[str]], automaton) -> List[str]:
+    """Return the categories with a keyword occurring in the message, in keyword_map order"""
+    hits = matched_categories(message_lower, automaton)
+    return [category for category in keyword_map if category in hits]
+
+def _first_keyword_category(message_lower: str, keyword_map: Dict[str, List[str]], automaton) -> Optional[str]:
+    """Return the first category in keyword_map order with a keyword in the message"""
+    rank = {category: index for index, category in enumerate(keyword_map)}
+    best = None
+    for _, categories in automaton.iter(message_lower):
+        for category in categories:
+            if best is None or rank[category] < rank[best]:
+                best = category
+        if rank[best] == 0:
+            break  # nothing can outrank the first category
+    return best
+
+def _matches_by_priority(pattern, text: str, priority: Dict[str, int]) -> List:
+    """Return the first match of each named alternative of pattern, best priority first"""
+    first_matches = {}
+    for match in pattern.finditer(text):
+        first_matches.setdefault(match.lastgroup, match)
+        if priority[match.lastgroup] == 0:
+            break
+    return sorted(first_matches.values(), key=lambda match: priority[match.lastgroup])
+
 # Initialize services
 conversation_service = ConversationService()
+conversation_session_store = ConversationSessionStore()
 smart_destination_service = SmartDestinationService()
 enhanced_ai_provider = EnhancedAITripProvider()
 
+
+class TripPlanCache:
+    """Bounded in-memory cache of successful trip plans, keyed by normalized request"""
+    
+    def __init__(self, max_entries: int = 256, ttl: timedelta = timedelta(minutes=30)):
+        self.entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self.max_entries = max_entries
+        self.ttl = ttl  # plans embed live prices, so they go stale
+    
+    @staticmethod
+    def make_key(request: TripPlanRequest) -> Tuple:
+        """Canonical key: trivially different phrasings of the same trip share an entry"""
+        return (
+            request.origin.strip().casefold(),
+            request.destination.strip().casefold(),
+            request.duration_days,
+            request.start_date,
+            request.end_date,
+            request.travelers,
+            request.budget_range,
+            tuple(sorted({interest.strip().casefold() for interest in request.interests})),
+            request.trip_type,
+            (request.special_requirements or "").strip().casefold(),
+            json.dumps(request.smart_trip_data, sort_keys=True, default=str) if request.smart_trip_data else None,
+        )
+    
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached plan, or None if missing or expired"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if datetime.now() - entry["timestamp"] >= self.ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return copy.deepcopy(entry["plan"])
+    
+    def put(self, key: Tuple, plan: Dict[str, Any]) -> None:
+        """Store a copy of plan, evicting the least recently used entry when full"""
+        self.entries[key] = {"plan": copy.deepcopy(plan), "timestamp": datetime.now()}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+trip_plan_cache = TripPlanCache()
+
+
+BATCH_WINDOW_MS = 50
+MAX_PLAN_BATCH_SIZE = 16
+
+
+class TripPlanBatcher(AsyncBatcher):
+    """Coalesces plan_trip calls arriving within a short window into one plan_trip_batch call.
+    
+    Identical requests in the same window (double submits, several tabs) share
+    a single provider call.
+    """
+    
+    def __init__(self, provider: EnhancedAITripProvider, window_ms: int = BATCH_WINDOW_MS,
+                 max_batch_size: int = MAX_PLAN_BATCH_SIZE):
+        super().__init__(
+            provider.plan_trip_batch,
+            key=TripPlanCache.make_key,
+            copy_result=lambda response: response.model_copy(deep=True),
+            window_ms=window_ms,
+            max_batch_size=max_batch_size,
+            name="trip planning batch",
+        )
+        self.provider = provider
+
+
+trip_plan_batcher = TripPlanBatcher(enhanced_ai_provider)
+
+
+async def _create_smart_itinerary_requests(messages: List[str]) -> List[Any]:
+    """Analyze each distinct message concurrently (failures are returned per message)"""
+    return await asyncio.gather(
+        *(smart_destination_service.create_smart_itinerary_request(message) for message in messages),
+        return_exceptions=True
+    )
+
+
+# Trip-type analysis ignores case and surrounding space, so those messages share one call
+smart_itinerary_batcher = AsyncBatcher(
+    _create_smart_itinerary_requests,
+    key=lambda message: message.strip().lower(),
+    name="smart itinerary batch",
+)
+
+
+def get_trip_plan_batcher(request: Request) -> TripPlanBatcher:
+    """Batcher bound to the lifespan provider, or the module default outside it"""
+    return getattr(request.app.state, "trip_plan_batcher", trip_plan_batcher)
+
 @router.post("/process-message")
-async def process_chat_message(request: Dict[str, Any]):
+async def process_chat_message(request: Dict[str, Any], batcher: TripPlanBatcher = Depends(get_trip_plan_batcher)):
     """
-    Process a message from the enhanced chat interface and return appropriate response
+    Process a message from the enhanced chat interface and return appropriate response.
+    Clients may omit conversation_state to continue the state stored for their session_id.
     """
+    session_id = request.get("session_id")
+    conversation_state = request.get("conversation_state")
+    if conversation_state is None:
+        conversation_state = await _load_session_state(session_id)
+    
+    response = await _process_chat_turn(request, conversation_state, batcher)
+    
+    if session_id:
+        try:
+            await conversation_session_store.save(session_id, response.get("conversation_state", conversation_state))
+        except Exception:
+            # The client still gets the full state back, so a store outage isn't fatal
+            logger.exception("Error saving conversation state for session %s", session_id)
+    return response
+
+async def _load_session_state(session_id: Optional[str]) -> Dict[str, Any]:
+    """Stored conversation_state for session_id, or an empty state"""
+    if not session_id:
+        return {}
+    try:
+        return await conversation_session_store.load(session_id)
+    except Exception:
+        logger.exception("Error loading conversation state for session %s", session_id)
+        return {}
+
+async def _quick_reply_start_over(session_id: Optional[str], conversation_state: Dict[str, Any], batcher: TripPlanBatcher) -> Dict[str, Any]:
+    """Forget the trip collected so far"""
+    conversation_state.clear()
+    return {
+        "session_id": session_id,
+        "message": "No problem, let's start fresh! Where would you like to go?",
+        "state": "greeting",
+        "can_start_planning": False,
+        "missing_info": list(_NO_REQUEST_MISSING_INFO),
+        "conversation_state": conversation_state
+    }
+
+async def _quick_reply_modify_details(session_id: Optional[str], conversation_state: Dict[str, Any], batcher: TripPlanBatcher) -> Dict[str, Any]:
+    """Keep the trip and ask what to change"""
+    return {
+        "session_id": session_id,
+        "message": "Sure! What would you like to change? You can update the dates, travelers, budget, destination or interests.",
+        "state": "collecting_info",
+        "can_start_planning": False,
+        "conversation_state": conversation_state
+    }
+
+async def _quick_reply_show_plan(session_id: Optional[str], conversation_state: Dict[str, Any], batcher: TripPlanBatcher) -> Dict[str, Any]:
+    """Plan the stored trip (a cache hit if it was just planned), or ask for what's missing"""
+    trip_data = conversation_state.get("trip_data") or conversation_state
+    trip_request = None
+    if trip_data.get("origin") and trip_data.get("destination"):
+        try:
+            trip_request = _trip_request_from_state(trip_data)
+        except ValueError as e:  # pydantic ValidationError on client-supplied state
+            logger.warning("Invalid trip details in conversation state: %s", e)
+    
+    missing_info = _get_missing_info(trip_request)
+    if missing_info:
+        return {
+            "session_id": session_id,
+            "message": _SUGGESTIONS.get(missing_info[0], f"Please provide {missing_info[0]}."),
+            "state": "collecting_info",
+            "can_start_planning": False,
+            "missing_info": missing_info,
+            "conversation_state": conversation_state
+        }
+    
+    planning_result = await _start_trip_planning(trip_request, batcher)
+    return {
+        "session_id": session_id,
+        "message": "Perfect! I have all the information I need. Let me craft your perfect itinerary!",
+        "state": "planning",
+        "can_start_planning": True,
+        "trip_request": trip_request.model_dump(),
+        "planning_result": planning_result,
+        "conversation_state": conversation_state
+    }
+
+# Quick-reply buttons are fixed commands; running them through the extractors would
+# read "Start over" as a city when an origin or destination is being asked for
+_QUICK_REPLY_HANDLERS = {
+    "start over": _quick_reply_start_over,
+    "modify details": _quick_reply_modify_details,
+    "show me the plan": _quick_reply_show_plan,
+}
+
+async def _process_chat_turn(request: Dict[str, Any], conversation_state: Dict[str, Any], batcher: TripPlanBatcher) -> Dict[str, Any]:
+    """Handle one chat message against conversation_state (mutated in place)"""
     try:
         message = request.get("message", "").strip()
         session_id = request.get("session_id")
-        conversation_state = request.get("conversation_state", {})
         
         if not message:
             raise HTTPException(status_code=400, detail="Message is required")
         
+        message_lower = message.lower()
+        quick_reply = _QUICK_REPLY_HANDLERS.get(message_lower.rstrip(".!"))
+        if quick_reply is not None:
+            return await quick_reply(session_id, conversation_state, batcher)
+        
+        # Extract every field in one fused pass; the branches below read from it
+        parsed = _parse_message(message_lower)
+        
         # Check if we have existing trip_data in conversation_state
         # Handle both flat structure (from frontend) and nested structure
         existing_trip_data = conversation_state.get("trip_data", {})
@@ -52,23 +441,23 @@ async def process_chat_message(request: Dict[str, Any]):
         context_aware_extraction = False
         
         # Context-aware extraction: if we're asking for origin and user provides a city, treat it as origin
-        if "origin" in missing_info and not _extract_origin(message):
+        if "origin" in missing_info and not parsed["origin"]:
             # User might be providing origin in response to our question
             potential_origin = _extract_city_name(message)
             if potential_origin:
                 existing_trip_data["origin"] = potential_origin
                 conversation_state["origin"] = potential_origin
                 context_aware_extraction = True
-                logger.info(f"Context-aware origin extraction: '{potential_origin}' from message: '{message}'")
+                logger.info("Context-aware origin extraction: '%s' from message: '%s'", potential_origin, message)
         
         # Context-aware extraction: if we're asking for destination and user provides a city, treat it as destination
-        if "destination" in missing_info and not _extract_destination(message):
+        if "destination" in missing_info and not parsed["destination"]:
             potential_destination = _extract_city_name(message)
             if potential_destination:
                 existing_trip_data["destination"] = potential_destination
                 conversation_state["destination"] = potential_destination
                 context_aware_extraction = True
-                logger.info(f"Context-aware destination extraction: '{potential_destination}' from message: '{message}'")
+                logger.info("Context-aware destination extraction: '%s' from message: '%s'", potential_destination, message)
         
         # If we have context-aware extraction, handle it immediately without calling conversation service
         if context_aware_extraction:
@@ -92,23 +481,11 @@ async def process_chat_message(request: Dict[str, Any]):
             # If we have both origin and destination, we can proceed with planning
             if existing_trip_data.get("origin") and existing_trip_data.get("destination"):
                 # Create a proper trip request
-                trip_request = TripPlanningRequest(
-                    origin=existing_trip_data["origin"],
-                    destination=existing_trip_data["destination"],
-                    travelers=existing_trip_data.get("travelers"),
-                    start_date=existing_trip_data.get("start_date"),
-                    end_date=existing_trip_data.get("end_date"),
-                    duration_days=existing_trip_data.get("duration_days"),
-                    budget_range=existing_trip_data.get("budget_range"),
-                    interests=existing_trip_data.get("interests", []),
-                    trip_type=TripType.LEISURE,
-                    special_requirements="",
-                    total_budget=existing_trip_data.get("total_budget")
-                )
+                trip_request = _trip_request_from_state(existing_trip_data)
                 
                 # Check if we have enough info to start planning
                 if _has_sufficient_info(trip_request):
-                    planning_result = await _start_trip_planning(trip_request)
+                    planning_result = await _start_trip_planning(trip_request, batcher)
                     response_dict = {
                         "session_id": session_id,
                         "message": "Perfect! I have all the information I need. Let me craft your perfect itinerary!",
@@ -139,11 +516,11 @@ async def process_chat_message(request: Dict[str, Any]):
                     "missing_info": updated_missing_info,
                     "conversation_state": conversation_state
                 }
-                logger.info(f"Returning context-aware response with updated conversation state: {conversation_state}")
-                logger.info(f"Returning context-aware response for missing info: {next_missing}")
-                logger.info(f"Response message: {response_dict['message']}")
-                logger.info(f"Response missing_info: {response_dict['missing_info']}")
-                logger.info(f"Response conversation_state: {response_dict['conversation_state']}")
+                logger.info("Returning context-aware response with updated conversation state: %s", conversation_state)
+                logger.info("Returning context-aware response for missing info: %s", next_missing)
+                logger.info("Response message: %s", response_dict['message'])
+                logger.info("Response missing_info: %s", response_dict['missing_info'])
+                logger.info("Response conversation_state: %s", response_dict['conversation_state'])
                 return response_dict
         
         # Check if we have enhancement information (occasion and interests) in conversation_state
@@ -156,9 +533,9 @@ async def process_chat_message(request: Dict[str, Any]):
         # If we have existing trip_data, always use conversation service to allow updates
         if existing_trip_data:
             # Extract any new information from the message
-            new_budget, new_total_budget = _extract_budget(message)
-            new_interests = _extract_interests(message)
-            new_occasion = _extract_occasion(message)
+            new_budget, new_total_budget = parsed["budget_range"], parsed["total_budget"]
+            new_interests = parsed["interests"]
+            new_occasion = parsed["occasion"]
             
             # Update existing trip_data with new information
             if new_budget:
@@ -189,19 +566,7 @@ async def process_chat_message(request: Dict[str, Any]):
             
             # Only create TripPlanningRequest if we have both origin and destination
             if origin and destination:
-                trip_request = TripPlanningRequest(
-                    origin=origin,
-                    destination=destination,
-                    travelers=existing_trip_data.get("travelers"),
-                    start_date=existing_trip_data.get("start_date"),
-                    end_date=existing_trip_data.get("end_date"),
-                    duration_days=existing_trip_data.get("duration_days"),
-                    budget_range=existing_trip_data.get("budget_range"),
-                    interests=existing_trip_data.get("interests", []),
-                    trip_type=TripType.LEISURE,
-                    special_requirements="",
-                    total_budget=existing_trip_data.get("total_budget")
-                )
+                trip_request = _trip_request_from_state(existing_trip_data)
             else:
                 # We don't have enough info to create a trip request yet
                 trip_request = None
@@ -209,18 +574,18 @@ async def process_chat_message(request: Dict[str, Any]):
             # Check if we now have all enhancement information and should proceed to planning
             if has_enhancement_info and _has_sufficient_info(trip_request):
                 # We have everything - start planning immediately
-                planning_result = await _start_trip_planning(trip_request)
+                planning_result = await _start_trip_planning(trip_request, batcher)
                 
                 response_dict = {
                     "session_id": session_id,
                     "message": "Perfect! I have all the information I need. Let me craft your perfect itinerary!",
                     "state": "planning",
                     "can_start_planning": True,
-                    "trip_request": trip_request.dict() if trip_request else None,
+                    "trip_request": trip_request.model_dump() if trip_request else None,
                     "planning_result": planning_result,
                     "conversation_state": conversation_state
                 }
-                logger.info(f"[DEBUG] Returning FULL RESPONSE (planning with enhancement): {response_dict}")
+                logger.debug("Returning FULL RESPONSE (planning with enhancement): %s", response_dict)
                 return response_dict
         else:
             # No existing trip_data, try to extract complete trip request
@@ -255,11 +620,10 @@ async def process_chat_message(request: Dict[str, Any]):
                 # Update conversation state with the response state
                 conversation_state["current_state"] = response.get("state", "greeting")
                 # Merge trip_data properly to preserve existing fields
-                if response.get("trip_data"):
-                    conversation_state.update(response.get("trip_data", {}))
+                trip_data = response.get("trip_data")
+                if trip_data:
                     # Promote all trip_data keys to top-level conversation_state for flat access
-                    for k, v in response.get("trip_data", {}).items():
-                        conversation_state[k] = v
+                    conversation_state.update(trip_data)
                     # Always use conversation_state directly for latest trip data (flat structure)
                     latest_trip_data = conversation_state
                     
@@ -268,75 +632,43 @@ async def process_chat_message(request: Dict[str, Any]):
                     destination = latest_trip_data.get("destination")
                     
                     if origin and destination:
-                        trip_request = TripPlanningRequest(
-                            origin=origin,
-                            destination=destination,
-                            travelers=latest_trip_data.get("travelers"),
-                            start_date=latest_trip_data.get("start_date"),
-                            end_date=latest_trip_data.get("end_date"),
-                            duration_days=latest_trip_data.get("duration_days"),
-                            budget_range=latest_trip_data.get("budget_range"),
-                            interests=latest_trip_data.get("interests", []),
-                            trip_type=TripType.LEISURE,
-                            special_requirements="",
-                            total_budget=latest_trip_data.get("total_budget")
-                        )
+                        trip_request = _trip_request_from_state(latest_trip_data)
                     else:
                         # We don't have enough info to create a trip request yet
                         trip_request = None
                     if trip_request:
-                        logger.info(f"[DEBUG] (after trip_data update) TripPlanningRequest: {trip_request.dict()} (duration_days type: {type(trip_request.duration_days)})")
-                        logger.info(f"[DEBUG] (after trip_data update) Missing info: {_get_missing_info(trip_request)}")
+                        logger.debug("(after trip_data update) TripPlanningRequest: %s (duration_days type: %s)", trip_request, type(trip_request.duration_days))
                     else:
-                        logger.info(f"[DEBUG] (after trip_data update) TripPlanningRequest: None - missing origin or destination")
+                        logger.debug("(after trip_data update) TripPlanningRequest: None - missing origin or destination")
+                    updated_missing_info = _get_missing_info(trip_request)
+                    logger.debug("(after trip_data update) Missing info: %s", updated_missing_info)
                 
                 # Check if we now have sufficient info after the update
-                if _has_sufficient_info(trip_request):
+                if not updated_missing_info:
                     # We now have enough info to start planning
-                    planning_result = await _start_trip_planning(trip_request)
+                    planning_result = await _start_trip_planning(trip_request, batcher)
                     
                     # Ensure conversation_state includes all trip_request fields
-                    conversation_state.update(trip_request.dict())
-                    
-                    # Strictly robust: Only send planning state and message if truly ready
-                    if trip_request and _has_sufficient_info(trip_request):
-                        planning_result = await _start_trip_planning(trip_request)
-                        # Ensure conversation_state is fully up to date
-                        conversation_state.update(trip_request.dict())
-                        logger.info(f"[DEBUG] Returning conversation_state: {conversation_state}")
-                        response_dict = {
-                            "session_id": session_id,
-                            "message": "Perfect! I have all the information I need. Let me craft your perfect itinerary!",
-                            "state": "planning",
-                            "can_start_planning": True,
-                            "trip_request": trip_request.dict() if trip_request else None,
-                            "planning_result": planning_result,
-                            "conversation_state": conversation_state
-                        }
-                        logger.info(f"[DEBUG] Returning FULL RESPONSE (planning): {response_dict}")
-                        return response_dict
-                    else:
-                        # If more info is needed, get the follow-up message and missing info
-                        response = await conversation_service.process_user_input(message, conversation_state.get("current_state", "greeting"), conversation_state, missing_info)
-                        conversation_state["current_state"] = response.get("state", "gathering_info")
-                        if response.get("trip_data"):
-                            conversation_state.update(response.get("trip_data", {}))
-                        response_dict = {
-                            "session_id": session_id,
-                            "message": response.get("message"),
-                            "state": response.get("state", "gathering_info"),
-                            "can_start_planning": False,
-                            "missing_info": missing_info,
-                            "conversation_state": conversation_state
-                        }
-                        logger.info(f"[DEBUG] Returning FULL RESPONSE (gathering_info): {response_dict}")
-                        return response_dict
+                    trip_request_data = trip_request.model_dump()
+                    conversation_state.update(trip_request_data)
+                    logger.debug("Returning conversation_state: %s", conversation_state)
+                    response_dict = {
+                        "session_id": session_id,
+                        "message": "Perfect! I have all the information I need. Let me craft your perfect itinerary!",
+                        "state": "planning",
+                        "can_start_planning": True,
+                        "trip_request": trip_request_data,
+                        "planning_result": planning_result,
+                        "conversation_state": conversation_state
+                    }
+                    logger.debug("Returning FULL RESPONSE (planning): %s", response_dict)
+                    return response_dict
                 else:
                     # If more info is needed, get the follow-up message and missing info
                     response = await conversation_service.process_user_input(message, conversation_state.get("current_state", "greeting"), conversation_state, missing_info)
                     conversation_state["current_state"] = response.get("state", "gathering_info")
                     if response.get("trip_data"):
-                        conversation_state.update(response.get("trip_data", {}))
+                        conversation_state.update(response["trip_data"])
                     response_dict = {
                         "session_id": session_id,
                         "message": response.get("message"),
@@ -345,18 +677,19 @@ async def process_chat_message(request: Dict[str, Any]):
                         "missing_info": missing_info,
                         "conversation_state": conversation_state
                     }
-                    logger.info(f"[DEBUG] Returning FULL RESPONSE (gathering_info): {response_dict}")
+                    logger.debug("Returning FULL RESPONSE (gathering_info): %s", response_dict)
                     return response_dict
             else:
                 # No existing trip_data, check if we have enough info to start planning
-                if _has_sufficient_info(trip_request):
+                if not missing_info:
                     # Check if we should ask for enhancement information
                     if _should_ask_for_enhancement(trip_request, conversation_state):
                         # We have basic info but need enhancement - ask for occasion/interests
                         enhancement_message = "Great! I have the basic trip details. Now let me ask a few more questions to make your trip truly special! 🎯"
                         
                         # Store the trip_request in conversation_state for later use
-                        conversation_state.update(trip_request.dict())
+                        trip_request_data = trip_request.model_dump()
+                        conversation_state.update(trip_request_data)
                         conversation_state["enhancement_needed"] = True
                         
                         response_dict = {
@@ -366,24 +699,24 @@ async def process_chat_message(request: Dict[str, Any]):
                             "can_start_planning": False,
                             "missing_info": ["occasion", "interests"],
                             "conversation_state": conversation_state,
-                            "trip_request": trip_request.dict()
+                            "trip_request": trip_request_data
                         }
-                        logger.info(f"[DEBUG] Returning ENHANCEMENT response: {response_dict}")
+                        logger.debug("Returning ENHANCEMENT response: %s", response_dict)
                         return response_dict
                     else:
                         # We have everything including enhancement info - start planning immediately
-                        planning_result = await _start_trip_planning(trip_request)
+                        planning_result = await _start_trip_planning(trip_request, batcher)
                         
                         response_dict = {
                             "session_id": session_id,
                             "message": "Perfect! I have all the information I need. Let me craft your perfect itinerary!",
                             "state": "planning",
                             "can_start_planning": True,
-                            "trip_request": trip_request.dict() if trip_request else None,
+                            "trip_request": trip_request.model_dump() if trip_request else None,
                             "planning_result": planning_result,
                             "conversation_state": conversation_state
                         }
-                        logger.info(f"[DEBUG] Returning FULL RESPONSE (planning): {response_dict}")
+                        logger.debug("Returning FULL RESPONSE (planning): %s", response_dict)
                         return response_dict
                 else:
                     # Need more information - call conversation service
@@ -393,7 +726,7 @@ async def process_chat_message(request: Dict[str, Any]):
                     conversation_state["current_state"] = response.get("state", "greeting")
                     # Merge trip_data properly to preserve existing fields
                     if response.get("trip_data"):
-                        conversation_state.update(response.get("trip_data", {}))
+                        conversation_state.update(response["trip_data"])
                     
                     response_dict = {
                         "session_id": session_id,
@@ -403,59 +736,33 @@ async def process_chat_message(request: Dict[str, Any]):
                         "missing_info": missing_info,
                         "conversation_state": conversation_state
                     }
-                    logger.info(f"[DEBUG] Returning FULL RESPONSE (gathering_info): {response_dict}")
+                    logger.debug("Returning FULL RESPONSE (gathering_info): %s", response_dict)
                     return response_dict
         else:
-            # If trip_request is None, we need to extract basic info to determine what's missing
-            # Extract trip information from the message
-            origin = _extract_origin(message)
-            destination = _extract_destination(message)
-            travelers = _extract_travelers(message)
-            duration_days = _extract_duration_days(message)
-            start_date = _extract_start_date(message)
-            
-            # Update conversation state with extracted information
-            if origin:
-                conversation_state["origin"] = origin
-            if destination:
-                conversation_state["destination"] = destination
-            if travelers:
-                conversation_state["travelers"] = travelers
-            if duration_days:
-                conversation_state["duration_days"] = duration_days
-            if start_date:
-                conversation_state["start_date"] = start_date
-            
-            missing_info = []
-            if not origin:
-                missing_info.append("origin")
-            if not destination:
-                missing_info.append("destination")
-            if not travelers:
-                missing_info.append("number of travelers")
-            if not duration_days:
-                missing_info.append("duration_days")
-            if not start_date:
-                missing_info.append("start date")
-            
-            # Create trip_request to check if we have sufficient info
+            # Extract the trip request; this also stores the extracted fields in conversation_state
             trip_request = await _extract_trip_request(message, conversation_state)
             
+            if trip_request is not None:
+                missing_info = _get_missing_info(trip_request)
+            else:
+                # No request (origin or destination unknown): report what the state still lacks
+                missing_info = [label for attribute, _, label in _TRIP_FIELDS if label and not conversation_state.get(attribute)]
+            
             # Check if we have enough info to start planning BEFORE calling conversation service
-            if trip_request is not None and _has_sufficient_info(trip_request):
+            if trip_request is not None and not missing_info:
                 # We have enough info to start planning immediately
-                planning_result = await _start_trip_planning(trip_request)
+                planning_result = await _start_trip_planning(trip_request, batcher)
                 
                 response_dict = {
                     "session_id": session_id,
                     "message": "Perfect! I have all the information I need. Let me craft your perfect itinerary!",
                     "state": "planning",
                     "can_start_planning": True,
-                    "trip_request": trip_request.dict() if trip_request is not None else None,
+                    "trip_request": trip_request.model_dump() if trip_request is not None else None,
                     "planning_result": planning_result,
                     "conversation_state": conversation_state
                 }
-                logger.info(f"[DEBUG] Returning FULL RESPONSE (planning): {response_dict}")
+                logger.debug("Returning FULL RESPONSE (planning): %s", response_dict)
                 return response_dict
             else:
                 # Need more information - call conversation service
@@ -468,11 +775,8 @@ async def process_chat_message(request: Dict[str, Any]):
                 # Update conversation state with the response state and trip data
                 conversation_state["current_state"] = response.get("state", "greeting")
                 if response.get("trip_data"):
-                    conversation_state.update(response.get("trip_data", {}))
-                
-                # Ensure interests are preserved
-                if "interests" in response.get("trip_data", {}):
-                    conversation_state["interests"] = response["trip_data"]["interests"]
+                    # Includes interests whenever the service returned them
+                    conversation_state.update(response["trip_data"])
                 
                 response_dict = {
                     "session_id": session_id,
@@ -482,21 +786,24 @@ async def process_chat_message(request: Dict[str, Any]):
                     "missing_info": response.get("missing_info", missing_info),
                     "conversation_state": conversation_state
                 }
-                logger.info(f"[DEBUG] Returning FULL RESPONSE (gathering_info): {response_dict}")
+                logger.debug("Returning FULL RESPONSE (gathering_info): %s", response_dict)
                 return response_dict
             
+    except HTTPException:
+        # Re-raise HTTPExceptions as-is
+        raise
     except Exception as e:
-        logger.error(f"Error processing chat message: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.exception("Error processing chat message")
+        raise HTTPException(status_code=500, detail="Failed to process chat message") from e
 
 @router.post("/start-planning")
-async def start_planning_from_chat(request: Dict[str, Any]):
+async def start_planning_from_chat(request: Dict[str, Any], batcher: TripPlanBatcher = Depends(get_trip_plan_batcher)):
     """
     Start trip planning with extracted information from chat
     """
     try:
         trip_request_data = request.get("trip_request", {})
-        logger.info(f"[DEBUG] Received trip_request_data: {trip_request_data}")
+        logger.debug("Received trip_request_data: %s", trip_request_data)
         # Validate required fields before creating TripPlanningRequest
         if not trip_request_data.get("origin"):
             logger.error("Missing origin in trip request")
@@ -506,24 +813,22 @@ async def start_planning_from_chat(request: Dict[str, Any]):
             raise HTTPException(status_code=400, detail="Destination is required")
         # Create TripPlanningRequest with validated data
         trip_request = TripPlanningRequest(**trip_request_data)
-        logger.info(f"[DEBUG] Starting trip planning for: {trip_request.origin} to {trip_request.destination}")
-        logger.info(f"[DEBUG] Trip request fields: {trip_request.dict()}")
+        logger.debug("Starting trip planning for: %s to %s", trip_request.origin, trip_request.destination)
+        logger.debug("Trip request fields: %s", trip_request)
         # Use the _start_trip_planning function which has proper error handling
-        logger.info("[DEBUG] Calling _start_trip_planning...")
-        result = await _start_trip_planning(trip_request)
-        logger.info(f"[DEBUG] _start_trip_planning result: {result}")
+        result = await _start_trip_planning(trip_request, batcher)
+        logger.debug("_start_trip_planning result: %s", result)
         if result.get("success"):
             return result
         else:
-            error_msg = result.get("error", "Failed to generate trip plan")
-            logger.error(f"Trip planning failed: {error_msg}")
-            raise HTTPException(status_code=500, detail=error_msg)
+            logger.error("Trip planning failed for %s to %s", trip_request.origin, trip_request.destination)
+            raise HTTPException(status_code=500, detail="Failed to generate trip plan")
     except HTTPException:
         # Re-raise HTTPExceptions as-is
         raise
     except Exception as e:
-        logger.error(f"Error starting planning from chat: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.exception("Error starting planning from chat")
+        raise HTTPException(status_code=500, detail="Failed to start trip planning") from e
 
 @router.post("/extract-trip-info")
 async def extract_trip_information(request: Dict[str, Any]):
@@ -533,127 +838,154 @@ async def extract_trip_information(request: Dict[str, Any]):
     try:
         message = request.get("message", "")
         conversation_state = request.get("conversation_state", {})
+        if not isinstance(message, str):
+            raise HTTPException(status_code=400, detail="Message must be a string")
         
-        # Use smart destination service to analyze the message
-        smart_request = await smart_destination_service.create_smart_itinerary_request(message)
-        
-        # Extract trip details using conversation service
-        trip_request = await _extract_trip_request(message, conversation_state)
+        # Smart destination analysis and trip extraction are independent, so run them together
+        smart_request, trip_request = await asyncio.gather(
+            smart_itinerary_batcher.submit(message),
+            _extract_trip_request(message, conversation_state)
+        )
         
+        field_mask, missing = _field_status(trip_request)
         return {
             "extracted_info": smart_request,
-            "trip_request": trip_request.dict() if trip_request else None,
-            "confidence": _calculate_extraction_confidence(trip_request),
-            "suggestions": _generate_suggestions(trip_request)
+            "trip_request": trip_request.model_dump() if trip_request else None,
+            "confidence": _calculate_extraction_confidence(field_mask),
+            "suggestions": _generate_suggestions(trip_request, missing)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error extracting trip information: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.exception("Error extracting trip information")
+        raise HTTPException(status_code=500, detail="Failed to extract trip information") from e
+
+def _trip_request_from_state(trip_data: Dict[str, Any]) -> TripPlanningRequest:
+    """Build a trip request from conversation trip data (validated, since it round-trips through the client)"""
+    return TripPlanningRequest(
+        origin=trip_data["origin"],
+        destination=trip_data["destination"],
+        travelers=trip_data.get("travelers"),
+        start_date=trip_data.get("start_date"),
+        end_date=trip_data.get("end_date"),
+        duration_days=trip_data.get("duration_days"),
+        budget_range=trip_data.get("budget_range"),
+        interests=trip_data.get("interests", []),
+        trip_type=TripType.LEISURE,
+        special_requirements="",
+        total_budget=trip_data.get("total_budget")
+    )
 
 async def _extract_trip_request(message: str, conversation_state: Dict[str, Any]) -> Optional[TripPlanningRequest]:
     """Extract trip planning request from message and conversation state using enhanced entity extraction"""
-    try:
-        # Use enhanced entity extraction if available (temporarily disabled due to API issues)
-        if False and enhanced_entity_extractor.is_available():
-            logger.info("Using enhanced entity extraction")
-            extracted_data = await enhanced_entity_extractor.extract_trip_entities(message, conversation_state)
-            
-            # Update conversation state with extracted data
-            conversation_state.update(extracted_data)
-            
-            # Extract from updated conversation state
-            origin = conversation_state.get("origin")
-            destination = conversation_state.get("destination")
-            travelers = conversation_state.get("travelers")
-            start_date = conversation_state.get("start_date")
-            end_date = conversation_state.get("end_date")
-            budget_range = conversation_state.get("budget_range")
-            interests = conversation_state.get("interests")
-            duration_days = conversation_state.get("duration_days")
-        else:
-            # Fallback to regex-based extraction
-            logger.info("Using fallback regex extraction")
-            # Always try to extract new information from the message first
-            new_origin = _extract_origin(message)
-            new_destination = _extract_destination(message)
-            new_travelers = _extract_travelers(message)
-            new_start_date = _extract_start_date(message)
-            new_end_date = _extract_end_date(message)
-            new_budget_range, new_total_budget = _extract_budget(message)
-            new_interests = _extract_interests(message)
-            new_occasion = _extract_occasion(message)
-            new_duration_days = _extract_duration_days(message)
-            
-            # Use new information if available, otherwise fall back to existing conversation state
-            origin = new_origin or conversation_state.get("origin")
-            destination = new_destination or conversation_state.get("destination")
-            travelers = new_travelers or conversation_state.get("travelers")
-            start_date = new_start_date or conversation_state.get("start_date")
-            end_date = new_end_date or conversation_state.get("end_date")
-            budget_range = new_budget_range or conversation_state.get("budget_range")
-            
-            # Handle interests properly - merge new interests with existing ones
-            existing_interests = conversation_state.get("interests", [])
-            if new_interests:
-                # Add new interests to existing ones, avoiding duplicates
-                all_interests = existing_interests + [interest for interest in new_interests if interest not in existing_interests]
-                interests = all_interests
-            else:
-                interests = existing_interests
-            
-            duration_days = new_duration_days or conversation_state.get("duration_days")
+    # Both come straight from the client; anything malformed yields no request
+    if not isinstance(message, str) or not isinstance(conversation_state, dict):
+        logger.warning("Skipping trip extraction for a non-text message or non-object conversation state")
+        return None
+
+    # Use enhanced entity extraction if available (temporarily disabled due to API issues)
+    if False and enhanced_entity_extractor.is_available():
+        logger.info("Using enhanced entity extraction")
+        extracted_data = await enhanced_entity_extractor.extract_trip_entities(message, conversation_state)
         
-        # Debug logging
-        logger.info(f"Extracted origin: {origin}")
-        logger.info(f"Extracted destination: {destination}")
-        logger.info(f"Extracted travelers: {travelers}")
-        logger.info(f"Extracted start_date: {start_date}")
-        logger.info(f"Extracted budget_range: {budget_range}")
-        logger.info(f"Extracted interests: {interests}")
-        logger.info(f"Message being processed: {message}")
+        # Update conversation state with extracted data
+        conversation_state.update(extracted_data)
         
-        # Update conversation state with extracted information
-        if origin:
-            conversation_state["origin"] = origin
-        if destination:
-            conversation_state["destination"] = destination
-        if travelers:
-            conversation_state["travelers"] = travelers
-        if start_date:
-            conversation_state["start_date"] = start_date
-        if end_date:
-            conversation_state["end_date"] = end_date
-        if budget_range:
-            conversation_state["budget_range"] = budget_range
-        if interests:
-            conversation_state["interests"] = interests
-        if new_occasion:
-            conversation_state["occasion"] = new_occasion
-        if duration_days:
-            conversation_state["duration_days"] = duration_days
+        # Extract from updated conversation state
+        origin = conversation_state.get("origin")
+        destination = conversation_state.get("destination")
+        travelers = conversation_state.get("travelers")
+        start_date = conversation_state.get("start_date")
+        end_date = conversation_state.get("end_date")
+        budget_range = conversation_state.get("budget_range")
+        interests = conversation_state.get("interests")
+        duration_days = conversation_state.get("duration_days")
+    else:
+        # Fallback to regex-based extraction
+        logger.info("Using fallback regex extraction")
+        # Always try to extract new information from the message first
+        message_lower = message.lower()
+        parsed = dict(_NO_TRIP_FIELDS) if _is_confirmation(message_lower) else _parse_message(message_lower)
+        new_origin = parsed["origin"]
+        new_destination = parsed["destination"]
+        new_travelers = parsed["travelers"]
+        new_start_date = parsed["start_date"]
+        new_end_date = parsed["end_date"]
+        new_budget_range = parsed["budget_range"]
+        new_interests = parsed["interests"]
+        new_occasion = parsed["occasion"]
+        new_duration_days = parsed["duration_days"]
         
-        if not origin or not destination:
-            logger.info("Missing origin or destination")
-            return None
+        # Use new information if available, otherwise fall back to existing conversation state
+        origin = new_origin or conversation_state.get("origin")
+        destination = new_destination or conversation_state.get("destination")
+        travelers = new_travelers or conversation_state.get("travelers")
+        start_date = new_start_date or conversation_state.get("start_date")
+        end_date = new_end_date or conversation_state.get("end_date")
+        budget_range = new_budget_range or conversation_state.get("budget_range")
+        
+        # Handle interests properly - merge new interests with existing ones
+        existing_interests = conversation_state.get("interests")
+        if not isinstance(existing_interests, list):
+            existing_interests = []
+        if new_interests:
+            # Add new interests to existing ones, avoiding duplicates
+            all_interests = existing_interests + [interest for interest in new_interests if interest not in existing_interests]
+            interests = all_interests
+        else:
+            interests = existing_interests
         
+        duration_days = new_duration_days or conversation_state.get("duration_days")
+    
+    # Debug logging
+    logger.debug(
+        "Extracted origin=%s destination=%s travelers=%s start_date=%s budget_range=%s interests=%s from message: %s",
+        origin, destination, travelers, start_date, budget_range, interests, message
+    )
+    
+    # Update conversation state with extracted information
+    if origin:
+        conversation_state["origin"] = origin
+    if destination:
+        conversation_state["destination"] = destination
+    if travelers:
+        conversation_state["travelers"] = travelers
+    if start_date:
+        conversation_state["start_date"] = start_date
+    if end_date:
+        conversation_state["end_date"] = end_date
+    if budget_range:
+        conversation_state["budget_range"] = budget_range
+    if interests:
+        conversation_state["interests"] = interests
+    if new_occasion:
+        conversation_state["occasion"] = new_occasion
+    if duration_days:
+        conversation_state["duration_days"] = duration_days
+    
+    if not origin or not destination:
+        logger.info("Missing origin or destination")
+        return None
+    
+    try:
         # 🚀 SMART TRIP LOGIC: Analyze destination and apply intelligent planning
-        logger.info(f"Applying Smart Trip Logic for destination: {destination}")
+        logger.info("Applying Smart Trip Logic for destination: %s", destination)
         smart_trip_analysis = await smart_destination_service.analyze_trip_type(message)
-        logger.info(f"Smart trip analysis: {smart_trip_analysis}")
-        
+        logger.info("Smart trip analysis: %s", smart_trip_analysis)
+    
         # Apply smart logic based on trip type
         if smart_trip_analysis["trip_type"] == "national_park":
             logger.info("National park trip detected - applying smart airport logic")
             airport_recommendation = await smart_destination_service.get_smart_airport_recommendation(
                 destination, smart_trip_analysis["trip_type"]
             )
-            
+        
             if airport_recommendation and airport_recommendation.get("primary_airport"):
                 # Update origin to use the recommended airport
                 recommended_airport = airport_recommendation["airport_name"]
-                logger.info(f"Recommended airport for {destination}: {recommended_airport}")
-                
+                logger.info("Recommended airport for %s: %s", destination, recommended_airport)
+            
                 # Store smart trip data in conversation state for later use
                 conversation_state["smart_trip_data"] = {
                     "trip_type": "national_park",
@@ -663,15 +995,15 @@ async def _extract_trip_request(message: str, conversation_state: Dict[str, Any]
                     "transportation_options": airport_recommendation.get("transportation_options", []),
                     "minimum_days": airport_recommendation.get("minimum_days", 3)
                 }
-                
+            
                 # Update destination to include airport info
                 destination = f"{destination} (via {recommended_airport})"
                 conversation_state["destination"] = destination
-                
+            
         elif smart_trip_analysis["trip_type"] == "multi_city":
             logger.info("Multi-city trip detected - applying route planning logic")
             route_suggestion = smart_destination_service.get_multi_city_route_suggestion(destination)
-            
+        
             if route_suggestion:
                 conversation_state["smart_trip_data"] = {
                     "trip_type": "multi_city",
@@ -681,23 +1013,27 @@ async def _extract_trip_request(message: str, conversation_state: Dict[str, Any]
                     "transportation": route_suggestion.get("transportation", {}),
                     "minimum_days": route_suggestion.get("minimum_days", 7)
                 }
-                
+            
                 # Update destination to reflect multi-city nature
                 cities_str = ", ".join(route_suggestion.get("cities", []))
                 destination = f"{destination} ({cities_str})"
                 conversation_state["destination"] = destination
-        
-        # Calculate end_date from start_date + duration_days if both are available
-        calculated_end_date = None
-        if start_date and duration_days:
-            try:
-                from datetime import datetime, timedelta
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                end_dt = start_dt + timedelta(days=duration_days)
-                calculated_end_date = end_dt.strftime("%Y-%m-%d")
-            except:
-                calculated_end_date = end_date  # Fallback to original end_date if calculation fails
-        
+    
+    except Exception:
+        # Smart data is an enhancement; plan without it rather than drop the request
+        logger.exception("Smart trip analysis failed for destination: %s", destination)
+    
+    # Calculate end_date from start_date + duration_days if both are available
+    calculated_end_date = None
+    if start_date and duration_days:
+        try:
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+            end_dt = start_dt + timedelta(days=duration_days)
+            calculated_end_date = end_dt.strftime("%Y-%m-%d")
+        except (TypeError, ValueError, OverflowError):
+            calculated_end_date = end_date  # Fallback to original end_date if calculation fails
+    
+    try:
         return TripPlanningRequest(
             origin=origin,
             destination=destination,
@@ -712,25 +1048,95 @@ async def _extract_trip_request(message: str, conversation_state: Dict[str, Any]
             total_budget=None # This will be populated from conversation_state later
         )
         
-    except Exception as e:
-        logger.error(f"Error extracting trip request: {e}")
+    except ValueError as e:  # pydantic ValidationError, e.g. bad values carried in conversation_state
+        logger.warning("Invalid trip request fields: %s", e)
         return None
 
+# Replies made up only of these words ("yes, go ahead") can't trigger any extractor
+_CONFIRMATION_WORDS = frozenset({
+    "yes", "yeah", "yep", "sure", "ok", "okay", "alright", "please", "thanks", "thank", "you",
+    "sounds", "looks", "good", "great", "perfect", "fine", "awesome", "that",
+    "go", "ahead", "do", "it", "lets", "let's", "proceed", "confirm", "confirmed", "correct",
+})
+_NO_TRIP_FIELDS = {
+    "origin": None, "destination": None, "travelers": None, "start_date": None, "end_date": None,
+    "budget_range": None, "total_budget": None, "interests": None, "occasion": None, "duration_days": None,
+}
+
+# Punctuation becomes a word break, so "ok,sure" splits like "ok, sure"
+_CONFIRMATION_PUNCTUATION = str.maketrans(dict.fromkeys(".,!?;:", " "))
+
+def _is_confirmation(message_lower: str) -> bool:
+    """True for a bare confirmation reply that carries no trip details"""
+    return set(message_lower.translate(_CONFIRMATION_PUNCTUATION).split()) <= _CONFIRMATION_WORDS
+
+_PARSE_CACHE_SIZE = 4096
+_PARSE_CACHE_MAX_CHARS = 1000  # longer messages are parsed but not cached
+
+def _parse_message(message_lower: str) -> Dict[str, Any]:
+    """Extract every trip field from a lowercased message in one go.
+
+    Equivalent to calling each _extract_* helper, but the route pattern and
+    the keyword tables are each scanned once for all fields that use them.
+    Repeated messages (retries, resends) are served from an LRU cache.
+    """
+    if len(message_lower) > _PARSE_CACHE_MAX_CHARS:
+        return _parse_message_uncached(message_lower)
+    # Month-day dates resolve against the current year, so the day is part of the key
+    parsed = dict(_parse_message_cached(message_lower, date.today()))
+    if parsed["interests"]:
+        parsed["interests"] = list(parsed["interests"])
+    return parsed
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_message_cached(message_lower: str, today: date) -> tuple:
+    """Immutable (field, value) pairs of _parse_message_uncached, for caching"""
+    parsed = _parse_message_uncached(message_lower)
+    if parsed["interests"]:
+        parsed["interests"] = tuple(parsed["interests"])
+    return tuple(parsed.items())
+
+def _parse_message_uncached(message_lower: str) -> Dict[str, Any]:
+    """Run the fused extraction for _parse_message"""
+    route = _FROM_TO_RE.search(message_lower)
+    if route:
+        origin, destination = _route_origin(route), _route_destination(route)
+    else:
+        origin = _extract_origin_phrase(message_lower)
+        destination = _extract_destination_phrase(message_lower)
+    
+    keyword_hits = _keyword_categories(message_lower, _TRIP_KEYWORDS, _TRIP_KEYWORD_AC)
+    interests = [category for field, category in keyword_hits if field == "interests"]
+    budget_range, total_budget = _extract_dollar_budget(message_lower)
+    if not budget_range:
+        budget_range = next((category for field, category in keyword_hits if field == "budget_range"), None)
+    
+    return {
+        "origin": origin,
+        "destination": destination,
+        "travelers": _extract_travelers(message_lower),
+        "start_date": _extract_start_date(message_lower),
+        "end_date": _extract_end_date(message_lower),
+        "budget_range": budget_range,
+        "total_budget": total_budget,
+        "interests": interests or None,
+        "occasion": next((category for field, category in keyword_hits if field == "occasion"), None),
+        "duration_days": _extract_duration_days(message_lower),
+    }
+
 def _extract_city_name(message: str) -> Optional[str]:
     """Extract a city name from a simple message (for context-aware extraction)"""
     # Remove common words and clean the message
-    message_clean = re.sub(r'\b(plan|trip|travel|go|visit|to|from|the|a|an)\b', '', message.lower()).strip()
+    message_clean = _CITY_FILLER_RE.sub('', message.lower()).strip()
     
     # Look for city-like patterns (2-3 words, capitalized)
-    city_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
-    matches = re.findall(city_pattern, message)
+    matches = _CAPITALIZED_WORDS_RE.findall(message)
     
     if matches:
         # Return the first match that looks like a city name
         for match in matches:
             # Check if it's a known city name
-            known_cities = ['dallas', 'miami', 'new york', 'los angeles', 'chicago', 'houston', 'phoenix', 'philadelphia', 'san antonio', 'san diego', 'austin', 'jacksonville', 'fort worth', 'columbus', 'charlotte', 'san francisco', 'indianapolis', 'seattle', 'denver', 'washington', 'boston', 'el paso', 'nashville', 'detroit', 'oklahoma city', 'portland', 'las vegas', 'memphis', 'louisville', 'baltimore', 'milwaukee', 'albuquerque', 'tucson', 'fresno', 'sacramento', 'mesa', 'kansas city', 'atlanta', 'long beach', 'colorado springs', 'raleigh', 'virginia beach', 'omaha', 'oakland', 'minneapolis', 'tulsa', 'arlington', 'tampa', 'new orleans']
-            if match.lower() in known_cities:
+            if match.lower() in _KNOWN_CITIES:
                 return match
     
     # If no matches found, try to extract from the cleaned message
@@ -739,226 +1145,171 @@ def _extract_city_name(message: str) -> Optional[str]:
     
     return None
 
-def _extract_origin(message: str) -> Optional[str]:
-    """Extract origin from message"""
+def _extract_origin(message_lower: str) -> Optional[str]:
+    """Extract origin from lowercased message"""
     # Look for "from X to Y" pattern - handle multi-word cities
-    # More flexible pattern that captures origin even with additional text after destination
-    from_to_pattern = r"from\s+([a-zA-Z\s]+?)\s+to\s+([a-zA-Z\s]+?)(?:\s*[,]?\s*(?:\d+|\s+travelers?|\s+starting|\s+from|\s+days?|\s+\$|\s+budget|$))"
-    match = re.search(from_to_pattern, message.lower())
+    match = _FROM_TO_RE.search(message_lower)
     if match:
-        origin = match.group(1).strip().title()
-        logger.info(f"Extracted origin using from_to_pattern: '{origin}'")
-        return origin
-    
+        return _route_origin(match)
+    return _extract_origin_phrase(message_lower)
+
+def _route_origin(match) -> str:
+    """Origin from a "from X to Y" match"""
+    origin = match.group(1).strip().title()
+    logger.debug("Extracted origin using from_to_pattern: '%s'", origin)
+    return origin
+
+def _extract_origin_phrase(message_lower: str) -> Optional[str]:
+    """Origin from phrasings other than a "from X to Y" route"""
     # Look for "go from X" pattern
-    go_from_pattern = r"go\s+from\s+([a-zA-Z\s]+)"
-    match = re.search(go_from_pattern, message.lower())
+    match = _GO_FROM_RE.search(message_lower)
     if match:
         origin = match.group(1).strip().title()
-        logger.info(f"Extracted origin using go_from_pattern: '{origin}'")
+        logger.debug("Extracted origin using go_from_pattern: '%s'", origin)
         return origin
     
-    logger.info(f"No origin found in message: '{message}'")
+    logger.debug("No origin found in message: '%s'", message_lower)
     return None
 
-def _extract_destination(message: str) -> Optional[str]:
-    """Extract destination from message"""
+def _extract_destination(message_lower: str) -> Optional[str]:
+    """Extract destination from lowercased message"""
     # Look for "from X to Y" pattern - handle multi-word cities
-    # More flexible pattern that captures destination even with additional text after
-    from_to_pattern = r"from\s+([a-zA-Z\s]+?)\s+to\s+([a-zA-Z\s]+?)(?:\s*[,]?\s*(?:\d+|\s+travelers?|\s+starting|\s+from|\s+days?|\s+\$|\s+budget|$))"
-    match = re.search(from_to_pattern, message.lower())
+    match = _FROM_TO_RE.search(message_lower)
     if match:
-        destination = match.group(2).strip()
-        # Clean up destination - remove any trailing words that are not city names
-        destination_words = destination.split()
-        # Remove common non-city words from the end
-        non_city_words = ['for', 'with', 'in', 'on', 'and', 'or', 'travelers', 'traveler', 'starting', 'from', 'days', 'day', 'budget']
-        while destination_words and destination_words[-1].lower() in non_city_words:
-            destination_words.pop()
-        final_destination = ' '.join(destination_words).title()
-        logger.info(f"Extracted destination using from_to_pattern: '{final_destination}'")
-        return final_destination
-    
+        return _route_destination(match)
+    return _extract_destination_phrase(message_lower)
+
+def _route_destination(match) -> str:
+    """Destination from a "from X to Y" match"""
+    final_destination = _trim_destination(match.group(2), _ROUTE_TRAILING_WORDS)
+    logger.debug("Extracted destination using from_to_pattern: '%s'", final_destination)
+    return final_destination
+
+def _trim_destination(destination: str, trailing_words: frozenset) -> str:
+    """Title-case a captured (already lowercased) destination without its trailing non-city words"""
+    destination_words = destination.split()
+    while destination_words and destination_words[-1] in trailing_words:
+        destination_words.pop()
+    return ' '.join(destination_words).title()
+
+def _extract_destination_phrase(message_lower: str) -> Optional[str]:
+    """Destination from phrasings other than a "from X to Y" route"""
     # Look for "go to X" pattern - improved to handle more cases
-    go_to_patterns = [
-        r"go\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+in|\s+on|$)",
-        r"want\s+to\s+go\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+in|\s+on|$)",
-        r"travel\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+in|\s+on|$)",
-        r"visit\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+in|\s+on|$)"
-    ]
-    
-    for pattern in go_to_patterns:
-        match = re.search(pattern, message.lower())
+    for pattern in _GO_TO_RES:
+        match = pattern.search(message_lower)
         if match:
-            destination = match.group(1).strip()
-            # Clean up destination - remove any trailing words that are not city names
-            destination_words = destination.split()
-            # Remove common non-city words from the end
-            non_city_words = ['for', 'with', 'in', 'on', 'and', 'or']
-            while destination_words and destination_words[-1].lower() in non_city_words:
-                destination_words.pop()
-            return ' '.join(destination_words).title()
+            return _trim_destination(match.group(1), _GO_TO_TRAILING_WORDS)
     
     # Look for destination keywords
-    destination_keywords = ["visit", "travel to", "explore"]
-    for keyword in destination_keywords:
-        if keyword in message.lower():
+    for keyword, pattern in _DESTINATION_KEYWORD_RES:
+        if keyword in message_lower:
             # Extract the word after the keyword
-            pattern = rf"{keyword}\s+([a-zA-Z\s]+)"
-            match = re.search(pattern, message.lower())
+            match = pattern.search(message_lower)
             if match:
                 return match.group(1).strip().title()
     
     # Look for "Plan a trip to X" pattern
-    plan_trip_pattern = r"plan\s+(?:a\s+)?trip\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+visiting|\s+starting|\s+\d+|\s+travelers?|\s+days?|\s+\$|\s+budget|$)"
-    match = re.search(plan_trip_pattern, message.lower())
+    match = _PLAN_TRIP_RE.search(message_lower)
     if match:
-        destination = match.group(1).strip()
-        # Clean up destination - remove any trailing words that are not city names
-        destination_words = destination.split()
-        non_city_words = ['for', 'with', 'visiting', 'starting', 'from', 'days', 'day', 'budget', 'travelers', 'traveler']
-        while destination_words and destination_words[-1].lower() in non_city_words:
-            destination_words.pop()
-        final_destination = ' '.join(destination_words).title()
-        logger.info(f"Extracted destination using plan_trip_pattern: '{final_destination}'")
+        final_destination = _trim_destination(match.group(1), _PLAN_TRIP_TRAILING_WORDS)
+        logger.debug("Extracted destination using plan_trip_pattern: '%s'", final_destination)
         return final_destination
     
     # Look for "Plan trip to X" pattern (without "a")
-    plan_trip_pattern2 = r"plan\s+trip\s+to\s+([a-zA-Z\s]+?)(?:\s+for|\s+with|\s+visiting|\s+starting|\s+\d+|\s+travelers?|\s+days?|\s+\$|\s+budget|$)"
-    match = re.search(plan_trip_pattern2, message.lower())
+    match = _PLAN_TRIP_NO_ARTICLE_RE.search(message_lower)
     if match:
-        destination = match.group(1).strip()
-        # Clean up destination - remove any trailing words that are not city names
-        destination_words = destination.split()
-        non_city_words = ['for', 'with', 'visiting', 'starting', 'from', 'days', 'day', 'budget', 'travelers', 'traveler']
-        while destination_words and destination_words[-1].lower() in non_city_words:
-            destination_words.pop()
-        final_destination = ' '.join(destination_words).title()
-        logger.info(f"Extracted destination using plan_trip_pattern2: '{final_destination}'")
+        final_destination = _trim_destination(match.group(1), _PLAN_TRIP_TRAILING_WORDS)
+        logger.debug("Extracted destination using plan_trip_pattern2: '%s'", final_destination)
         return final_destination
     
     return None
 
-def _extract_travelers(message: str) -> Optional[int]:
-    """Extract number of travelers from message"""
-    # Convert word numbers to digits for easier processing
-    word_to_number = {
-        'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-        'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10
-    }
-    
-    # Replace word numbers with digits
-    message_processed = message.lower()
-    for word, number in word_to_number.items():
-        message_processed = message_processed.replace(word, str(number))
+def _extract_travelers(message_lower: str) -> Optional[int]:
+    """Extract number of travelers from lowercased message"""
+    # Replace word numbers with digits for easier processing
+    message_processed = _WORD_NUMBER_RE.sub(lambda match: _WORD_TO_NUMBER[match.group(1)], message_lower)
     
-    # Look for numbers followed by traveler keywords
-    traveler_patterns = [
-        r"(\d+)\s+(people|travelers|guests|adults)",
-        r"(\d+)\s+(person|traveler|guest|adult)",
-        r"(solo|alone|myself)",
-        r"(couple|romantic|boyfriend|girlfriend)",
-        r"(family|kids|children)"
-    ]
-    
-    for pattern in traveler_patterns:
-        match = re.search(pattern, message_processed)
-        if match:
-            if pattern == r"(solo|alone|myself)":
-                return 1
-            elif pattern == r"(couple|romantic|boyfriend|girlfriend)":
-                return 2
-            elif pattern == r"(family|kids|children)":
-                # Extract family size if mentioned, otherwise default to 4 for family
-                family_size_match = re.search(r"(\d+)\s+(people|travelers|guests|adults)", message_processed)
-                if family_size_match:
-                    return int(family_size_match.group(1))
-                return 4  # Default family size
-            else:
-                return int(match.group(1))
-    
-    # NEW: Look for standalone numbers that might be travelers
-    # This catches cases like "for 2 starting" or "2 travelers"
-    standalone_number_patterns = [
-        r"for\s+(\d+)\s+starting",
-        r"(\d+)\s+starting",
-        r"(\d+)\s+travelers?",
-        r"(\d+)\s+people",
-        r"(\d+)\s+adults?"
-    ]
-    
-    for pattern in standalone_number_patterns:
-        match = re.search(pattern, message_processed)
-        if match:
-            number = int(match.group(1))
-            # Validate reasonable traveler count
-            if 1 <= number <= 20:
-                return number
+    for match in _matches_by_priority(_TRAVELER_RE, message_processed, _TRAVELER_PRIORITY):
+        travelers = _TRAVELER_HANDLERS[match.lastgroup](match)
+        if travelers is not None:
+            return travelers
     
     return None
 
-def _extract_start_date(message: str) -> Optional[str]:
-    """Extract start date from message"""
-    # Look for date patterns - only match actual month names
-    month_names = ['january', 'february', 'march', 'april', 'may', 'june', 
-                  'july', 'august', 'september', 'october', 'november', 'december']
-    month_abbr = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-    
-    date_patterns = [
-        r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})",  # MM/DD/YYYY
-    ]
-    
-    # Add patterns for each month name
-    for month in month_names + month_abbr:
-        date_patterns.append(rf"({month})\s+(\d{{1,2}})(?:st|nd|rd|th)?")  # Month Day
-        date_patterns.append(rf"(\d{{1,2}})\s+({month})(?:st|nd|rd|th)?")  # Day Month
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, message.lower())
-        if match:
-            try:
-                # Try to parse the date
-                date_str = match.group(0)
-                parsed_date = date_parser.parse(date_str, fuzzy=True)
-                return parsed_date.strftime("%Y-%m-%d")
-            except:
-                continue
+def _extract_start_date(message_lower: str) -> Optional[str]:
+    """Extract start date from lowercased message"""
+    today = date.today()
+    # Numeric dates first, then month-name dates in the order they appear
+    matches = sorted(_DATE_RE.finditer(message_lower), key=lambda match: match.lastgroup != "mdy")
+    for match in matches:
+        parsed_date = _parse_date_match(match, today)
+        if parsed_date:
+            return parsed_date.strftime("%Y-%m-%d")
     
     # If no specific date found, return None and let the planning system handle it
     return None
 
-def _extract_end_date(message: str) -> Optional[str]:
-    """Extract end date from message"""
+def _parse_date_match(match, today: date) -> Optional[date]:
+    """Build the date for a _DATE_RE match, or None if it is not a real date.
+    
+    Reads these shapes the way dateutil would (month first unless that is
+    impossible, two-digit years within 50 years of today) without running its
+    fuzzy tokenizer. A date without a year is the next one on or after today,
+    since trips are planned ahead.
+    """
+    try:
+        if match.lastgroup == "mdy":
+            month, day = int(match.group("mdy_month")), int(match.group("mdy_day"))
+            year_text = match.group("mdy_year")
+            if len(year_text) == 3:
+                # Unusual enough to leave to dateutil
+                return date_parser.parse(match.group(0)).date()
+            year = int(year_text)
+            if len(year_text) == 2:
+                year += today.year // 100 * 100
+                if year >= today.year + 50:
+                    year -= 100
+                elif year < today.year - 50:
+                    year += 100
+            if month > 12 and day <= 12:
+                month, day = day, month
+            return date(year, month, day)
+        if match.lastgroup == "month_day":
+            return _upcoming_date(today, _MONTHS[match.group("md_month")], int(match.group("md_day")))
+        return _upcoming_date(today, _MONTHS[match.group("dm_month")], int(match.group("dm_day")))
+    except (ValueError, OverflowError):
+        return None
+
+def _upcoming_date(today: date, month: int, day: int) -> date:
+    """This year's month/day, or next year's if it has already passed"""
+    this_year = date(today.year, month, day)
+    if this_year >= today:
+        return this_year
+    try:
+        return date(today.year + 1, month, day)
+    except ValueError:  # Feb 29 with no leap day next year
+        return this_year
+
+def _extract_end_date(message_lower: str) -> Optional[str]:
+    """Extract end date from lowercased message"""
     # For now, we'll use start_date + 7 days as default
     # This can be enhanced with more sophisticated date extraction
     return None
 
-def _extract_budget(message: str):
-    """Extract budget range and numeric value from message"""
-    message_lower = message.lower()
-    
+def _extract_budget(message_lower: str):
+    """Extract budget range and numeric value from lowercased message"""
     # FIRST: Check for dollar amounts and price ranges (priority over keywords)
-    dollar_patterns = [
-        r"\$(\d+)(?:-\d+)?\s*(?:per\s+day|daily|budget)",
-        r"(\d+)(?:-\d+)?\s*dollars?\s*(?:per\s+day|daily|budget)",
-        r"budget\s*of\s*\$?(\d+)",
-        r"spend\s*\$?(\d+)",
-        r"^\$(\d+)$",  # Just "$2000" 
-        r"^(\d+)\$$",  # Just "2000$"
-        r"^(\d+)$",    # Just "2000"
-        r"luxury\s*\(\$(\d+)\+/day\)",  # "Luxury ($300+/day)"
-        r"moderate\s*\(\$(\d+)-(\d+)/day\)",  # "Moderate ($100-300/day)"
-        r"budget-friendly\s*\(\$(\d+)-(\d+)/day\)",  # "Budget-friendly ($50-100/day)"
-        r"with\s*(\d+)\$",  # "with 3500$"
-        r"(\d+)\$\s*budget",  # "3500$ budget"
-        r"budget\s*(\d+)\$",  # "budget 3500$"
-        r"(\d+)\$\s*starting",  # "3500$ starting"
-        r"starting\s*(\d+)\$"   # "starting 3500$"
-    ]
+    budget_range, total_budget = _extract_dollar_budget(message_lower)
+    if budget_range:
+        return budget_range, total_budget
     
-    for pattern in dollar_patterns:
-        match = re.search(pattern, message_lower)
+    # SECOND: Check for budget keywords (only if no dollar amounts found) - luxury first
+    return _first_keyword_category(message_lower, _BUDGET_KEYWORDS, _BUDGET_AC), None
+
+def _extract_dollar_budget(message_lower: str):
+    """Budget range and daily amount from an explicit dollar figure"""
+    for pattern in _DOLLAR_RES:
+        match = pattern.search(message_lower)
         if match:
             amounts = [int(match.group(i)) for i in range(1, len(match.groups()) + 1)]
             avg_amount = sum(amounts) / len(amounts)
@@ -968,142 +1319,91 @@ def _extract_budget(message: str):
                 return "moderate", avg_amount
             else:
                 return "luxury", avg_amount
-    
-    # SECOND: Check for budget keywords (only if no dollar amounts found) - check luxury first
-    budget_keywords = {
-        "luxury": ["luxury", "premium", "high end", "expensive", "upscale", "deluxe", "premium"],
-        "moderate": ["moderate", "reasonable", "standard", "mid-range", "comfortable", "balanced"],
-        "budget": ["budget", "cheap", "affordable", "low cost", "economy", "thrifty", "backpacker"]
-    }
-    
-    for budget_range, keywords in budget_keywords.items():
-        if any(keyword in message_lower for keyword in keywords):
-            return budget_range, None
-    
     return None, None
 
-def _extract_duration_days(message: str) -> Optional[int]:
-    """Extract duration in days from message"""
-    # Look for patterns like "for X days", "X days", "X-day trip"
-    duration_patterns = [
-        r"for\s+(\d+)\s+days?",  # "for 5 days"
-        r"(\d+)\s+days?",  # "5 days"
-        r"(\d+)-day\s+trip",  # "5-day trip"
-        r"(\d+)\s+day\s+trip",  # "5 day trip"
-        r"(\d+)\s+days?\s+with",  # "5 days with"
-        r"(\d+)\s+days?\s+starting",  # "5 days starting"
-        r"starting.*?(\d+)\s+days?",  # "starting ... 5 days"
-        r"(\d+)\s+days?\s+budget",  # "5 days budget"
-        r"for\s+(\d+)\s+days?\s+with",  # "for 5 days with"
-        r"for\s+(\d+)\s+days?\s+starting"  # "for 5 days starting"
-    ]
-    
-    message_lower = message.lower()
-    for pattern in duration_patterns:
-        match = re.search(pattern, message_lower)
-        if match:
-            days = int(match.group(1))
-            # Validate reasonable duration
-            if 1 <= days <= 365:
-                return days
+def _extract_duration_days(message_lower: str) -> Optional[int]:
+    """Extract duration in days from lowercased message"""
+    for match in _matches_by_priority(_DURATION_RE, message_lower, _DURATION_PRIORITY):
+        days = int(match.group(match.lastgroup))
+        # Validate reasonable duration
+        if 1 <= days <= 365:
+            return days
     
     return None
 
-def _extract_occasion(message: str) -> Optional[str]:
-    """Extract occasion from message"""
-    message_lower = message.lower()
-    
-    occasion_keywords = {
-        "anniversary": ["anniversary", "anniversary trip", "wedding anniversary"],
-        "birthday": ["birthday", "birthday trip", "birthday celebration"],
-        "honeymoon": ["honeymoon", "honeymoon trip"],
-        "graduation": ["graduation", "graduation trip", "graduation celebration"],
-        "wedding": ["wedding", "wedding trip", "wedding celebration"],
-        "celebration": ["celebration", "celebrate", "special occasion"],
-        "business": ["business", "business trip", "work", "work trip", "conference"],
-        "casual": ["casual", "casual trip", "getaway", "relaxation", "vacation"]
-    }
-    
-    for occasion, keywords in occasion_keywords.items():
-        if any(keyword in message_lower for keyword in keywords):
-            return occasion
-    
-    return None
+def _extract_occasion(message_lower: str) -> Optional[str]:
+    """Extract occasion from lowercased message"""
+    return _first_keyword_category(message_lower, _OCCASION_KEYWORDS, _OCCASION_AC)
 
-def _extract_interests(message: str) -> Optional[List[str]]:
-    """Extract interests from message"""
-    interests = []
-    
-    interest_keywords = {
-        "beach": ["beach", "ocean", "sea", "coastal"],
-        "culture": ["culture", "museum", "history", "art", "heritage"],
-        "adventure": ["adventure", "hiking", "outdoor", "nature"],
-        "nightlife": ["nightlife", "party", "club", "bar"],
-        "shopping": ["shopping", "market", "mall", "retail"],
-        "food": ["food", "cuisine", "restaurant", "dining", "gastronomy"],
-        "relaxation": ["relax", "spa", "wellness", "peaceful"],
-        "romance": ["romantic", "couple", "honeymoon", "romance"]
-    }
-    
-    message_lower = message.lower()
-    for interest, keywords in interest_keywords.items():
-        if any(keyword in message_lower for keyword in keywords):
-            interests.append(interest)
-    
+def _extract_interests(message_lower: str) -> Optional[List[str]]:
+    """Extract interests from lowercased message"""
+    interests = _keyword_categories(message_lower, _INTEREST_KEYWORDS, _INTEREST_AC)
     return interests if interests else None
 
+# One bit per trip field, so presence checks are done in a single pass
+_FIELD_ORIGIN = 1 << 0
+_FIELD_DESTINATION = 1 << 1
+_FIELD_TRAVELERS = 1 << 2
+_FIELD_DURATION = 1 << 3
+_FIELD_START_DATE = 1 << 4
+_FIELD_END_DATE = 1 << 5
+_FIELD_BUDGET = 1 << 6
+
+# (attribute, bit, label reported when missing; None for optional fields)
+_TRIP_FIELDS = (
+    ("origin", _FIELD_ORIGIN, "origin"),
+    ("destination", _FIELD_DESTINATION, "destination"),
+    ("travelers", _FIELD_TRAVELERS, "number of travelers"),
+    ("duration_days", _FIELD_DURATION, "duration_days"),
+    ("start_date", _FIELD_START_DATE, "start date"),
+    ("end_date", _FIELD_END_DATE, None),  # calculated from start_date + duration_days
+    ("budget_range", _FIELD_BUDGET, "budget preference"),
+)
+_REQUIRED_FIELDS = (
+    _FIELD_ORIGIN | _FIELD_DESTINATION | _FIELD_TRAVELERS | _FIELD_DURATION | _FIELD_START_DATE | _FIELD_BUDGET
+)
+_CONFIDENCE_FIELDS = (
+    _FIELD_ORIGIN | _FIELD_DESTINATION | _FIELD_TRAVELERS | _FIELD_START_DATE | _FIELD_END_DATE | _FIELD_BUDGET
+)
+_NO_REQUEST_MISSING_INFO = ["origin", "destination", "number of travelers", "duration", "start date", "budget preference"]
+_SUGGESTIONS = {
+    "origin": "Where are you traveling from?",
+    "destination": "Where would you like to go?",
+    "number of travelers": "How many people are traveling? (e.g., 2 adults, 1 child)",
+    "duration_days": "How many days would you like to travel? (e.g., 5 days)",
+    "start date": "When would you like to start your trip? (e.g., 2025-09-20)",
+    "budget preference": "What's your budget preference? (e.g., budget, moderate, luxury)",
+}
+
+def _field_status(trip_request: Optional[TripPlanningRequest]) -> Tuple[int, List[str]]:
+    """Return (bitmask of filled fields, labels of missing mandatory fields)"""
+    if not trip_request:
+        return 0, list(_NO_REQUEST_MISSING_INFO)
+    
+    mask = 0
+    missing = []
+    for attribute, bit, label in _TRIP_FIELDS:
+        if getattr(trip_request, attribute):
+            mask |= bit
+        elif label:
+            missing.append(label)
+    return mask, missing
+
 def _has_sufficient_info(trip_request: Optional[TripPlanningRequest]) -> bool:
     """Check if we have sufficient information to start planning"""
     if not trip_request:
-        logger.info(f"[DEBUG] (before sufficiency check) TripPlanningRequest: None")
+        logger.debug("(before sufficiency check) TripPlanningRequest: None")
         return False
-        
-    logger.info(f"[DEBUG] (before sufficiency check) TripPlanningRequest: {trip_request.dict()} (duration_days type: {type(trip_request.duration_days)})")
-    logger.info(f"[DEBUG] (before sufficiency check) Missing info: {_get_missing_info(trip_request)}")
     
-    # Basic required information
-    has_basic_info = (
-        trip_request.origin and 
-        trip_request.destination and 
-        trip_request.travelers and
-        trip_request.duration_days and
-        trip_request.start_date and
-        trip_request.budget_range
-    )
-    
-    # Check if we have enhancement information for better personalization
-    has_enhancement_info = (
-        trip_request.interests and len(trip_request.interests) > 0
-    )
+    mask, missing = _field_status(trip_request)
+    logger.debug("(before sufficiency check) TripPlanningRequest: %s missing info: %s", trip_request, missing)
     
-    # For now, return True if we have basic info
-    # We'll enhance this to ask for occasion/interests even when basic info is complete
-    return has_basic_info
+    # Interests and occasion are optional; they're asked for separately
+    return (mask & _REQUIRED_FIELDS) == _REQUIRED_FIELDS
 
 def _get_missing_info(trip_request: Optional[TripPlanningRequest]) -> List[str]:
     """Get list of missing mandatory information"""
-    if not trip_request:
-        return ["origin", "destination", "number of travelers", "duration", "start date", "budget preference"]
-        
-    missing = []
-    
-    if not trip_request.origin:
-        missing.append("origin")
-    if not trip_request.destination:
-        missing.append("destination")
-    if not trip_request.travelers:
-        missing.append("number of travelers")
-    if not trip_request.duration_days:
-        missing.append("duration_days")
-    if not trip_request.start_date:
-        missing.append("start date")
-    if not trip_request.budget_range:
-        missing.append("budget preference")
-    
-    # Note: end_date is calculated from start_date + duration_days
-    # interests is optional
-    
-    return missing
+    return _field_status(trip_request)[1]
 
 def _should_ask_for_enhancement(trip_request: Optional[TripPlanningRequest], conversation_state: Dict[str, Any] = None) -> bool:
     """Check if we should ask for enhancement information (occasion, interests) even when basic info is complete"""
@@ -1134,89 +1434,54 @@ def _should_ask_for_enhancement(trip_request: Optional[TripPlanningRequest], con
     # If we don't have occasion info, ask for it
     return True
 
-def _calculate_extraction_confidence(trip_request: Optional[TripPlanningRequest]) -> float:
-    """Calculate confidence score for extracted information"""
-    if not trip_request:
-        return 0.0
-    
-    total_fields = 6  # origin, destination, travelers, start_date, end_date, budget_range
-    filled_fields = 0
-    
-    if trip_request.origin:
-        filled_fields += 1
-    if trip_request.destination:
-        filled_fields += 1
-    if trip_request.travelers:
-        filled_fields += 1
-    if trip_request.start_date:
-        filled_fields += 1
-    if trip_request.end_date:
-        filled_fields += 1
-    if trip_request.budget_range:
-        filled_fields += 1
-    
-    return filled_fields / total_fields
+def _calculate_extraction_confidence(field_mask: int) -> float:
+    """Calculate confidence score from a _field_status bitmask"""
+    # origin, destination, travelers, start_date, end_date, budget_range
+    return bin(field_mask & _CONFIDENCE_FIELDS).count("1") / 6
 
-def _generate_suggestions(trip_request: Optional[TripPlanningRequest]) -> List[str]:
-    """Generate suggestions based on extracted information"""
-    suggestions = []
-    
+def _generate_suggestions(trip_request: Optional[TripPlanningRequest], missing: List[str]) -> List[str]:
+    """Generate suggestions from the missing fields reported by _field_status"""
     if not trip_request:
-        suggestions.append("Please provide your origin and destination")
-        return suggestions
-    
-    if not trip_request.origin:
-        suggestions.append("Where are you traveling from?")
-    if not trip_request.destination:
-        suggestions.append("Where would you like to go?")
-    if not trip_request.travelers:
-        suggestions.append("How many people are traveling? (e.g., 2 adults, 1 child)")
-    if not trip_request.duration_days:
-        suggestions.append("How many days would you like to travel? (e.g., 5 days)")
-    if not trip_request.start_date:
-        suggestions.append("When would you like to start your trip? (e.g., 2025-09-20)")
-    if not trip_request.budget_range:
-        suggestions.append("What's your budget preference? (e.g., budget, moderate, luxury)")
-    
-    return suggestions
+        return ["Please provide your origin and destination"]
+    return [_SUGGESTIONS[label] for label in missing]
 
-async def _start_trip_planning(trip_request: TripPlanningRequest) -> Dict[str, Any]:
+async def _start_trip_planning(trip_request: TripPlanningRequest, batcher: Optional[TripPlanBatcher] = None) -> Dict[str, Any]:
     """Start the trip planning process"""
+    batcher = batcher or trip_plan_batcher
     try:
         # Get smart trip data from conversation state if available
         smart_trip_data = None
         if hasattr(trip_request, 'conversation_state') and trip_request.conversation_state:
             smart_trip_data = trip_request.conversation_state.get("smart_trip_data")
         
-        # Create enhanced AI trip plan request
-        enhanced_request = TripPlanRequest(
-            origin=trip_request.origin,
-            destination=trip_request.destination,
-            duration_days=trip_request.duration_days,
-            start_date=trip_request.start_date,
-            end_date=trip_request.end_date,
-            travelers=trip_request.travelers,
-            budget_range=trip_request.budget_range.value if trip_request.budget_range else "moderate",  # Get enum value
-            trip_type=trip_request.trip_type.value,  # Get enum value
-            interests=trip_request.interests or [],
-            special_requirements=trip_request.special_requirements or "",
-            smart_trip_data=smart_trip_data  # Include smart trip logic data
-        )
+        # Create enhanced AI trip plan request (fields were validated on trip_request)
+        enhanced_request = TripPlanRequest.from_trip_planning(trip_request, smart_trip_data)
         
-        # Generate trip plan using enhanced AI provider
-        result = await enhanced_ai_provider.plan_trip(enhanced_request)
+        # Identical trips reuse a recent plan instead of another provider call
+        cache_key = TripPlanCache.make_key(enhanced_request)
+        cached_plan = trip_plan_cache.get(cache_key)
+        if cached_plan is not None:
+            logger.info("Using cached trip plan for %s to %s", enhanced_request.origin, enhanced_request.destination)
+            return cached_plan
         
-        return {
-            "success": result.success,
-            "itinerary": result.itinerary if result.success else {},
-            "booking_links": result.booking_links if result.success else {},
-            "estimated_costs": result.estimated_costs if result.success else {},
-            "metadata": result.metadata.dict() if result.metadata else None
+        # Generate trip plan using enhanced AI provider (batched with concurrent requests)
+        result = await batcher.submit(enhanced_request)
+        
+        if not result.success:
+            # The chat UIs only read "success" from a failed plan; nothing here is cached
+            return {"success": False}
+        
+        plan = {
+            "success": True,
+            "itinerary": result.itinerary,
+            "booking_links": result.booking_links,
+            "estimated_costs": result.estimated_costs,
+            "metadata": result.metadata.model_dump(mode="json") if result.metadata else None
         }
+        trip_plan_cache.put(cache_key, plan)
+        return plan
         
-    except Exception as e:
-        logger.error(f"Error starting trip planning: {e}")
-        return {
-            "success": False,
-            "error": str(e)
-        } 
\ No newline at end of file
+    except Exception:
+        # Logged here; callers only see that planning failed
+        logger.exception("Error starting trip planning")
+        return {"success": False} 
\ No newline at end of file
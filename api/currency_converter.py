@@ -1,18 +1,48 @@
 import aiohttp
+import asyncio
 import logging
-from typing import Dict, Optional, Union
-from datetime import datetime, timedelta
+import time
+from typing import Dict, Optional, Tuple, Union
 import json
 
+from services.http_session import client_session
+
 logger = logging.getLogger(__name__)
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5)
+RATE_TTL_SECONDS = 3600  # Serve cached rates as-is for 1 hour
+RATE_STALE_SECONDS = 24 * 3600  # then keep serving them while refreshing in the background, up to a day
+
+# ISO 4217 currency codes; anything else can't be priced, so it's
+# rejected without a request to the rate API
+VALID_ISO_4217 = frozenset({
+    "AED", "AFN", "ALL", "AMD", "ANG", "AOA", "ARS", "AUD", "AWG", "AZN",
+    "BAM", "BBD", "BDT", "BGN", "BHD", "BIF", "BMD", "BND", "BOB", "BRL",
+    "BSD", "BTN", "BWP", "BYN", "BZD", "CAD", "CDF", "CHF", "CLP", "CNY",
+    "COP", "CRC", "CUP", "CVE", "CZK", "DJF", "DKK", "DOP", "DZD", "EGP",
+    "ERN", "ETB", "EUR", "FJD", "FKP", "GBP", "GEL", "GHS", "GIP", "GMD",
+    "GNF", "GTQ", "GYD", "HKD", "HNL", "HTG", "HUF", "IDR", "ILS", "INR",
+    "IQD", "IRR", "ISK", "JMD", "JOD", "JPY", "KES", "KGS", "KHR", "KMF",
+    "KPW", "KRW", "KWD", "KYD", "KZT", "LAK", "LBP", "LKR", "LRD", "LSL",
+    "LYD", "MAD", "MDL", "MGA", "MKD", "MMK", "MNT", "MOP", "MRU", "MUR",
+    "MVR", "MWK", "MXN", "MYR", "MZN", "NAD", "NGN", "NIO", "NOK", "NPR",
+    "NZD", "OMR", "PAB", "PEN", "PGK", "PHP", "PKR", "PLN", "PYG", "QAR",
+    "RON", "RSD", "RUB", "RWF", "SAR", "SBD", "SCR", "SDG", "SEK", "SGD",
+    "SHP", "SLE", "SOS", "SRD", "SSP", "STN", "SVC", "SYP", "SZL", "THB",
+    "TJS", "TMT", "TND", "TOP", "TRY", "TTD", "TWD", "TZS", "UAH", "UGX",
+    "USD", "UYU", "UZS", "VES", "VND", "VUV", "WST", "XAF", "XCD", "XOF",
+    "XPF", "YER", "ZAR", "ZMW", "ZWL",
+    "HRK", "SLL",  # retired, but still what location detection reports for Croatia and Sierra Leone
+})
+
 class CurrencyConverter:
     """Currency converter using Exchange Rate API"""
     
     def __init__(self):
         self.base_url = "https://api.exchangerate-api.com/v4/latest"
-        self.cache: Dict[str, Dict] = {}
-        self.cache_duration = timedelta(hours=1)  # Cache rates for 1 hour
+        self.cache: Dict[str, Tuple[float, float, float]] = {}  # cache_key -> (fresh until, usable until, rate), monotonic
+        self.http_session: Optional[aiohttp.ClientSession] = None  # app-wide session, attached by main.lifespan
+        self._inflight: Dict[str, asyncio.Task] = {}  # cache_key -> fetch shared by concurrent callers
         
     async def get_exchange_rate(self, from_currency: str, to_currency: str = "USD") -> Optional[float]:
         """
@@ -25,34 +55,55 @@ class CurrencyConverter:
         Returns:
             Exchange rate as float, or None if failed
         """
+        # One spelling per currency, so "inr" and "INR" share a cache entry
+        from_currency, to_currency = from_currency.strip().upper(), to_currency.strip().upper()
         if from_currency == to_currency:
             return 1.0
+        if from_currency not in VALID_ISO_4217 or to_currency not in VALID_ISO_4217:
+            logger.error(f"Unknown currency code in {from_currency} to {to_currency}")
+            return None
             
         cache_key = f"{from_currency}_{to_currency}"
-        now = datetime.now()
         
         # Check cache first
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            if now - cached_data['timestamp'] < self.cache_duration:
-                logger.info(f"Using cached exchange rate for {from_currency} to {to_currency}: {cached_data['rate']}")
-                return cached_data['rate']
+        entry = self.cache.get(cache_key)
+        if entry is not None:
+            fresh_until, usable_until, rate = entry
+            now = time.monotonic()
+            if now < fresh_until:
+                logger.debug("Using cached exchange rate for %s to %s: %s", from_currency, to_currency, rate)
+                return rate
+            if now < usable_until:
+                # Stale: answer with the cached rate and refresh it in the background
+                self._shared_fetch(from_currency, to_currency)
+                return rate
         
+        # Shielded so one caller giving up doesn't cancel the fetch the others wait on
+        return await asyncio.shield(self._shared_fetch(from_currency, to_currency))
+    
+    def _shared_fetch(self, from_currency: str, to_currency: str) -> asyncio.Task:
+        """The in-flight fetch for this pair, started if there is none; concurrent callers share it"""
+        cache_key = f"{from_currency}_{to_currency}"
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_exchange_rate(from_currency, to_currency))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        return task
+    
+    async def _fetch_exchange_rate(self, from_currency: str, to_currency: str) -> Optional[float]:
+        """Fetch a rate from the API, caching every pair in the response"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with client_session(self.http_session) as session:
                 url = f"{self.base_url}/{from_currency}"
-                async with session.get(url, timeout=10) as response:
+                async with session.get(url, timeout=REQUEST_TIMEOUT) as response:
                     if response.status == 200:
                         data = await response.json()
                         rates = data.get('rates', {})
                         rate = rates.get(to_currency)
+                        self._cache_rates(from_currency, rates)
                         
                         if rate:
-                            # Cache the result
-                            self.cache[cache_key] = {
-                                'rate': rate,
-                                'timestamp': now
-                            }
                             logger.info(f"Got exchange rate for {from_currency} to {to_currency}: {rate}")
                             return rate
                         else:
@@ -66,6 +117,20 @@ class CurrencyConverter:
             logger.error(f"Error getting exchange rate for {from_currency} to {to_currency}: {e}")
             return None
     
+    def _cache_rates(self, base_currency: str, rates: Dict[str, float]) -> None:
+        """Cache every pair in a /latest/{base} response, in both directions"""
+        now = time.monotonic()
+        fresh_until, usable_until = now + RATE_TTL_SECONDS, now + RATE_STALE_SECONDS
+        for currency, rate in rates.items():
+            if not isinstance(rate, (int, float)) or rate <= 0:
+                continue
+            self.cache[f"{base_currency}_{currency}"] = (fresh_until, usable_until, rate)
+            # Keep a fresh reverse rate; it may come from that currency's own response
+            reverse_key = f"{currency}_{base_currency}"
+            reverse = self.cache.get(reverse_key)
+            if reverse is None or reverse[0] <= now:
+                self.cache[reverse_key] = (fresh_until, usable_until, 1.0 / rate)
+    
     async def convert_price(self, price: Union[int, float], from_currency: str, to_currency: str = "USD") -> Optional[float]:
         """
         Convert price from one currency to another
@@ -1,138 +1,155 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import Any, Dict, List, Optional, Tuple
+import functools
 import json
 import os
 from api.enhanced_parser import EnhancedQueryParser
+from services.destination_index import DestinationIndex
 
-router = APIRouter(prefix="/api/destinations", tags=["destinations"])
+try:
+    import orjson
+except ImportError:  # optional faster response serialization
+    orjson = None
+
+_RESPONSE_CLASS = ORJSONResponse if orjson is not None else JSONResponse
+
+router = APIRouter(prefix="/api/destinations", tags=["destinations"], default_response_class=_RESPONSE_CLASS)
 
 # Initialize the parser for airport data
 parser = EnhancedQueryParser()
 
+# Major airports first, so they're preferred when the limit cuts results off;
+# positions below major_airport_count are the major airports. The full database
+# repeats every major airport, so those copies are left out of the index
+_major_airport_codes = {airport.get('column_1', '') for airport in parser.major_airports}
+destination_index = DestinationIndex(
+    parser.major_airports,
+    [airport for airport in parser.airports if airport.get('column_1', '') not in _major_airport_codes]
+)
+major_airport_count = len(parser.major_airports)
+
+_POPULAR_DESTINATIONS = [
+    {"id": "NYC", "name": "New York", "country": "United States", "iata_code": "JFK", "display_name": "New York, United States (JFK)"},
+    {"id": "LAX", "name": "Los Angeles", "country": "United States", "iata_code": "LAX", "display_name": "Los Angeles, United States (LAX)"},
+    {"id": "LHR", "name": "London", "country": "United Kingdom", "iata_code": "LHR", "display_name": "London, United Kingdom (LHR)"},
+    {"id": "CDG", "name": "Paris", "country": "France", "iata_code": "CDG", "display_name": "Paris, France (CDG)"},
+    {"id": "FRA", "name": "Frankfurt", "country": "Germany", "iata_code": "FRA", "display_name": "Frankfurt, Germany (FRA)"},
+    {"id": "NRT", "name": "Tokyo", "country": "Japan", "iata_code": "NRT", "display_name": "Tokyo, Japan (NRT)"},
+    {"id": "SYD", "name": "Sydney", "country": "Australia", "iata_code": "SYD", "display_name": "Sydney, Australia (SYD)"},
+    {"id": "YYZ", "name": "Toronto", "country": "Canada", "iata_code": "YYZ", "display_name": "Toronto, Canada (YYZ)"},
+    {"id": "DXB", "name": "Dubai", "country": "United Arab Emirates", "iata_code": "DXB", "display_name": "Dubai, United Arab Emirates (DXB)"},
+    {"id": "SIN", "name": "Singapore", "country": "Singapore", "iata_code": "SIN", "display_name": "Singapore, Singapore (SIN)"},
+]
+# The popular list never changes, so its response body is encoded once at import
+_POPULAR_DESTINATIONS_BODY = json.dumps(
+    {"destinations": _POPULAR_DESTINATIONS}, ensure_ascii=False, separators=(",", ":")
+).encode("utf-8")
+
 @router.get("/search")
-async def search_destinations(q: str, limit: int = 10):
+async def search_destinations(q: str, response: Response, limit: int = 10):
     """
     Search for destinations (cities, airports) with autocomplete functionality.
     
     Args:
         q: Search query (city name, airport code, or partial match)
+        response: Response whose headers are sent with the results
         limit: Maximum number of results to return (default: 10)
     
     Returns:
-        List of matching destinations with details
+        JSON list of matching destinations with details
     """
+    # Results depend only on q and limit (the airport data is loaded once), so
+    # browsers and proxies can answer repeated keystrokes themselves
+    response.headers["Cache-Control"] = "public, max-age=600"
+    
     if not q or len(q.strip()) < 2:
         return {"destinations": []}
     
     query = q.strip().lower()
-    results = []
     
     try:
-        # Search in major airports first (faster and more relevant)
-        major_airports = parser.major_airports if hasattr(parser, 'major_airports') else []
+        destinations = _search_cached(query, limit)
         
-        for airport in major_airports:
-            if _matches_query(airport, query):
-                result = _format_airport_result(airport, query)
-                if result:
-                    results.append(result)
-                    if len(results) >= limit:
-                        break
-        
-        # If we don't have enough results, search in full database
-        if len(results) < limit:
-            full_airports = parser.airports if hasattr(parser, 'airports') else []
-            
-            for airport in full_airports:
-                if _matches_query(airport, query) and not _already_in_results(airport, results):
-                    result = _format_airport_result(airport, query)
-                    if result:
-                        results.append(result)
-                        if len(results) >= limit:
-                            break
-        
-        # Sort results by relevance score
-        results.sort(key=lambda x: x['relevance_score'], reverse=True)
-        
-        return {
-            "destinations": results[:limit],
-            "query": q,
-            "total_found": len(results)
-        }
+        # Returned directly, the response class encodes the cached results
+        # without another jsonable_encoder pass; it doesn't pick up the
+        # injected response's headers, so they are passed along
+        return _RESPONSE_CLASS(
+            content={"destinations": destinations, "query": _echoable(q), "total_found": len(destinations)},
+            headers={"Cache-Control": response.headers["Cache-Control"]}
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching destinations: {str(e)}")
 
-def _matches_query(airport, query):
-    """Check if airport matches the search query."""
-    # Check various fields for matches
-    searchable_fields = [
-        airport.get('airport_name', '').lower(),
-        airport.get('city_name', '').lower(),
-        airport.get('country_name', '').lower(),
-        airport.get('column_1', '').lower(),  # IATA code
-    ]
-    
-    # Check for exact matches first
-    for field in searchable_fields:
-        if query in field or field.startswith(query):
-            return True
-    
-    # Check for partial word matches
-    query_words = query.split()
-    for field in searchable_fields:
-        field_words = field.split()
-        if any(word in field_words for word in query_words):
-            return True
+# Autocomplete repeats queries as users backspace and retype; the index is built
+# once at import, so results for a (query, limit) pair never go stale
+@functools.lru_cache(maxsize=4096)
+def _search_cached(query: str, limit: int) -> Tuple[Dict[str, Any], ...]:
+    """Ranked results for a lowercased query; shared between requests, so never modified"""
+    results = []
     
-    return False
-
-def _format_airport_result(airport, query):
-    """Format airport data for API response."""
-    try:
-        # Calculate relevance score
-        relevance_score = _calculate_relevance_score(airport, query)
-        
+    for position in destination_index.search(query):
+        relevance_score = _calculate_relevance_score(position, query)
         # Only include airports with reasonable relevance
         if relevance_score < 0.1:
-            return None
-        
-        return {
-            "id": airport.get('column_1', ''),  # IATA code
-            "name": airport.get('airport_name', ''),
-            "city": airport.get('city_name', ''),
-            "country": airport.get('country_name', ''),
-            "iata_code": airport.get('column_1', ''),
-            "display_name": f"{airport.get('city_name', '')}, {airport.get('country_name', '')} ({airport.get('column_1', '')})",
-            "relevance_score": relevance_score,
-            "type": "airport",
-            "coordinates": airport.get('coordinates', {})
-        }
-    except Exception:
-        return None
+            continue
+        results.append((relevance_score, position))
+        if len(results) >= limit:
+            break
+    
+    # Sort results by relevance score
+    results.sort(key=lambda result: result[0], reverse=True)
+    return tuple(
+        _search_result(destination_index.airports[position], relevance_score)
+        for relevance_score, position in results
+    )
+
+def _echoable(text: str) -> str:
+    """text with any lone surrogates replaced, so it can be encoded as UTF-8 JSON"""
+    return text.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+
+def _search_result(airport, relevance_score: float) -> Dict[str, Any]:
+    """An airport's search result"""
+    return {
+        "id": airport.get('column_1', ''),  # IATA code
+        "name": airport.get('airport_name', ''),
+        "city": airport.get('city_name', ''),
+        "country": airport.get('country_name', ''),
+        "iata_code": airport.get('column_1', ''),
+        "display_name": f"{airport.get('city_name', '')}, {airport.get('country_name', '')} ({airport.get('column_1', '')})",
+        "type": "airport",
+        "coordinates": airport.get('coordinates', {}),
+        "relevance_score": relevance_score
+    }
 
-def _calculate_relevance_score(airport, query):
+def _calculate_relevance_score(position, query):
     """Calculate relevance score for ranking results."""
+    airport = destination_index.airports[position]
+    # Fields were lowercased once when the index was built
+    iata_code = destination_index.lowered['column_1'][position]
+    city_name = destination_index.lowered['city_name'][position]
+    airport_name = destination_index.lowered['airport_name'][position]
     score = 0.0
     
     # Exact matches get highest scores
-    if query == airport.get('column_1', '').lower():  # IATA code exact match
+    if query == iata_code:  # IATA code exact match
         score += 100
-    elif query == airport.get('city_name', '').lower():  # City exact match
+    elif query == city_name:  # City exact match
         score += 80
-    elif query == airport.get('airport_name', '').lower():  # Airport name exact match
+    elif query == airport_name:  # Airport name exact match
         score += 70
     
     # Partial matches
-    if query in airport.get('column_1', '').lower():
+    if query in iata_code:
         score += 50
-    if query in airport.get('city_name', '').lower():
+    if query in city_name:
         score += 40
-    if query in airport.get('airport_name', '').lower():
+    if query in airport_name:
         score += 30
     
     # Boost major airports
-    if hasattr(parser, 'major_airports') and airport in parser.major_airports:
+    if position < major_airport_count:
         score += 20
     
     # Boost international airports
@@ -141,25 +158,11 @@ def _calculate_relevance_score(airport, query):
     
     return score
 
-def _already_in_results(airport, results):
-    """Check if airport is already in results to avoid duplicates."""
-    airport_id = airport.get('column_1', '')
-    return any(result['id'] == airport_id for result in results)
-
 @router.get("/popular")
 async def get_popular_destinations():
     """Get list of popular destinations for quick selection."""
-    popular_destinations = [
-        {"id": "NYC", "name": "New York", "country": "United States", "iata_code": "JFK", "display_name": "New York, United States (JFK)"},
-        {"id": "LAX", "name": "Los Angeles", "country": "United States", "iata_code": "LAX", "display_name": "Los Angeles, United States (LAX)"},
-        {"id": "LHR", "name": "London", "country": "United Kingdom", "iata_code": "LHR", "display_name": "London, United Kingdom (LHR)"},
-        {"id": "CDG", "name": "Paris", "country": "France", "iata_code": "CDG", "display_name": "Paris, France (CDG)"},
-        {"id": "FRA", "name": "Frankfurt", "country": "Germany", "iata_code": "FRA", "display_name": "Frankfurt, Germany (FRA)"},
-        {"id": "NRT", "name": "Tokyo", "country": "Japan", "iata_code": "NRT", "display_name": "Tokyo, Japan (NRT)"},
-        {"id": "SYD", "name": "Sydney", "country": "Australia", "iata_code": "SYD", "display_name": "Sydney, Australia (SYD)"},
-        {"id": "YYZ", "name": "Toronto", "country": "Canada", "iata_code": "YYZ", "display_name": "Toronto, Canada (YYZ)"},
-        {"id": "DXB", "name": "Dubai", "country": "United Arab Emirates", "iata_code": "DXB", "display_name": "Dubai, United Arab Emirates (DXB)"},
-        {"id": "SIN", "name": "Singapore", "country": "Singapore", "iata_code": "SIN", "display_name": "Singapore, Singapore (SIN)"},
-    ]
-    
-    return {"destinations": popular_destinations} 
\ No newline at end of file
+    return Response(
+        content=_POPULAR_DESTINATIONS_BODY,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
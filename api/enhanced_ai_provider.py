@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import logging
 import re
 import calendar
@@ -7,6 +8,7 @@ import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import anthropic
+import httpx
 from dotenv import load_dotenv
 
 from .trip_planner_interface import (
@@ -32,8 +34,10 @@ logger = logging.getLogger(__name__)
 class EnhancedAITripProvider(TripPlannerProvider):
     """Enhanced AI-powered trip planning provider using Claude with real API integration"""
     
-    def __init__(self):
-        self.client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        # http_client must be one the SDK accepts (e.g. anthropic.DefaultAsyncHttpxClient);
+        # without it the SDK creates and pools its own
+        self.client = anthropic.AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), http_client=http_client)
         self._available = bool(os.getenv("ANTHROPIC_API_KEY"))
         self.hotel_client = HotelClient()
         self.budget_service = BudgetAllocationService()
@@ -52,7 +56,7 @@ class EnhancedAITripProvider(TripPlannerProvider):
     async def plan_trip(self, request: TripPlanRequest) -> TripPlanResponse:
         """Generate a comprehensive trip plan using AI with real API integration"""
         try:
-            logger.info(f"[DEBUG] plan_trip called with request: {request.dict()}")
+            logger.debug("plan_trip called with request: %s", request)
             # Calculate budget allocation (30-35% for hotels)
             budget_allocation = self._calculate_budget_allocation(request)
             # Get real hotel data with budget constraints
@@ -223,6 +227,17 @@ class EnhancedAITripProvider(TripPlannerProvider):
                 error_message=f"AI planning service temporarily unavailable: {str(e)}"
             )
     
+    async def plan_trip_batch(self, requests: List[TripPlanRequest]) -> List[TripPlanResponse]:
+        """Plan several trips concurrently; responses line up with requests"""
+        results = await asyncio.gather(*(self.plan_trip(request) for request in requests), return_exceptions=True)
+        responses = []
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error(f"Batched trip planning failed: {result!r}")
+                result = self._create_error_response(f"AI planning service temporarily unavailable: {result}")
+            responses.append(result)
+        return responses
+    
     async def _get_hotel_recommendations(self, request: TripPlanRequest, budget_allocation: Dict[str, Any] = None) -> Dict[str, Any]:
         """Get real hotel recommendations using the hotel API with budget allocation"""
         try:
@@ -661,7 +676,7 @@ Return ONLY this JSON structure."""
         """Call Claude API with the planning prompt"""
         
         try:
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model="claude-opus-4-1-20250805",
                 max_tokens=8000,
                 temperature=0.7,
@@ -1,7 +1,10 @@
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Optional, Set, Tuple, List
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
+import copy
+import functools
 import json
+from collections import OrderedDict
 import re
 import requests
 from dateutil import parser as date_parser
@@ -10,6 +13,15 @@ import os
 from dotenv import load_dotenv
 import aiohttp
 
+try:
+    import orjson
+except ImportError:  # optional faster airport data loading
+    orjson = None
+
+from services.http_session import client_session
+from services.keyword_scanner import build_keyword_automaton, matched_categories
+from services.substring_index import SubstringIndex
+
 # Load environment variables
 load_dotenv()
 
@@ -17,79 +29,206 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+_DAYS_OF_WEEK = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+_WEEKDAYS = {day: i for i, day in enumerate(_DAYS_OF_WEEK)}
+
+# Date patterns used on every query, compiled once
+_MONTH_NAMES_PATTERN = '|'.join(_MONTHS)
+# "Month Day" or "Month Dayth/st/nd/rd", e.g. "june 23rd", "march 15th"
+_MONTH_DAY_RE = re.compile(r'\b(' + _MONTH_NAMES_PATTERN + r')\s+(\d{1,2})(?:st|nd|rd|th)?\b')
+# A month name not followed by a number (to avoid "August 15th")
+_MONTH_ONLY_RE = re.compile(r'\b(' + _MONTH_NAMES_PATTERN + r')\b(?!\s+\d)')
+_WEEKDAY_RE = re.compile(r'\b(' + '|'.join(_DAYS_OF_WEEK) + r')\b')
+_TOMORROW_RE = re.compile(r'\btomorrow\b')
+# Letter runs of a query; every whole-word month or weekday is one of them
+_WORD_RE = re.compile(r'[a-z]+')
+
+# Airport-name keywords behind the importance score, by category; each
+# category counts once per airport, whichever of its keywords appear
+_IMPORTANCE_KEYWORDS = {
+    # Major international hubs by name
+    'hub': ['international', 'heathrow', 'jfk', 'charles de gaulle', 'changi', 'incheon', 'dubai', 'amsterdam', 'frankfurt', 'tokyo haneda', 'orly', 'peking', 'beijing capital', 'pudong', 'hongqiao'],
+    # "Capital" airports (like Beijing Capital)
+    'capital': ['capital'],
+    # Major city names in airport names
+    'major_city': ['beijing', 'shanghai', 'london', 'paris', 'new york', 'tokyo', 'dubai', 'singapore', 'seoul', 'frankfurt', 'amsterdam'],
+    # Generic 'airport' is good
+    'airport': ['airport'],
+    # Non-primary airports
+    'penalty': ['heliport', 'seaplane', 'base', 'station', 'regional', 'pontoise', 'beauvais', 'la defense', 'le bourget', 'nanyuan', 'hongqiao'],
+}
+_IMPORTANCE_SCORES = {'hub': 2000, 'capital': 1500, 'major_city': 1000, 'airport': 100, 'penalty': -3000}
+_IMPORTANCE_AC = build_keyword_automaton(_IMPORTANCE_KEYWORDS)
+
+# Airport-name features scored by _score_airport_detailed, one bit each
+_INTERNATIONAL, _CAPITAL, _HUB, _MAJOR_CITY, _AIRPORT, _PENALTY = (1 << bit for bit in range(6))
+_DETAIL_FEATURE_KEYWORDS = {
+    _INTERNATIONAL: ['international'],
+    _CAPITAL: ['capital'],
+    _HUB: ['heathrow', 'jfk', 'lga', 'charles de gaulle', 'changi', 'incheon', 'dubai', 'amsterdam', 'frankfurt', 'tokyo haneda', 'orly', 'peking', 'beijing capital', 'pudong'],
+    _MAJOR_CITY: ['beijing', 'shanghai', 'london', 'paris', 'new york', 'tokyo', 'dubai', 'singapore', 'seoul', 'frankfurt', 'amsterdam'],
+    _AIRPORT: ['airport'],
+    _PENALTY: ['heliport', 'seaplane', 'base', 'station', 'regional', 'pontoise', 'beauvais', 'la defense', 'le bourget', 'nanyuan'],
+}
+_DETAIL_FEATURE_SCORES = {
+    _INTERNATIONAL: 2000.0, _CAPITAL: 1500.0, _HUB: 2000.0, _MAJOR_CITY: 1000.0, _AIRPORT: 100.0, _PENALTY: -3000.0
+}
+_DETAIL_FEATURE_AC = build_keyword_automaton(_DETAIL_FEATURE_KEYWORDS)
+_MAJOR_HUB_CODES = frozenset(_DETAIL_FEATURE_KEYWORDS[_HUB])
+
+@functools.lru_cache(maxsize=16384)
+def _airport_name_features(name: str, iata_code: str) -> int:
+    """Feature bits of a lowercased airport name and IATA code, from one keyword scan"""
+    features = 0
+    for feature in matched_categories(name, _DETAIL_FEATURE_AC):
+        features |= feature
+    if iata_code in _MAJOR_HUB_CODES:
+        features |= _HUB
+    return features
+
+# Airport-type keywords the fallback lookup looks for in airport names.  In
+# addition to the full word ``international`` we also consider the
+# abbreviation ``intl`` which appears in many datasets.
+_NAME_PATTERN_KEYWORDS = {
+    'international': ['international', 'intl'],
+    'hub': ['hub'],
+    'terminal': ['terminal'],
+    'regional': ['regional'],
+    'municipal': ['municipal'],
+    'local': ['local'],
+    'private': ['private'],
+    'military': ['military', 'air force'],
+    'cargo': ['cargo'],
+    'business': ['business', 'executive'],
+}
+_NAME_PATTERN_AC = build_keyword_automaton(_NAME_PATTERN_KEYWORDS)
+
+@functools.lru_cache(maxsize=16384)
+def _airport_name_patterns(name: str) -> Tuple[Dict[str, bool], int]:
+    """Airport-type patterns of a lowercased airport name, and how many are present.
+
+    The dict is shared between calls, so it must not be modified.
+    """
+    found = matched_categories(name, _NAME_PATTERN_AC)
+    patterns = {pattern: pattern in found for pattern in _NAME_PATTERN_KEYWORDS}
+    return patterns, len(found)
+
+MAX_CACHED_EXTRACTIONS = 1024  # LLM extractions kept per parser, by date-resolved query
+MAX_CACHED_LOOKUPS = 4096  # IATA lookups kept per parser
+
+# Common country name variations
+_COUNTRY_MAPPINGS = {
+    "usa": "united states",
+    "united states of america": "united states",
+    "us": "united states",
+    "u.s.": "united states",
+    "u.s.a.": "united states",
+    "uk": "united kingdom",
+    "great britain": "united kingdom",
+    "england": "united kingdom",
+    "canada": "canada",
+    "australia": "australia",
+    "germany": "germany",
+    "france": "france",
+    "spain": "spain",
+    "italy": "italy",
+    "japan": "japan",
+    "china": "china",
+    "india": "india",
+    "brazil": "brazil",
+    "mexico": "mexico"
+}
+
+def _json_loads(data: Any) -> Any:
+    """Parse JSON text or bytes, with orjson when installed (its errors subclass json.JSONDecodeError)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _load_json_file(path: str) -> Any:
+    """Parse a JSON data file, with orjson when installed."""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
 def _resolve_relative_dates(query: str) -> str:
     """Resolve relative dates in the query string."""
     today = datetime.now()
+    today_date = today.date()
+    # A date (at midnight) is in the past if it sorts before now
+    now_key = (today.month, today.day, today.time())
     query_lower = query.lower()
+    # Most queries name no month or weekday; a set intersection lets them
+    # skip those scans entirely
+    words = set(_WORD_RE.findall(query_lower))
+    has_months = not words.isdisjoint(_MONTHS)
+    has_weekdays = not words.isdisjoint(_WEEKDAYS)
 
     # Handle specific dates like "June 23rd", "June 30th", "March 15th"
-    # Pattern: month name + day with ordinal suffix
-    months = {
-        'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
-        'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
-    }
-    
-    # Pattern to match "Month Day" or "Month Dayth/st/nd/rd"
     # Process all matches, not just the first one
-    for month_name, month_number in months.items():
-        # Match patterns like "june 23rd", "june 30th", "march 15th"
-        pattern = r'\b' + month_name + r'\s+(\d{1,2})(?:st|nd|rd|th)?\b'
+    def resolve_month_day(match: re.Match) -> str:
+        month_name = match.group(1)
+        month_number = _MONTHS[month_name]
+        day = int(match.group(2))
+        target_year = today.year
         
-        # Find all matches for this month
-        matches = list(re.finditer(pattern, query_lower))
-        for match in reversed(matches):  # Process in reverse order to avoid index issues
-            day = int(match.group(1))
-            target_year = today.year
-            
-            # If the date is in the past for the current year, use next year
-            target_date = datetime(target_year, month_number, day)
-            if target_date < today:
-                target_date = datetime(target_year + 1, month_number, day)
-            
-            # Replace the matched text with the formatted date
-            start, end = match.span()
-            query_lower = query_lower[:start] + target_date.strftime('%Y-%m-%d') + query_lower[end:]
-            logger.info(f"Resolved specific date: {month_name} {day} -> {target_date.strftime('%Y-%m-%d')}")
+        # If the date is in the past for the current year, use next year
+        if (month_number, day, time.min) < now_key:
+            target_year += 1
+        target_date = date(target_year, month_number, day).isoformat()
+        
+        logger.info(f"Resolved specific date: {month_name} {day} -> {target_date}")
+        return target_date
+
+    # One scan finds every month's dates and rebuilds the string once
+    if has_months:
+        query_lower = _MONTH_DAY_RE.sub(resolve_month_day, query_lower)
 
     # Handle "tomorrow"
     if 'tomorrow' in query_lower:
-        tomorrow_date = today + timedelta(days=1)
-        query_lower = re.sub(r'\btomorrow\b', tomorrow_date.strftime('%Y-%m-%d'), query_lower)
+        tomorrow_date = today_date + timedelta(days=1)
+        query_lower = _TOMORROW_RE.sub(tomorrow_date.isoformat(), query_lower)
 
     # Handle "next week"
     if 'next week' in query_lower:
-        next_week_date = today + timedelta(days=7)
-        query_lower = query_lower.replace('next week', next_week_date.strftime('%Y-%m-%d'))
+        next_week_date = today_date + timedelta(days=7)
+        query_lower = query_lower.replace('next week', next_week_date.isoformat())
 
     # Handle "next month"
     if 'next month' in query_lower:
-        next_month_date = today + relativedelta(months=1)
-        query_lower = query_lower.replace('next month', next_month_date.strftime('%Y-%m-%d'))
-
-    # Handle days of the week (e.g., "this Friday")
-    days_of_week = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-    for i, day in enumerate(days_of_week):
-        if re.search(r'\b' + day + r'\b', query_lower):
-            days_ahead = (i - today.weekday() + 7) % 7
-            if days_ahead == 0:  # If it's today, assume next week
-                days_ahead = 7
-            target_date = today + timedelta(days=days_ahead)
-            query_lower = re.sub(r'\b' + day + r'\b', target_date.strftime('%Y-%m-%d'), query_lower)
-            break
-            
-    # Handle month names (e.g., "in August") - only if no specific date was found
-    for month_name, month_number in months.items():
-        # Use regex to find whole word, not followed by a number (to avoid "August 15th")
-        pattern = r'\b' + month_name + r'\b(?!\s+\d)'
-        if re.search(pattern, query_lower):
-            target_year = today.year
-            # If the month is in the past for the current year, use next year
-            if month_number < today.month:
-                target_year += 1
+        next_month_date = today_date + relativedelta(months=1)
+        query_lower = query_lower.replace('next month', next_month_date.isoformat())
+
+    # Handle days of the week (e.g., "this Friday"); the earliest day in the week wins
+    mentioned_days = {match.group(1) for match in _WEEKDAY_RE.finditer(query_lower)} if has_weekdays else set()
+    if mentioned_days:
+        i = min(_WEEKDAYS[day] for day in mentioned_days)
+        days_ahead = (i - today.weekday() + 7) % 7
+        if days_ahead == 0:  # If it's today, assume next week
+            days_ahead = 7
+        weekday_date = (today_date + timedelta(days=days_ahead)).isoformat()
+        query_lower = _WEEKDAY_RE.sub(
+            lambda match: weekday_date if match.group(1) == _DAYS_OF_WEEK[i] else match.group(0), query_lower
+        )
             
-            target_date = datetime(target_year, month_number, 1)
-            query_lower = re.sub(pattern, target_date.strftime('%Y-%m-%d'), query_lower)
-            break
+    # Handle month names (e.g., "in August") - only if no specific date was found;
+    # the earliest month in the year wins
+    mentioned_months = {match.group(1) for match in _MONTH_ONLY_RE.finditer(query_lower)} if has_months else set()
+    if mentioned_months:
+        month_name = min(mentioned_months, key=_MONTHS.get)
+        month_number = _MONTHS[month_name]
+        target_year = today.year
+        # If the month is in the past for the current year, use next year
+        if month_number < today.month:
+            target_year += 1
+        
+        month_date = date(target_year, month_number, 1).isoformat()
+        query_lower = _MONTH_ONLY_RE.sub(
+            lambda match: month_date if match.group(1) == month_name else match.group(0), query_lower
+        )
             
     return query_lower
 
@@ -99,12 +238,66 @@ class EnhancedQueryParser:
         self.api_key = api_key
         self.airports = self._load_airports_data()
         self.major_airports = self._load_major_airports()
+        # IATA code -> first airport with that code in the full database
+        self.airports_by_iata: Dict[str, Dict[str, Any]] = {}
+        for airport in self.airports:
+            self.airports_by_iata.setdefault(airport.get('column_1'), airport)
         self.airport_importance = self._calculate_airport_importance()
+        # Least recently used first; both are trimmed to their MAX_CACHED_* size
+        self._extraction_cache: OrderedDict = OrderedDict()
+        self._lookup_cache: OrderedDict = OrderedDict()
+        self.http_session: Optional[aiohttp.ClientSession] = None  # app-wide session, attached by main.lifespan
         logger.info(f"Initialized parser with Anthropic API key")
         logger.info(f"Loaded {len(self.airports)} airports from full database")
         logger.info(f"Loaded {len(self.major_airports)} airports from major airports database")
         logger.info(f"Calculated importance scores for {len(self.airport_importance)} airports.")
 
+    @functools.cached_property
+    def airport_columns(self) -> Dict[str, List[str]]:
+        """Full-database fields as one list per field, by position: lowercased
+        airport and city names and normalized country names, for matching and scoring"""
+        return {
+            'airport_name': [airport.get('airport_name', '').lower() for airport in self.airports],
+            'city_name': [airport.get('city_name', '').lower() for airport in self.airports],
+            'country': [self._normalize_country_name(airport.get('country_name', '')) for airport in self.airports],
+        }
+
+    @functools.cached_property
+    def major_airport_columns(self) -> Dict[str, List[str]]:
+        """Lowercased city names and normalized country names of the major airports, by position"""
+        return {
+            'city_name': [airport.get('city_name', '').lower() for airport in self.major_airports],
+            'country': [self._normalize_country_name(airport.get('country_name', '')) for airport in self.major_airports],
+        }
+
+    @functools.cached_property
+    def airports_by_country(self) -> Dict[str, Set[int]]:
+        """Normalized country name -> positions of its airports in the full database"""
+        return self._positions_by_country(self.airport_columns['country'])
+
+    @functools.cached_property
+    def major_airports_by_country(self) -> Dict[str, Set[int]]:
+        """Normalized country name -> positions of its major airports"""
+        return self._positions_by_country(self.major_airport_columns['country'])
+
+    @staticmethod
+    def _positions_by_country(countries: List[str]) -> Dict[str, Set[int]]:
+        """Group positions by their (normalized) country name"""
+        buckets: Dict[str, Set[int]] = {}
+        for position, country in enumerate(countries):
+            buckets.setdefault(country, set()).add(position)
+        return buckets
+
+    @functools.cached_property
+    def major_city_index(self) -> SubstringIndex:
+        """Major-airport city names by position, for "location in city" matching"""
+        return SubstringIndex(zip(self.major_airport_columns['city_name']))
+
+    @functools.cached_property
+    def airport_name_index(self) -> SubstringIndex:
+        """City and airport names of the full database by position"""
+        return SubstringIndex(zip(self.airport_columns['city_name'], self.airport_columns['airport_name']))
+
     def _calculate_airport_importance(self) -> Dict[str, int]:
         """
         Pre-calculate an importance score for all airports.
@@ -120,31 +313,9 @@ class EnhancedQueryParser:
             if not iata_code:
                 continue
 
-            score = 0
+            # One keyword scan of the name finds every category it earns
             name = airport.get('airport_name', '').lower()
-            
-            # Highest bonus for major international hubs by name
-            major_hubs = ['heathrow', 'jfk', 'charles de gaulle', 'changi', 'incheon', 'dubai', 'amsterdam', 'frankfurt', 'tokyo haneda', 'orly', 'peking', 'beijing capital', 'pudong', 'hongqiao']
-            if 'international' in name or any(hub in name for hub in major_hubs):
-                score += 2000
-            
-            # Bonus for "capital" airports (like Beijing Capital)
-            if 'capital' in name:
-                score += 1500
-            
-            # Bonus for major city names in airport names
-            major_cities = ['beijing', 'shanghai', 'london', 'paris', 'new york', 'tokyo', 'dubai', 'singapore', 'seoul', 'frankfurt', 'amsterdam']
-            if any(city in name for city in major_cities):
-                score += 1000
-            
-            # Generic 'airport' is good
-            if 'airport' in name:
-                score += 100
-
-            # Penalties for non-primary airports
-            penalty_terms = ['heliport', 'seaplane', 'base', 'station', 'regional', 'pontoise', 'beauvais', 'la defense', 'le bourget', 'nanyuan', 'hongqiao']
-            if any(term in name for term in penalty_terms):
-                score -= 3000
+            score = sum(_IMPORTANCE_SCORES[category] for category in matched_categories(name, _IMPORTANCE_AC))
             
             scores[iata_code] = score
         return scores
@@ -162,27 +333,32 @@ class EnhancedQueryParser:
             # incorrect matches such as returning ``VGT`` for queries about
             # Las Vegas.  Use the correct file name instead so the full
             # airport list is available as a fallback.
-            with open('api/airports-code.json', 'r', encoding='utf-8') as f:
-                self.airports = json.load(f)
+            self.airports = _load_json_file('api/airports-code.json')
                 
-            # Log data structure analysis
-            if self.airports:
+            logger.info(f"Loaded {len(self.airports)} airports")
+
+            # Log data structure analysis; it walks every airport, so only
+            # when debug logging is on
+            if self.airports and logger.isEnabledFor(logging.DEBUG):
                 first_airport = self.airports[0]
-                logger.info("Airport data structure analysis:")
-                logger.info(f"Total airports: {len(self.airports)}")
-                logger.info("Sample airport fields:")
+                logger.debug("Airport data structure analysis:")
+                logger.debug(f"Total airports: {len(self.airports)}")
+                logger.debug("Sample airport fields:")
                 for key, value in first_airport.items():
-                    logger.info(f"- {key}: {value}")
+                    logger.debug(f"- {key}: {value}")
                 
-                # Analyze common patterns
-                international_count = sum(1 for a in self.airports if 'international' in a.get('airport_name', '').lower())
-                hub_count = sum(1 for a in self.airports if 'hub' in a.get('airport_name', '').lower())
-                terminal_count = sum(1 for a in self.airports if 'terminal' in a.get('airport_name', '').lower())
+                # Analyze common patterns in one pass over the names
+                international_count = hub_count = terminal_count = 0
+                for a in self.airports:
+                    name = a.get('airport_name', '').lower()
+                    international_count += 'international' in name
+                    hub_count += 'hub' in name
+                    terminal_count += 'terminal' in name
                 
-                logger.info(f"\nAirport characteristics:")
-                logger.info(f"- International airports: {international_count}")
-                logger.info(f"- Hub airports: {hub_count}")
-                logger.info(f"- Airports with terminals: {terminal_count}")
+                logger.debug(f"\nAirport characteristics:")
+                logger.debug(f"- International airports: {international_count}")
+                logger.debug(f"- Hub airports: {hub_count}")
+                logger.debug(f"- Airports with terminals: {terminal_count}")
                 
             return self.airports
         except Exception as e:
@@ -192,15 +368,33 @@ class EnhancedQueryParser:
     def _load_major_airports(self) -> List[Dict[str, Any]]:
         """Load major airports data from JSON file."""
         try:
-            with open('major_airports_filtered.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Loaded {len(data)} major airports")
-                return data
+            data = _load_json_file('major_airports_filtered.json')
+            logger.info(f"Loaded {len(data)} major airports")
+            return data
         except Exception as e:
             logger.error(f"Error loading major airports data: {str(e)}")
             return []
 
     def _lookup_iata_code(self, location: str, context: Dict[str, Any] = None, country_hint: str = None) -> Optional[str]:
+        """Look up the IATA code for a location, reusing the result of an identical earlier lookup."""
+        try:
+            key = ((location or '').lower().strip(), country_hint, tuple(sorted(context.items())) if context else ())
+            hash(key)
+        except TypeError:
+            # Context with unhashable values can't be cached
+            return self._lookup_iata_code_uncached(location, context, country_hint)
+        
+        if key in self._lookup_cache:
+            self._lookup_cache.move_to_end(key)
+            return self._lookup_cache[key]
+        
+        iata_code = self._lookup_iata_code_uncached(location, context, country_hint)
+        self._lookup_cache[key] = iata_code
+        if len(self._lookup_cache) > MAX_CACHED_LOOKUPS:
+            self._lookup_cache.popitem(last=False)
+        return iata_code
+
+    def _lookup_iata_code_uncached(self, location: str, context: Dict[str, Any] = None, country_hint: str = None) -> Optional[str]:
         """
         Look up IATA code for a location using a two-tier approach:
         1. First check major_airports_filtered.json
@@ -219,23 +413,15 @@ class EnhancedQueryParser:
 
         # Step 1: Find all potential matches in the major airports list
         candidate_airports = []
-        for airport in self.major_airports:
-            city_name = airport.get('city_name', '').lower()
-            country_name = airport.get('country_name', '').lower()
-
-            # Normalize country names for comparison
-            normalized_country_hint = self._normalize_country_name(country_hint) if country_hint else None
-            normalized_country_name = self._normalize_country_name(country_name)
-
-            # First, filter by country if a hint is provided
-            if normalized_country_hint and normalized_country_name != normalized_country_hint:
-                continue
-            
-            # Then, check if the location is mentioned in the city name
-            if location in city_name:
-                iata_code = airport.get('column_1')
-                if iata_code:
-                    candidate_airports.append(airport)
+        normalized_country_hint = self._normalize_country_name(country_hint) if country_hint else None
+        # Only airports whose city name mentions the location, and only in the
+        # hinted country if a hint is provided
+        same_country = self.major_airports_by_country.get(normalized_country_hint, set()) if normalized_country_hint else None
+        for position in self.major_city_index.search(location, same_country):
+            airport = self.major_airports[position]
+            iata_code = airport.get('column_1')
+            if iata_code:
+                candidate_airports.append(airport)
 
         if not candidate_airports:
             logger.warning(f"No candidates found for '{location}' in major airports. Falling back to full search.")
@@ -279,54 +465,25 @@ class EnhancedQueryParser:
 
     def _get_detailed_airport_info(self, iata_code: str) -> Optional[Dict]:
         """Get detailed airport information from the full airport database."""
-        if not self.airports:
-            return None
-            
-        for airport in self.airports:
-            if airport.get('column_1') == iata_code:
-                return airport
-        return None
+        return self.airports_by_iata.get(iata_code)
 
     def _score_airport_detailed(self, airport: Dict, context: Dict[str, Any] = None) -> float:
         """Score an airport using detailed information from the full database."""
-        score = 0.0
         name = airport.get('airport_name', '').lower()
         iata_code = airport.get('column_1', '').lower()
+        features = _airport_name_features(name, iata_code)
 
-        # Major international indicators
-        if 'international' in name:
-            score += 2000.0
-        
-        # Capital airports (like Beijing Capital)
-        if 'capital' in name:
-            score += 1500.0
-        
-        # Major hub indicators
-        major_hubs = ['heathrow', 'jfk', 'lga', 'charles de gaulle', 'changi', 'incheon', 'dubai', 'amsterdam', 'frankfurt', 'tokyo haneda', 'orly', 'peking', 'beijing capital', 'pudong']
-        if any(hub in name for hub in major_hubs) or iata_code in major_hubs:
-            score += 2000.0
-        
-        # Major city names in airport names
-        major_cities = ['beijing', 'shanghai', 'london', 'paris', 'new york', 'tokyo', 'dubai', 'singapore', 'seoul', 'frankfurt', 'amsterdam']
-        if any(city in name for city in major_cities):
-            score += 1000.0
-        
-        # Generic airport bonus
-        if 'airport' in name:
-            score += 100.0
+        # International, capital, major hub, major city and generic airport
+        # bonuses, and the penalty for non-primary airports
+        score = sum((value for feature, value in _DETAIL_FEATURE_SCORES.items() if features & feature), 0.0)
         
         # Context-based scoring
-        if context:
-            if context.get('is_international', False) and 'international' in name:
+        if context and features & _INTERNATIONAL:
+            if context.get('is_international', False):
                 score += 500.0
-            if context.get('preferred_airport_type') == 'primary' and 'international' in name:
+            if context.get('preferred_airport_type') == 'primary':
                 score += 300.0
         
-        # Penalties for non-primary airports
-        penalty_terms = ['heliport', 'seaplane', 'base', 'station', 'regional', 'pontoise', 'beauvais', 'la defense', 'le bourget', 'nanyuan']
-        if any(term in name for term in penalty_terms):
-            score -= 3000.0
-        
         return score
 
     def _fallback_lookup(self, location: str, context: Dict[str, Any], country_hint: str) -> Optional[str]:
@@ -336,34 +493,21 @@ class EnhancedQueryParser:
             logger.error("No airports data loaded")
             return None
             
-        def analyze_airport_data(airport: dict) -> dict:
+        columns = self.airport_columns
+        normalized_country_hint = self._normalize_country_name(country_hint)
+
+        def analyze_airport_data(position: int) -> dict:
             """
             Analyze airport data to determine its characteristics.
             Uses only the data available in our database.
             """
-            name = airport.get('airport_name', '').lower()
-            city = airport.get('city_name', '').lower()
-            country = airport.get('country_name', '')
+            name = columns['airport_name'][position]
+            city = columns['city_name'][position]
+            normalized_country = columns['country'][position]
             
-            # Analyze the airport name for patterns
-            # Detect common keywords that indicate the airport's type.  In
-            # addition to the full word ``international`` we also consider
-            # the abbreviation ``intl`` which appears in many datasets.
-            name_patterns = {
-                'international': 'international' in name or 'intl' in name,
-                'hub': 'hub' in name,
-                'terminal': 'terminal' in name,
-                'regional': 'regional' in name,
-                'municipal': 'municipal' in name,
-                'local': 'local' in name,
-                'private': 'private' in name,
-                'military': 'military' in name or 'air force' in name,
-                'cargo': 'cargo' in name,
-                'business': 'business' in name or 'executive' in name
-            }
-            
-            # Count how many patterns indicate a major airport
-            major_indicators = sum(1 for v in name_patterns.values() if v)
+            # Detect common keywords that indicate the airport's type, and
+            # count how many patterns indicate a major airport
+            name_patterns, major_indicators = _airport_name_patterns(name)
             
             return {
                 'patterns': name_patterns,
@@ -371,8 +515,8 @@ class EnhancedQueryParser:
                 'is_primary_city': location in city,
                 'name_length': len(name),
                 'has_city_name': location in name,
-                'country': country,
-                'is_correct_country': country_hint and self._normalize_country_name(country) == self._normalize_country_name(country_hint)
+                'country': self.airports[position].get('country_name', ''),
+                'is_correct_country': country_hint and normalized_country == normalized_country_hint
             }
 
         def score_airport(airport: dict, analysis: dict, context: Dict[str, Any] = None) -> float:
@@ -384,9 +528,7 @@ class EnhancedQueryParser:
             
             # Country matching is the most important factor
             if country_hint:
-                normalized_country_hint = self._normalize_country_name(country_hint)
-                normalized_country = self._normalize_country_name(analysis['country'])
-                if normalized_country == normalized_country_hint:
+                if analysis['is_correct_country']:
                     score += 2000.0  # Strongly favor correct country
                 else:
                     return -10000.0  # Completely reject wrong country
@@ -432,22 +574,15 @@ class EnhancedQueryParser:
                 
             return score
 
-        # Find all matching airports
+        # Find all matching airports (the location is in the city name or airport
+        # name), skipping other countries if a country hint is provided
+        same_country = self.airports_by_country.get(normalized_country_hint, set()) if country_hint else None
         matching_airports = []
-        for airport in self.airports:
-            city_name = airport.get('city_name', '').lower()
-            airport_name = airport.get('airport_name', '').lower()
-            
-            # Check for matches in city name or airport name
-            if (location in city_name or location in airport_name):
-                analysis = analyze_airport_data(airport)
-                
-                # Skip if country hint is provided and doesn't match
-                if country_hint and not analysis['is_correct_country']:
-                    continue
-
-                score = score_airport(airport, analysis, context)
-                matching_airports.append((airport, analysis, score))
+        for position in self.airport_name_index.search(location, same_country):
+            airport = self.airports[position]
+            analysis = analyze_airport_data(position)
+            score = score_airport(airport, analysis, context)
+            matching_airports.append((airport, analysis, score))
 
         if not matching_airports:
             logger.warning(f"No matching airports found for: {location}")
@@ -486,66 +621,37 @@ class EnhancedQueryParser:
 
     @staticmethod
     def _is_iata_code(code: str) -> bool:
-        """Check if a string is a valid IATA code."""
-        return len(code) == 3 and code.isalpha()
+        """Check if a string is a valid IATA code (three ASCII letters)."""
+        # isascii() is a flag check on the string, so non-ASCII names like
+        # "köln" never reach the Unicode-aware isalpha() walk
+        return len(code) == 3 and code.isascii() and code.isalpha()
     
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def _normalize_country_name(country: str) -> str:
         """Normalize country names for consistent comparison."""
         if not country:
             return ""
         
         country_lower = country.lower().strip()
-        
-        # Common country name variations
-        country_mappings = {
-            "usa": "united states",
-            "united states of america": "united states",
-            "us": "united states",
-            "u.s.": "united states",
-            "u.s.a.": "united states",
-            "uk": "united kingdom",
-            "great britain": "united kingdom",
-            "england": "united kingdom",
-            "canada": "canada",
-            "australia": "australia",
-            "germany": "germany",
-            "france": "france",
-            "spain": "spain",
-            "italy": "italy",
-            "japan": "japan",
-            "china": "china",
-            "india": "india",
-            "brazil": "brazil",
-            "mexico": "mexico"
+        return _COUNTRY_MAPPINGS.get(country_lower, country_lower)
+
+    async def _extract_flight_data(self, processed_query: str) -> Dict[str, Any]:
+        """Ask the LLM for the flight search fields in a date-resolved query."""
+        # Call Anthropic Claude API to extract flight information
+        headers = {
+            "x-api-key": self.api_key,
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01"
         }
         
-        return country_mappings.get(country_lower, country_lower)
-
-    async def parse_query(self, query: str) -> Dict[str, Any]:
-        """
-        Parse a natural language query to extract flight search parameters.
-        Returns a dictionary with origin, destination, and date.
-        """
-        try:
-            # Pre-process the query to handle relative dates
-            processed_query = _resolve_relative_dates(query)
-            logger.info(f"Processed query with resolved dates: {processed_query}")
-
-            # Call Anthropic Claude API to extract flight information
-            headers = {
-                "x-api-key": self.api_key,
-                "Content-Type": "application/json",
-                "anthropic-version": "2023-06-01"
-            }
-            
-            data = {
-                "model": "claude-opus-4-1-20250805",
-                "max_tokens": 1000,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": f"""You are a flight search assistant. Extract flight search parameters from this user query: "{processed_query}"
+        data = {
+            "model": "claude-opus-4-1-20250805",
+            "max_tokens": 1000,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"""You are a flight search assistant. Extract flight search parameters from this user query: "{processed_query}"
 
 IMPORTANT RULES:
 1. ONLY extract information that is EXPLICITLY stated in the query. Do NOT provide defaults or assumptions.
@@ -595,81 +701,108 @@ Return ONLY a valid JSON object with the following structure:
 }}
 
 Be precise and extract only the information that is clearly stated in the query. Do not make assumptions or provide defaults."""
-                    }
-                ]
+                }
+            ]
+        }
+        
+        async with client_session(self.http_session) as session:
+            async with session.post(
+                "https://api.anthropic.com/v1/messages",
+                headers=headers,
+                json=data
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Anthropic API error: {error_text}")
+                    raise Exception(f"Anthropic API error: {error_text}")
+                
+                result = _json_loads(await response.read())
+                # Pretty-printing is only worth paying for when debug logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Anthropic API response: {json.dumps(result, indent=2)}")
+                
+                # Extract the response content
+                content = result['content'][0]['text']
+                
+                # Try to parse the content as JSON first
+                try:
+                    # Clean the content to extract just the JSON part
+                    json_start = content.find('{')
+                    json_end = content.rfind('}') + 1
+                    if json_start != -1 and json_end != 0:
+                        json_content = content[json_start:json_end]
+                        extracted_data = _json_loads(json_content)
+                    else:
+                        raise json.JSONDecodeError("No JSON found", content, 0)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to parse JSON: {e}")
+                    logger.error(f"Content: {content}")
+                    raise Exception(f"Failed to parse API response as JSON: {str(e)}")
+                
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Extracted data: {json.dumps(extracted_data, indent=2)}")
+                return extracted_data
+
+    async def parse_query(self, query: str) -> Dict[str, Any]:
+        """
+        Parse a natural language query to extract flight search parameters.
+        Returns a dictionary with origin, destination, and date.
+        """
+        try:
+            # Pre-process the query to handle relative dates
+            processed_query = _resolve_relative_dates(query)
+            logger.info(f"Processed query with resolved dates: {processed_query}")
+
+            # Identical queries (once dates are resolved) reuse the earlier extraction
+            processed_query = " ".join(processed_query.split())
+            extracted_data = self._extraction_cache.get(processed_query)
+            if extracted_data is None:
+                extracted_data = await self._extract_flight_data(processed_query)
+                self._extraction_cache[processed_query] = extracted_data
+                if len(self._extraction_cache) > MAX_CACHED_EXTRACTIONS:
+                    self._extraction_cache.popitem(last=False)
+            else:
+                self._extraction_cache.move_to_end(processed_query)
+                logger.info(f"Using cached extraction for: {processed_query}")
+            extracted_data = copy.deepcopy(extracted_data)
+            
+            # Get context from the response
+            context = extracted_data.get('context', {})
+            
+            # Look up IATA codes
+            origin_details = extracted_data.get('origin')
+            destination_details = extracted_data.get('destination')
+            
+            if not origin_details or not destination_details:
+                logger.error("Could not determine origin or destination details from LLM")
+                return {"error": "Could not determine origin or destination details"}
+            
+            # Handle null values
+            origin_city = origin_details.get('city')
+            origin_country = origin_details.get('country')
+            dest_city = destination_details.get('city')
+            dest_country = destination_details.get('country')
+            
+            if not origin_city or not dest_city:
+                logger.error("Missing city information in origin or destination")
+                return {"error": "Missing city information in origin or destination"}
+            
+            origin_iata = self._lookup_iata_code(origin_city, context, origin_country)
+            dest_iata = self._lookup_iata_code(dest_city, context, dest_country)
+            
+            if not origin_iata or not dest_iata:
+                logger.error("Could not find IATA codes for airports")
+                return {"error": "Could not find IATA codes for airports"}
+            
+            # Return the structured data
+            return {
+                "origin": origin_iata,
+                "destination": dest_iata,
+                "date": extracted_data.get('date'),
+                "return_date": extracted_data.get('return_date'),
+                "context": context
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers=headers,
-                    json=data
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Anthropic API error: {error_text}")
-                        raise Exception(f"Anthropic API error: {error_text}")
-                    
-                    result = await response.json()
-                    logger.info(f"Anthropic API response: {json.dumps(result, indent=2)}")
-                    
-                    # Extract the response content
-                    content = result['content'][0]['text']
-                    
-                    # Try to parse the content as JSON first
-                    try:
-                        # Clean the content to extract just the JSON part
-                        json_start = content.find('{')
-                        json_end = content.rfind('}') + 1
-                        if json_start != -1 and json_end != 0:
-                            json_content = content[json_start:json_end]
-                            extracted_data = json.loads(json_content)
-                        else:
-                            raise json.JSONDecodeError("No JSON found", content, 0)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse JSON: {e}")
-                        logger.error(f"Content: {content}")
-                        raise Exception(f"Failed to parse API response as JSON: {str(e)}")
-                    
-                    logger.info(f"Extracted data: {json.dumps(extracted_data, indent=2)}")
-                    
-                    # Get context from the response
-                    context = extracted_data.get('context', {})
-                    
-                    # Look up IATA codes
-                    origin_details = extracted_data.get('origin')
-                    destination_details = extracted_data.get('destination')
-                    
-                    if not origin_details or not destination_details:
-                        logger.error("Could not determine origin or destination details from LLM")
-                        return {"error": "Could not determine origin or destination details"}
-                    
-                    # Handle null values
-                    origin_city = origin_details.get('city')
-                    origin_country = origin_details.get('country')
-                    dest_city = destination_details.get('city')
-                    dest_country = destination_details.get('country')
-                    
-                    if not origin_city or not dest_city:
-                        logger.error("Missing city information in origin or destination")
-                        return {"error": "Missing city information in origin or destination"}
-                    
-                    origin_iata = self._lookup_iata_code(origin_city, context, origin_country)
-                    dest_iata = self._lookup_iata_code(dest_city, context, dest_country)
-                    
-                    if not origin_iata or not dest_iata:
-                        logger.error("Could not find IATA codes for airports")
-                        return {"error": "Could not find IATA codes for airports"}
-                    
-                    # Return the structured data
-                    return {
-                        "origin": origin_iata,
-                        "destination": dest_iata,
-                        "date": extracted_data.get('date'),
-                        "return_date": extracted_data.get('return_date'),
-                        "context": context
-                    }
-                    
         except Exception as e:
             logger.error(f"Error parsing query: {str(e)}")
             return {"error": str(e)}
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, Dict, Any
 from .search_one_way import search_one_way_flights
 from .search_round_trip import search_round_trip_flights
-from .booking_client import booking_client
+from .booking_client import get_booking_client
 from services.flight_service import FlightService
 from pydantic import BaseModel
 import os
@@ -124,7 +124,7 @@ async def search_flights_simple(
     Simple flight search endpoint using location names
     """
     try:
-        result = booking_client.search_flights_by_location(
+        result = get_booking_client().search_flights_by_location(
             from_location=from_location,
             to_location=to_location,
             depart_date=depart_date,
@@ -246,7 +246,7 @@ async def search_one_way(
     Search for one-way flights using Booking.com API (with location IDs)
     """
     try:
-        result = booking_client.search_flights(
+        result = get_booking_client().search_flights(
             from_id=from_id,
             to_id=to_id,
             depart_date=depart_date,
@@ -287,7 +287,7 @@ async def search_round_trip(
     Search for round-trip flights using Booking.com API (with location IDs)
     """
     try:
-        result = booking_client.search_flights(
+        result = get_booking_client().search_flights(
             from_id=from_id,
             to_id=to_id,
             depart_date=depart_date,
@@ -328,7 +328,7 @@ async def search_one_way_simple(
     Search for one-way flights using location names (automatically converts to IDs)
     """
     try:
-        result = booking_client.search_flights_by_location(
+        result = get_booking_client().search_flights_by_location(
             from_location=from_location,
             to_location=to_location,
             depart_date=depart_date,
@@ -369,7 +369,7 @@ async def search_round_trip_simple(
     Search for round-trip flights using location names (automatically converts to IDs)
     """
     try:
-        result = booking_client.search_flights_by_location(
+        result = get_booking_client().search_flights_by_location(
             from_location=from_location,
             to_location=to_location,
             depart_date=depart_date,
@@ -407,7 +407,7 @@ async def search_with_booking_url(
     Search for flights and generate Booking.com deep link URL
     """
     try:
-        result = booking_client.get_flight_booking_info(
+        result = get_booking_client().get_flight_booking_info(
             from_location=from_location,
             to_location=to_location,
             depart_date=depart_date,
@@ -441,7 +441,7 @@ async def generate_booking_url(
     Generate only the Booking.com deep link URL without searching flights
     """
     try:
-        booking_url = booking_client.generate_booking_url(
+        booking_url = get_booking_client().generate_booking_url(
             from_location=from_location,
             to_location=to_location,
             depart_date=depart_date,
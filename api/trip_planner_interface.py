@@ -3,6 +3,13 @@ from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, validator
 from enum import Enum
 
+from .models import TripPlanningRequest, BudgetRange, TripType
+
+# Plain string values of the chat request enums, looked up instead of reading .value per request.
+# Lookups also accept the bare strings, which compare equal to the str-based members.
+_BUDGET_RANGE_VALUES = {member: member.value for member in BudgetRange}
+_TRIP_TYPE_VALUES = {member: member.value for member in TripType}
+
 class ProviderType(str, Enum):
     AI = "ai"
     API = "api"
@@ -38,6 +45,31 @@ class TripPlanRequest(BaseModel):
     special_requirements: Optional[str] = None
     preferred_provider: Optional[ProviderType] = None
     smart_trip_data: Optional[Dict[str, Any]] = None  # Smart trip logic data
+    
+    @classmethod
+    def from_trip_planning(cls, request: TripPlanningRequest,
+                           smart_trip_data: Optional[Dict[str, Any]] = None) -> "TripPlanRequest":
+        """Build from an already-validated TripPlanningRequest without validating again.
+        
+        Falls back to normal validation (and its error) when a field this
+        model requires was left unset on the chat request.
+        """
+        fields = dict(
+            origin=request.origin,
+            destination=request.destination,
+            duration_days=request.duration_days,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            travelers=request.travelers,
+            budget_range=_BUDGET_RANGE_VALUES.get(request.budget_range, "moderate"),
+            trip_type=_TRIP_TYPE_VALUES.get(request.trip_type, "leisure"),
+            interests=request.interests or [],
+            special_requirements=request.special_requirements or "",
+            smart_trip_data=smart_trip_data
+        )
+        if request.duration_days is None or request.travelers is None:
+            return cls(**fields)
+        return cls.model_construct(**fields)
 
 class TripPlanResponse(BaseModel):
     """Standardized response format for all trip planners"""
@@ -22,8 +22,8 @@ from dateutil import parser as date_parser
 from dateutil.relativedelta import relativedelta
 import json
 import aiohttp
-from .enhanced_parser import EnhancedQueryParser
-from .currency_converter import CurrencyConverter
+from .enhanced_parser import EnhancedQueryParser, get_parser
+from .currency_converter import currency_converter
 
 router = APIRouter(prefix="/trip-planner", tags=["AI Trip Planner"])
 logger = logging.getLogger(__name__)
@@ -770,24 +770,24 @@ async def create_comprehensive_trip_plan(request: Request):
 async def search_flights_comprehensive(origin: str, destination: str, start_date: str, return_date: str, travelers: int):
     """Search flights and categorize into cheapest, fastest, and best value"""
     try:
-        from api.booking_client import booking_client
-        from api.enhanced_parser import EnhancedQueryParser
+        from api.booking_client import get_booking_client
+        booking_client = get_booking_client()
         
         # Clean city names (remove state abbreviations)
         origin_clean = origin.split(',')[0].strip()
         destination_clean = destination.split(',')[0].strip()
         
-        # Get destination IDs
-        parser = EnhancedQueryParser()
+        # Get destination IDs; the shared parser keeps its airport indexes between requests
+        parser = get_parser(os.getenv("ANTHROPIC_API_KEY"))
         origin_iata = parser._lookup_iata_code(origin_clean)
         dest_iata = parser._lookup_iata_code(destination_clean)
         
         if not origin_iata or not dest_iata:
             return {"error": f"Could not find airport codes for {origin_clean} or {destination_clean}"}
         
-        # Search for destinations to get location IDs
-        origin_search = booking_client.search_destination(origin_clean)
-        dest_search = booking_client.search_destination(destination_clean)
+        # Search for destinations to get location IDs; both lookups run
+        # concurrently on the client's pooled async connection
+        origin_search, dest_search = await booking_client.search_destinations_bulk([origin_clean, destination_clean])
         
         # Handle destination search errors
         if "error" in origin_search:
@@ -1111,8 +1111,8 @@ async def search_flights_with_filters(
     """Enhanced flight search with inline filters"""
     logger.info(f"search_flights_with_filters called with: origin={origin}, destination={destination}, start_date={start_date}, return_date={return_date}, travelers={travelers}, filters={filters}")
     try:
-        from api.booking_client import booking_client
-        from api.enhanced_parser import EnhancedQueryParser
+        from api.booking_client import get_booking_client
+        booking_client = get_booking_client()
         
         # Set default filters if none provided
         if filters is None:
@@ -1132,17 +1132,17 @@ async def search_flights_with_filters(
         origin_clean = origin.split(',')[0].strip()
         destination_clean = destination.split(',')[0].strip()
         
-        # Get destination IDs
-        parser = EnhancedQueryParser()
+        # Get destination IDs; the shared parser keeps its airport indexes between requests
+        parser = get_parser(os.getenv("ANTHROPIC_API_KEY"))
         origin_iata = parser._lookup_iata_code(origin_clean)
         dest_iata = parser._lookup_iata_code(destination_clean)
         
         if not origin_iata or not dest_iata:
             return {"error": f"Could not find airport codes for {origin_clean} or {destination_clean}"}
         
-        # Search for destinations to get location IDs
-        origin_search = booking_client.search_destination(origin_clean)
-        dest_search = booking_client.search_destination(destination_clean)
+        # Search for destinations to get location IDs; both lookups run
+        # concurrently on the client's pooled async connection
+        origin_search, dest_search = await booking_client.search_destinations_bulk([origin_clean, destination_clean])
         
         if "error" in origin_search or "error" in dest_search:
             return {"error": "Destination search failed"}
@@ -1743,7 +1743,7 @@ class NaturalLanguageTripPlanner:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not configured")
         self.parser = EnhancedQueryParser(api_key)
-        self.currency_converter = CurrencyConverter()
+        self.currency_converter = currency_converter  # shares the rate cache and HTTP session
         self.destination_intelligence = self._load_destination_intelligence()
         
     def _load_destination_intelligence(self) -> Dict[str, Dict]:
@@ -2541,7 +2541,8 @@ class NaturalLanguageTripPlanner:
                 # If not found, try to search for destination to get country info
                 else:
                     try:
-                        from api.booking_client import booking_client
+                        from api.booking_client import get_booking_client
+                        booking_client = get_booking_client()
                         dest_search = booking_client.search_destination(extraction["destination"])
                         if dest_search and "destinations" in dest_search and dest_search["destinations"]:
                             destination_country = dest_search["destinations"][0].get("country", "US")
@@ -1,4 +1,8 @@
+from contextlib import asynccontextmanager
+
+import aiohttp
 from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
@@ -7,15 +11,50 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 from api.search_router import router as search_router
-from api.trip_planner_router import router as trip_planner_router
+from api.trip_planner_router import router as trip_planner_router, trip_planner
 from api.destination_router import router as destination_router
 from api.hotel_router import router as hotel_router
 from api.hybrid_trip_router import router as hybrid_router
 from api.markdown_trip_router import router as markdown_trip_router
-from api.chat_integration_router import router as chat_integration_router
+from api.chat_integration_router import (
+    router as chat_integration_router, TripPlanBatcher, conversation_session_store, smart_destination_service
+)
 from api.location_discovery_router import router as location_router
+from api.currency_converter import currency_converter
+from api.booking_client import aclose_booking_client
+from api.enhanced_ai_provider import EnhancedAITripProvider
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled clients for the app's lifetime so upstream calls reuse TCP/TLS sessions:
+    # aiohttp for the maps, weather, airport and exchange-rate services and the query
+    # parser's Claude calls. The Claude SDK pools its own connections for the provider's
+    # lifetime, and the Booking.com client opens its own async pool on first bulk lookup;
+    # both are closed on shutdown
+    async with aiohttp.ClientSession() as http_session:
+        app.state.http_session = http_session
+        app.state.enhanced_ai_provider = EnhancedAITripProvider()
+        app.state.enhanced_ai_provider.maps_weather_service.http_session = http_session
+        app.state.trip_plan_batcher = TripPlanBatcher(app.state.enhanced_ai_provider)
+        smart_destination_service.attach_http_session(http_session)
+        currency_converter.http_session = http_session
+        trip_planner.parser.http_session = http_session
+        try:
+            yield
+        finally:
+            smart_destination_service.attach_http_session(None)
+            currency_converter.http_session = None
+            trip_planner.parser.http_session = None
+            await app.state.enhanced_ai_provider.client.close()
+    await conversation_session_store.aclose()
+    await aclose_booking_client()
+
+app = FastAPI(title="FlightTickets.ai API", lifespan=lifespan)
 
-app = FastAPI(title="FlightTickets.ai API")
+# JSON results repeat the same keys per entry and compress well; small bodies
+# like single chat replies aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Destination Index
+Prefix index over airport names, cities, countries and IATA codes, so
+destination autocomplete doesn't scan every airport on each keystroke.
+"""
+
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+# Airport fields searched by autocomplete ('column_1' holds the IATA code)
+SEARCH_FIELDS = ('airport_name', 'city_name', 'country_name', 'column_1')
+
+_WORD_RE = re.compile(r'\w+')
+
+MAX_CACHED_RANGES = 1024
+
+
+class DestinationIndex:
+    """Airports in search order, with a sorted prefix index over their fields.
+
+    Each field is indexed from every word onward, so "los angeles international"
+    is found by "los an", "angeles" or "intern", and "manchester-boston" by
+    "boston". A lookup is a binary search plus a walk over the keys that share
+    the query as a prefix. Whole words are indexed too, so a multi-word query
+    still matches on any one word.
+    """
+
+    def __init__(self, *airport_lists: Iterable[Dict[str, Any]]):
+        self.airports: List[Dict[str, Any]] = [airport for airports in airport_lists for airport in airports]
+        self.words: Dict[str, Set[int]] = {}
+        # Lowercased field values as one list per field, indexed by position, for ranking
+        self.lowered: Dict[str, List[str]] = {field: [] for field in SEARCH_FIELDS}
+        entries = set()
+        for position, airport in enumerate(self.airports):
+            for field in SEARCH_FIELDS:
+                value = (airport.get(field) or '').lower()
+                self.lowered[field].append(value)
+                for word in _WORD_RE.finditer(value):
+                    entries.add((value[word.start():], position))
+                for word in value.split():
+                    self.words.setdefault(word, set()).add(position)
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.positions = [position for _, position in entries]
+        # query -> (start, end) of the keys it prefixes; autocomplete sends each
+        # keystroke, so a query's range is usually found inside the previous one
+        self._ranges: OrderedDict = OrderedDict()
+
+    def search(self, query: str) -> List[int]:
+        """Positions of matching airports, in search order.
+
+        An airport matches when the (lowercased) query appears in one of its
+        fields starting at a word, or shares a whole word with one of them.
+        """
+        start, end = self._prefix_range(query)
+        matches: Set[int] = set(self.positions[start:end])
+        for word in query.split():
+            matches.update(self.words.get(word, ()))
+        return sorted(matches)
+
+    def _prefix_range(self, query: str) -> Tuple[int, int]:
+        """Slice of self.keys that starts with query"""
+        if not query:
+            return 0, len(self.keys)
+        cached = self._ranges.get(query)
+        if cached is not None:
+            self._ranges.move_to_end(query)
+            return cached
+        # Narrow within the range of the query minus its last character when known
+        low, high = self._ranges.get(query[:-1], (0, len(self.keys)))
+        start = bisect_left(self.keys, query, low, high)
+        # Every key starting with query sorts below query with its last character bumped
+        end = bisect_left(self.keys, query[:-1] + chr(ord(query[-1]) + 1), start, high)
+        self._ranges[query] = (start, end)
+        if len(self._ranges) > MAX_CACHED_RANGES:
+            self._ranges.popitem(last=False)
+        return start, end
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+HTTP Session Helper
+Lets services reuse one app-wide aiohttp session (pooled connections) when the
+app provides it, and fall back to a per-call session otherwise.
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+
+@asynccontextmanager
+async def client_session(shared: Optional[aiohttp.ClientSession]) -> AsyncIterator[aiohttp.ClientSession]:
+    """Yield the shared session when it is open, else a session for this call only"""
+    if shared is not None and not shared.closed:
+        yield shared
+    else:
+        async with aiohttp.ClientSession() as session:
+            yield session
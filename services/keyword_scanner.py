@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Keyword Scanner
+Single-pass multi-keyword matching: which categories of a keyword table
+have a keyword occurring in a text, found in one scan instead of one
+substring test per keyword.
+"""
+
+import re
+from typing import Dict, Iterable
+
+try:
+    import ahocorasick
+except ImportError:  # optional single-pass keyword scanning
+    ahocorasick = None
+
+
+class RegexKeywordScanner:
+    """Single-pass stand-in for an Aho-Corasick automaton when pyahocorasick is missing.
+
+    A lookahead alternation, longest keyword first, finds the longest keyword
+    starting at each position. Every keyword that is a prefix of it matches
+    there too, so their categories are merged per keyword up front and the
+    result is exactly the set of keywords occurring anywhere in the text.
+    """
+
+    def __init__(self, categories_by_keyword: Dict[str, set]):
+        keywords = sorted(categories_by_keyword, key=len, reverse=True)
+        self.pattern = re.compile("(?=(%s))" % "|".join(map(re.escape, keywords)))
+        self.categories = {
+            keyword: frozenset().union(*(
+                categories for prefix, categories in categories_by_keyword.items()
+                if keyword.startswith(prefix)
+            ))
+            for keyword in keywords
+        }
+
+    def iter(self, text: str):
+        """Yield (end_index, categories) like ahocorasick.Automaton.iter"""
+        for match in self.pattern.finditer(text):
+            keyword = match.group(1)
+            yield match.start() + len(keyword) - 1, self.categories[keyword]
+
+
+def build_keyword_automaton(keyword_map: Dict[str, Iterable[str]]):
+    """Build a keyword -> categories scanner: pyahocorasick if installed, else a regex scanner"""
+    categories_by_keyword: Dict[str, set] = {}
+    for category, keywords in keyword_map.items():
+        for keyword in keywords:
+            categories_by_keyword.setdefault(keyword, set()).add(category)
+    if ahocorasick is None:
+        return RegexKeywordScanner(categories_by_keyword)
+    automaton = ahocorasick.Automaton()
+    for keyword, categories in categories_by_keyword.items():
+        automaton.add_word(keyword, frozenset(categories))
+    automaton.make_automaton()
+    return automaton
+
+
+def matched_categories(text: str, automaton) -> set:
+    """The categories with a keyword occurring in text"""
+    hits = set()
+    for _, categories in automaton.iter(text):
+        hits.update(categories)
+    return hits
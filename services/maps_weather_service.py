@@ -5,11 +5,12 @@ Provides dynamic destination analysis, airport proximity, and weather-based reco
 """
 
 import os
-import aiohttp
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 
+from services.http_session import client_session
+
 logger = logging.getLogger(__name__)
 
 class MapsWeatherService:
@@ -19,6 +20,8 @@ class MapsWeatherService:
         self.google_maps_api_key = os.getenv("GOOGLE_MAPS_API_KEY")
         self.openweather_api_key = os.getenv("OPENWEATHER_API_KEY")
         self.rapid_api_key = os.getenv("RAPID_API_KEY")
+        # App-wide aiohttp session, attached by the app lifespan when available
+        self.http_session = None
         
         if not self.google_maps_api_key:
             logger.warning("GOOGLE_MAPS_API_KEY not found - maps features will be limited")
@@ -39,7 +42,7 @@ class MapsWeatherService:
                 "addressdetails": 1
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with client_session(self.http_session) as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -64,7 +67,7 @@ class MapsWeatherService:
                     "key": self.google_maps_api_key
                 }
                 
-                async with aiohttp.ClientSession() as session:
+                async with client_session(self.http_session) as session:
                     async with session.get(url, params=params) as response:
                         if response.status == 200:
                             data = await response.json()
@@ -103,7 +106,7 @@ class MapsWeatherService:
                     "key": self.google_maps_api_key
                 }
                 
-                async with aiohttp.ClientSession() as session:
+                async with client_session(self.http_session) as session:
                     async with session.get(url, params=params) as response:
                         if response.status == 200:
                             data = await response.json()
@@ -209,7 +212,7 @@ class MapsWeatherService:
                 "units": "metric"
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with client_session(self.http_session) as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -268,7 +271,7 @@ class MapsWeatherService:
                 "key": self.google_maps_api_key
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with client_session(self.http_session) as session:
                 async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Micro Batcher
+Coalesces async calls that arrive within a short window into one batch call.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_MS = 20
+DEFAULT_MAX_BATCH_SIZE = 64
+
+
+class AsyncBatcher:
+    """Collects submitted items for up to one window and runs them through batch_fn together.
+
+    batch_fn takes a list of distinct items and returns one result per item,
+    in order; a result that is an exception is raised to that item's callers.
+    Items with the same key in one window share a single batch slot, and each
+    duplicate caller gets its own copy of the result. Batches are dispatched
+    without waiting for the previous one to finish, so the window only adds
+    latency, never queueing.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+                 key: Callable[[Any], Hashable] = lambda item: item,
+                 copy_result: Callable[[Any], Any] = copy.deepcopy,
+                 window_ms: int = DEFAULT_WINDOW_MS, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 name: str = "batch"):
+        self.batch_fn = batch_fn
+        self.key = key
+        self.copy_result = copy_result
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches: set = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # (Re)start the worker on the current event loop
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect())
+        future = loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def _collect(self) -> None:
+        """Gather items for up to one window, then hand the batch off"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run each distinct item once and resolve every waiting future"""
+        waiters: Dict[Hashable, List[asyncio.Future]] = {}
+        unique_items: Dict[Hashable, Any] = {}
+        for item, future in batch:
+            try:
+                key = self.key(item)
+            except Exception as e:
+                # A bad item fails only its own caller, not the rest of the window
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            waiters.setdefault(key, []).append(future)
+            unique_items.setdefault(key, item)
+        if not unique_items:
+            return
+        if len(batch) > 1:
+            logger.info("Running %s of %s items (%s distinct)", self.name, len(batch), len(unique_items))
+
+        try:
+            results = await self.batch_fn(list(unique_items.values()))
+        except Exception as e:
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        if len(results) != len(unique_items):
+            logger.error("%s returned %s results for %s items", self.name, len(results), len(unique_items))
+        # Items left without a result must not wait forever
+        missing = RuntimeError(f"{self.name} returned no result for this item")
+        results = list(results[:len(unique_items)])
+        results.extend([missing] * (len(unique_items) - len(results)))
+
+        for key, result in zip(unique_items, results):
+            for index, future in enumerate(waiters[key]):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    # Duplicates get their own copy so callers never share mutable state
+                    future.set_result(result if index == 0 else self.copy_result(result))
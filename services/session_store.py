@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Conversation Session Store
+Keeps chat conversation_state on the server, keyed by session_id, so clients
+don't have to send the whole state back on every message.
+"""
+
+import os
+import json
+import time
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional faster (de)serialization
+    orjson = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional shared store across workers
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL_SECONDS = 3600
+MAX_LOCAL_SESSIONS = 10000
+
+
+def _dumps(state: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(state, default=str)
+    return json.dumps(state, default=str).encode()
+
+
+def _loads(raw: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+class ConversationSessionStore:
+    """Session state in Redis when REDIS_URL is set (and redis is installed), else in process memory"""
+
+    def __init__(self, redis_url: Optional[str] = None, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.redis = None
+        redis_url = redis_url or os.getenv("REDIS_URL")
+        if redis_url:
+            if aioredis is not None:
+                self.redis = aioredis.from_url(redis_url)
+                logger.info("Conversation sessions stored in Redis")
+            else:
+                logger.warning("REDIS_URL is set but redis is not installed - keeping sessions in memory")
+        # session_id -> (expiry, serialized state); serialized so callers never share dicts
+        self.local: Dict[str, Tuple[float, bytes]] = {}
+
+    async def load(self, session_id: str) -> Dict[str, Any]:
+        """Return the stored state for session_id, or an empty state"""
+        if self.redis is not None:
+            raw = await self.redis.get(f"conv:{session_id}")
+        else:
+            entry = self.local.get(session_id)
+            raw = entry[1] if entry and entry[0] > time.monotonic() else None
+        return _loads(raw) if raw else {}
+
+    async def save(self, session_id: str, state: Dict[str, Any]) -> None:
+        """Store state for session_id, refreshing its expiry"""
+        raw = _dumps(state)
+        if self.redis is not None:
+            await self.redis.set(f"conv:{session_id}", raw, ex=self.ttl_seconds)
+            return
+        if session_id not in self.local and len(self.local) >= MAX_LOCAL_SESSIONS:
+            now = time.monotonic()
+            self.local = {key: entry for key, entry in self.local.items() if entry[0] > now}
+            if len(self.local) >= MAX_LOCAL_SESSIONS:
+                self.local.pop(next(iter(self.local)))
+        self.local[session_id] = (time.monotonic() + self.ttl_seconds, raw)
+
+    async def aclose(self) -> None:
+        if self.redis is not None:
+            await self.redis.aclose()
@@ -5,12 +5,20 @@ Uses real APIs to get airport and destination information dynamically.
 """
 
 import os
+import copy
+import time
 import aiohttp
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+from services.http_session import client_session
 
 logger = logging.getLogger(__name__)
 
+# Airport recommendations hit maps, weather and airport APIs; reuse them briefly
+AIRPORT_RECOMMENDATION_TTL_SECONDS = 300
+MAX_CACHED_RECOMMENDATIONS = 2048
+
 class SmartDestinationService:
     """Service for smart destination and airport logic using real APIs."""
     
@@ -19,6 +27,9 @@ class SmartDestinationService:
         if not self.rapid_api_key:
             logger.error("RAPID_API_KEY not found")
         
+        # App-wide aiohttp session, attached by the app lifespan when available
+        self.http_session = None
+        
         # Initialize maps and weather service for dynamic analysis
         try:
             from .maps_weather_service import MapsWeatherService
@@ -27,6 +38,15 @@ class SmartDestinationService:
         except ImportError:
             self.maps_weather_service = None
             logger.warning("Maps and Weather service not available - using fallback methods")
+        
+        # (destination, trip_type) -> (expiry, recommendation)
+        self._recommendation_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+    
+    def attach_http_session(self, session: Optional[aiohttp.ClientSession]) -> None:
+        """Use session (or a per-call session when None) for this service's API calls"""
+        self.http_session = session
+        if self.maps_weather_service:
+            self.maps_weather_service.http_session = session
     
     async def get_airports_near_destination(self, destination: str) -> Optional[Dict[str, Any]]:
         """
@@ -43,7 +63,7 @@ class SmartDestinationService:
             
             params = {"query": destination}
             
-            async with aiohttp.ClientSession() as session:
+            async with client_session(self.http_session) as session:
                 async with session.get(url, headers=headers, params=params) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -153,6 +173,28 @@ class SmartDestinationService:
         }
     
     async def get_smart_airport_recommendation(self, destination: str, trip_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Get smart airport recommendation, reusing a recent one for the same destination.
+        """
+        key = (destination.strip().lower(), trip_type)
+        cached = self._recommendation_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return copy.deepcopy(cached[1])
+        
+        recommendation = await self._fetch_smart_airport_recommendation(destination, trip_type)
+        if recommendation:
+            # Failures and empty results are retried on the next request
+            if len(self._recommendation_cache) >= MAX_CACHED_RECOMMENDATIONS:
+                now = time.monotonic()
+                self._recommendation_cache = {k: v for k, v in self._recommendation_cache.items() if v[0] > now}
+                if len(self._recommendation_cache) >= MAX_CACHED_RECOMMENDATIONS:
+                    self._recommendation_cache.pop(next(iter(self._recommendation_cache)))
+            self._recommendation_cache[key] = (
+                time.monotonic() + AIRPORT_RECOMMENDATION_TTL_SECONDS, copy.deepcopy(recommendation)
+            )
+        return recommendation
+    
+    async def _fetch_smart_airport_recommendation(self, destination: str, trip_type: str) -> Optional[Dict[str, Any]]:
         """
         Get smart airport recommendation using dynamic maps and weather analysis.
         """
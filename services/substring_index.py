@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Substring Index
+Trigram index over airport text fields, so "location in city_name" lookups
+only test the airports that could contain the location instead of all of them.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+NGRAM = 3
+
+
+class SubstringIndex:
+    """Text fields by position, with a trigram -> positions map.
+
+    Every trigram of a query has to occur in an entry that contains it, so
+    intersecting the query's trigram postings leaves a small candidate set
+    that is then checked with a plain substring test. Queries shorter than a
+    trigram are checked against every entry.
+    """
+
+    def __init__(self, entries: Iterable[Sequence[str]]):
+        # Each entry is the (already lowercased) fields of one position
+        self.entries: List[Tuple[str, ...]] = [tuple(fields) for fields in entries]
+        self.postings: Dict[str, Set[int]] = {}
+        for position, fields in enumerate(self.entries):
+            for value in fields:
+                for start in range(len(value) - NGRAM + 1):
+                    self.postings.setdefault(value[start:start + NGRAM], set()).add(position)
+
+    def search(self, query: str, within: Optional[Set[int]] = None) -> List[int]:
+        """Positions with a field containing query, in index order
+
+        within, when given, restricts the result to those positions before
+        any substring is tested (e.g. the airports of one country).
+        """
+        if len(query) < NGRAM:
+            candidates = range(len(self.entries)) if within is None else sorted(within)
+        else:
+            grams = {query[start:start + NGRAM] for start in range(len(query) - NGRAM + 1)}
+            postings = [self.postings.get(gram, set()) for gram in grams]
+            if within is not None:
+                postings.append(within)
+            postings.sort(key=len)
+            candidates = sorted(postings[0].intersection(*postings[1:]))
+        return [
+            position for position in candidates
+            if any(query in value for value in self.entries[position])
+        ]
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+import asyncio
+import logging
+import os
+import sys
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import api.enhanced_parser as enhanced_parser
+from api.enhanced_parser import EnhancedQueryParser, _IMPORTANCE_KEYWORDS, _IMPORTANCE_AC
+from services.keyword_scanner import RegexKeywordScanner, matched_categories
+from services.substring_index import SubstringIndex
+
+
+class TestSubstringIndex:
+    """Test cases for SubstringIndex."""
+
+    def test_search_matches_plain_substring_tests(self):
+        """Test that the trigram index finds exactly the entries a substring scan would."""
+        entries = [("new york", "john f kennedy intl"), ("york", "york airport"), ("newark", "liberty intl"), ("", "")]
+        index = SubstringIndex(entries)
+
+        for query in ["york", "ork", "w y", "intl", "ne", "", "liberty intl", "yorkshire", "zzz"]:
+            expected = [position for position, fields in enumerate(entries) if any(query in value for value in fields)]
+            assert index.search(query) == expected
+            assert index.search(query, {1, 3}) == [position for position in expected if position in {1, 3}]
+
+
+class TestAirportLookup:
+    """Test cases for resolving locations to IATA codes with EnhancedQueryParser."""
+
+    @classmethod
+    def setup_class(cls):
+        cls.parser = EnhancedQueryParser()
+
+    def test_importance_keywords_match_substring_search(self):
+        """Test that both scanner backends find the importance categories a substring check would."""
+        categories_by_keyword = {}
+        for category, keywords in _IMPORTANCE_KEYWORDS.items():
+            for keyword in keywords:
+                categories_by_keyword.setdefault(keyword, set()).add(category)
+        regex_scanner = RegexKeywordScanner(categories_by_keyword)
+
+        for name in ["shanghai hongqiao international", "beijing capital airport", "seaplane base", "bozeman"]:
+            expected = {
+                category for category, keywords in _IMPORTANCE_KEYWORDS.items()
+                if any(keyword in name for keyword in keywords)
+            }
+            assert matched_categories(name, _IMPORTANCE_AC) == expected
+            assert matched_categories(name, regex_scanner) == expected
+
+    def test_detailed_info_comes_from_the_iata_index(self):
+        """Test that detailed lookups return the first full-database airport for a code."""
+        first_lax = next(airport for airport in self.parser.airports if airport.get('column_1') == 'LAX')
+
+        assert self.parser._get_detailed_airport_info('LAX') is first_lax
+        assert self.parser._get_detailed_airport_info('ZZZ') is None
+
+    def test_is_iata_code(self):
+        """Test that only three ASCII letters count as an IATA code."""
+        assert EnhancedQueryParser._is_iata_code("lax")
+        assert EnhancedQueryParser._is_iata_code("JFK")
+        for code in ["", "la", "laxx", "la1", "l x", "köl", "ΑΘΗ"]:
+            assert not EnhancedQueryParser._is_iata_code(code)
+
+    def test_lookup_iata_code(self):
+        """Test that cities resolve to their main airport, honouring the country hint."""
+        assert self.parser._lookup_iata_code("Paris", country_hint="France") == "CDG"
+        assert self.parser._lookup_iata_code("london", country_hint="UK") == "LHR"
+        assert self.parser._lookup_iata_code("beijing", country_hint="China") == "PEK"
+        assert self.parser._lookup_iata_code("jfk") == "JFK"
+        assert self.parser._lookup_iata_code("xyzzy") is None
+
+    def test_repeated_lookups_are_cached(self):
+        """Test that an identical lookup is answered without searching the airports again."""
+        self.parser._lookup_cache.clear()
+        context = {"is_international": True}
+        with patch.object(self.parser, "_lookup_iata_code_uncached", wraps=self.parser._lookup_iata_code_uncached) as lookup:
+            first = self.parser._lookup_iata_code("Las Vegas", context, "USA")
+            second = self.parser._lookup_iata_code(" las vegas", dict(context), "USA")
+            self.parser._lookup_iata_code("Las Vegas", {"tags": ["unhashable"]}, "USA")
+
+        assert first == second == "LAS"
+        assert lookup.call_count == 2
+
+    def test_repeated_queries_reuse_the_llm_extraction(self):
+        """Test that parse_query asks the LLM once per distinct date-resolved query."""
+        self.parser._extraction_cache.clear()
+        extraction = {
+            "origin": {"city": "London", "country": "UK"},
+            "destination": {"city": "Paris", "country": "France"},
+            "date": "2025-09-01",
+            "context": {"is_international": True, "preferred_airport_type": "primary"},
+        }
+        with patch.object(self.parser, "_extract_flight_data", AsyncMock(return_value=extraction)) as extract:
+            first = asyncio.run(self.parser.parse_query("London to Paris on 2025-09-01"))
+            first["context"]["is_international"] = False
+            second = asyncio.run(self.parser.parse_query("london  to paris on 2025-09-01"))
+
+        assert extract.await_count == 1
+        assert (second["origin"], second["destination"]) == ("LHR", "CDG")
+        assert second["context"]["is_international"] is True
+
+    def test_llm_extraction_uses_the_attached_session(self):
+        """Test that the Claude call goes through the app-wide session without closing it."""
+        response = MagicMock(status=200)
+        response.read = AsyncMock(return_value=b'{"content": [{"text": "Here you go: {\\"origin\\": null}"}]}')
+        session = MagicMock(closed=False)
+        session.post.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        self.parser.http_session = session
+        try:
+            extracted = asyncio.run(self.parser._extract_flight_data("london to paris"))
+        finally:
+            self.parser.http_session = None
+
+        assert extracted == {"origin": None}
+
+    def test_llm_responses_are_not_pretty_printed_at_info_level(self):
+        """Test that the indented response dumps are skipped unless debug logging is on."""
+        response = MagicMock(status=200)
+        response.read = AsyncMock(return_value=b'{"content": [{"text": "{\\"origin\\": null}"}]}')
+        session = MagicMock(closed=False)
+        session.post.return_value.__aenter__ = AsyncMock(return_value=response)
+        session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        self.parser.http_session = session
+        previous_level = enhanced_parser.logger.level
+        enhanced_parser.logger.setLevel(logging.INFO)
+        try:
+            with patch.object(enhanced_parser.json, "dumps", wraps=enhanced_parser.json.dumps) as dumps:
+                asyncio.run(self.parser._extract_flight_data("london to paris"))
+        finally:
+            self.parser.http_session = None
+            enhanced_parser.logger.setLevel(previous_level)
+
+        assert not any(call.kwargs.get("indent") for call in dumps.call_args_list)
+        session.post.assert_called_once()
+        session.close.assert_not_called()
@@ -0,0 +1,27 @@
+import asyncio
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test_key_for_testing")
+
+import main
+
+
+class TestAppLifespan:
+    """Smoke test for the application's startup and shutdown"""
+
+    def test_lifespan_starts_and_closes_shared_clients(self):
+        """Startup wires the shared clients and shutdown closes them"""
+        async def run():
+            async with main.lifespan(main.app):
+                assert main.app.state.trip_plan_batcher.provider is main.app.state.enhanced_ai_provider
+                assert not main.app.state.http_session.closed
+            return main.app.state.http_session
+
+        http_session = asyncio.run(run())
+
+        assert http_session.closed
+        assert main.trip_planner.parser.http_session is None
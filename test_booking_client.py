@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch, Mock
+
+import httpx
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+
+import api.booking_client as booking_client_module
+from api.booking_client import BookingComClient, aclose_booking_client, get_booking_client
+
+
+def _mock_response(payload=None, status_code=200, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {"content-type": "application/json"}
+    response.json.return_value = payload or {}
+    response.text = "Mock response text"
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestBookingComClient:
+    """Test class for BookingComClient functionality"""
+
+    @patch('requests.Session.get')
+    def test_make_request_returns_parsed_json(self, mock_get):
+        """Successful responses are returned as parsed JSON"""
+        mock_get.return_value = _mock_response({"status": True, "data": []})
+        client = BookingComClient()
+
+        result = client._make_request("/api/v1/flights/searchDestination", {"query": "JFK"})
+
+        assert result.ok
+        assert result.data == {"status": True, "data": []}
+        assert mock_get.call_count == 1
+
+    def test_flight_booking_info_batch_preserves_order(self):
+        """Batch results line up with their queries, failures included"""
+        client = BookingComClient()
+
+        def fake_info(**query):
+            if query["to_location"] == "BAD":
+                raise RuntimeError("boom")
+            return {"search_params": query}
+
+        queries = [
+            {"from_location": "JFK", "to_location": "LHR", "depart_date": "2025-09-01"},
+            {"from_location": "JFK", "to_location": "BAD", "depart_date": "2025-09-01"},
+            {"from_location": "SFO", "to_location": "NRT", "depart_date": "2025-09-02"},
+        ]
+        with patch.object(BookingComClient, "get_flight_booking_info", side_effect=fake_info):
+            results = client.get_flight_booking_info_batch(queries)
+
+        assert [r["search_params"] for r in results] == queries
+        assert "error" in results[1]
+        assert "error" not in results[0] and "error" not in results[2]
+
+    def test_generate_booking_url(self):
+        """Booking URLs map the cabin class and encode location names"""
+        client = BookingComClient()
+
+        url = client.generate_booking_url(
+            from_location="New York",
+            to_location="LHR",
+            depart_date="2025-09-01",
+            return_date="2025-09-08",
+            adults=2,
+            cabin_class="business"
+        )
+
+        assert url == (
+            "https://www.booking.com/flights?from=New+York&to=LHR&departure=2025-09-01"
+            "&return=2025-09-08&adults=2&cabin=business&trip_type=roundtrip"
+        )
+
+    @patch('requests.Session.get')
+    def test_make_request_rejects_non_json(self, mock_get):
+        """HTML error pages are reported without calling response.json()"""
+        response = _mock_response(headers={"content-type": "text/html"})
+        response.text = "<html>Bad gateway</html>"
+        mock_get.return_value = response
+        client = BookingComClient()
+
+        result = client._make_request("/api/v1/flights/searchDestination", {"query": "JFK"})
+
+        assert not result.ok
+        assert result.error == "Non-JSON response: text/html"
+        assert result.to_dict() == {"error": "Non-JSON response: text/html"}
+        response.json.assert_not_called()
+
+    @patch('requests.Session.get')
+    def test_make_request_rejects_oversized_body(self, mock_get):
+        """Responses advertising an absurd content-length are not decoded"""
+        response = _mock_response(headers={
+            "content-type": "application/json",
+            "content-length": str(50 * 1024 * 1024),
+        })
+        mock_get.return_value = response
+        client = BookingComClient()
+
+        result = client._make_request("/api/v1/flights/searchDestination", {"query": "JFK"})
+
+        assert not result.ok
+        assert "too large" in result.error
+        response.json.assert_not_called()
+
+    def test_search_flights_by_location_skips_lookup_for_iata_codes(self):
+        """Bare IATA codes are used as airport IDs without a destination search"""
+        client = BookingComClient()
+
+        with patch.object(BookingComClient, "get_destination_id", return_value="LON.CITY") as mock_lookup, \
+                patch.object(BookingComClient, "search_flights", return_value={"status": True}) as mock_search:
+            client.search_flights_by_location("JFK", "London", "2025-09-01")
+
+        mock_lookup.assert_called_once_with("London", "AIRPORT")
+        assert mock_search.call_args.kwargs["from_id"] == "JFK.AIRPORT"
+        assert mock_search.call_args.kwargs["to_id"] == "LON.CITY"
+
+    def test_search_flights_by_location_looks_up_metro_codes(self):
+        """Metro codes are Booking.com cities, so they are not turned into airport IDs"""
+        client = BookingComClient()
+
+        with patch.object(BookingComClient, "get_destination_id", return_value="NYC.CITY") as mock_lookup, \
+                patch.object(BookingComClient, "search_flights", return_value={"status": True}) as mock_search:
+            client.search_flights_by_location("NYC", "LHR", "2025-09-01")
+
+        mock_lookup.assert_called_once_with("NYC", "AIRPORT")
+        assert mock_search.call_args.kwargs["from_id"] == "NYC.CITY"
+        assert mock_search.call_args.kwargs["to_id"] == "LHR.AIRPORT"
+
+    @patch('requests.Session.get')
+    def test_search_destination_formats_results(self, mock_get):
+        """Destination results keep only the documented fields"""
+        payload = {
+            "status": True,
+            "message": "Success",
+            "data": [{
+                "id": "JFK.AIRPORT",
+                "type": "AIRPORT",
+                "name": "John F. Kennedy International Airport",
+                "code": "JFK",
+                "cityName": "New York",
+                "countryName": "United States",
+                "distanceToCity": {"value": 19.5, "unit": "km"},
+                "unusedField": "ignored"
+            }]
+        }
+        response = _mock_response(payload)
+        response.content = json.dumps(payload).encode()
+        mock_get.return_value = response
+        client = BookingComClient()
+
+        result = client.search_destination("JFK")
+
+        assert result["status"] is True
+        assert result["message"] == "Success"
+        destination = result["destinations"][0]
+        assert destination["id"] == "JFK.AIRPORT"
+        assert destination["distanceToCity"] == {"value": 19.5, "unit": "km"}
+        assert destination["regionName"] is None
+        assert "unusedField" not in destination
+
+    def test_shared_client_is_lazy_and_cached(self):
+        """The module-level client is built on first access and reused"""
+        assert "booking_client" not in vars(booking_client_module)
+        assert booking_client_module.booking_client is get_booking_client()
+        assert get_booking_client() is get_booking_client()
+
+    @patch('requests.Session.get')
+    def test_search_flights_keeps_upstream_error_field(self, mock_get):
+        """A payload field named "error" is not mistaken for a failed request"""
+        payload = {"status": True, "error": None, "data": {"flightOffers": []}}
+        mock_get.return_value = _mock_response(payload)
+        client = BookingComClient()
+
+        result = client.search_flights("JFK.AIRPORT", "LHR.AIRPORT", "2025-09-01")
+
+        assert result == payload
+
+    def test_search_destinations_bulk(self):
+        """Bulk lookups return one result per query, in order"""
+        def handler(request):
+            query = request.url.params["query"]
+            if query == "Nowhere":
+                return httpx.Response(500, json={"message": "error"})
+            return httpx.Response(200, json={
+                "status": True,
+                "message": "Success",
+                "data": [{"id": f"{query}.AIRPORT", "type": "AIRPORT", "code": query}]
+            })
+
+        client = BookingComClient()
+        client._ahttp = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+
+        async def run():
+            try:
+                return await client.search_destinations_bulk(["JFK", "Nowhere", "LHR"])
+            finally:
+                await client.aclose()
+
+        results = asyncio.run(run())
+
+        assert results[0]["destinations"][0]["id"] == "JFK.AIRPORT"
+        assert "error" in results[1]
+        assert results[2]["destinations"][0]["id"] == "LHR.AIRPORT"
+
+    def test_shutdown_close_skips_unbuilt_client(self):
+        """Closing at shutdown never constructs a client, and a failed close is swallowed"""
+        get_booking_client.cache_clear()
+        with patch.object(BookingComClient, "__init__", return_value=None) as init:
+            asyncio.run(aclose_booking_client())
+        init.assert_not_called()
+
+        get_booking_client()
+        with patch.object(BookingComClient, "aclose", side_effect=RuntimeError("pool already gone")) as aclose:
+            asyncio.run(aclose_booking_client())
+        aclose.assert_called_once()
+
+    def test_clients_share_default_headers(self):
+        """The API key is read once and the header dict is shared"""
+        assert BookingComClient().headers is BookingComClient().headers
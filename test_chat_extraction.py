@@ -0,0 +1,168 @@
+import itertools
+from datetime import date
+import os
+import sys
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+
+from api.chat_integration_router import (
+    _extract_origin,
+    _extract_destination,
+    _extract_travelers,
+    _extract_duration_days,
+    _extract_budget,
+    _extract_interests,
+    _extract_occasion,
+    _extract_start_date,
+    _keyword_categories,
+    _first_keyword_category,
+    _parse_message,
+    _parse_message_cached,
+    _parse_message_uncached,
+    _upcoming_date,
+    _is_confirmation,
+    _CONFIRMATION_WORDS,
+    _NO_TRIP_FIELDS,
+    _INTEREST_KEYWORDS,
+    _INTEREST_AC,
+    _BUDGET_KEYWORDS,
+    _BUDGET_AC,
+)
+from services.keyword_scanner import RegexKeywordScanner
+
+
+class TestChatExtraction:
+    """Test class for the chat message extractors (which take lowercased text)"""
+
+    def test_from_to_route(self):
+        """Origin and destination come from a "from X to Y" phrase"""
+        message = "plan a trip from new york to paris for 5 days"
+
+        assert _extract_origin(message) == "New York"
+        assert _extract_destination(message) == "Paris"
+
+    def test_travelers(self):
+        """Head counts, word numbers and keyword defaults are recognised"""
+        assert _extract_travelers("trip for 3 people to rome") == 3
+        assert _extract_travelers("two adults going to Lisbon") == 2
+        assert _extract_travelers("a solo trip to tokyo") == 1
+        assert _extract_travelers("family vacation to orlando") == 4
+        assert _extract_travelers("going to rome") is None
+
+    def test_travelers_head_count_beats_keywords(self):
+        """An explicit head count wins over a keyword default wherever it appears"""
+        assert _extract_travelers("family trip for 5 people") == 5
+        assert _extract_travelers("for 2 starting monday") == 2
+        assert _extract_travelers("for 30 starting monday") is None
+
+    def test_duration_days(self):
+        """Durations are read from "N days" and "N-day trip" phrasing"""
+        assert _extract_duration_days("go to rome for 7 days") == 7
+        assert _extract_duration_days("a 4-day trip to Oslo") == 4
+        assert _extract_duration_days("for 500 days") is None
+
+    def test_budget(self):
+        """Dollar amounts take priority over budget keywords"""
+        assert _extract_budget("cheap trip, $400 per day") == ("luxury", 400)
+        assert _extract_budget("a cheap trip to Bangkok") == ("budget", None)
+        assert _extract_budget("going to rome") == (None, None)
+
+    def test_interests(self):
+        """Every category with a matching keyword is returned, in table order"""
+        assert _extract_interests("beaches, museums and street food") == ["beach", "culture", "food"]
+        assert _extract_interests("nothing planned yet") is None
+
+    def test_keyword_scanners_match_substring_search(self):
+        """Both scanner backends agree with plain substring checks, overlaps included"""
+        categories_by_keyword = {}
+        for category, keywords in _INTEREST_KEYWORDS.items():
+            for keyword in keywords:
+                categories_by_keyword.setdefault(keyword, set()).add(category)
+        regex_scanner = RegexKeywordScanner(categories_by_keyword)
+
+        for message in ["a party at the spa market", "seaside barbecue", "nothing here"]:
+            expected = [
+                category for category, keywords in _INTEREST_KEYWORDS.items()
+                if any(keyword in message for keyword in keywords)
+            ]
+            assert _keyword_categories(message, _INTEREST_KEYWORDS, _INTEREST_AC) == expected
+            assert _keyword_categories(message, _INTEREST_KEYWORDS, regex_scanner) == expected
+
+    def test_start_date_uses_first_mentioned_month_date(self):
+        """Numeric dates win; otherwise the earliest month-name date is used"""
+        assert _extract_start_date("from dec 28 to jan 3").endswith("-12-28")
+        assert _extract_start_date("march 3 or 12/24/2025") == "2025-12-24"
+        assert _extract_start_date("sometime soon") is None
+
+    def test_parse_message_matches_individual_extractors(self):
+        """The fused parser returns what the separate extractors would"""
+        message = "plan a trip from seattle to san francisco for 2 people on july 4, luxury, beach and food"
+
+        parsed = _parse_message(message)
+
+        assert parsed["origin"] == _extract_origin(message) == "Seattle"
+        assert parsed["destination"] == _extract_destination(message) == "San Francisco"
+        assert parsed["travelers"] == _extract_travelers(message) == 2
+        assert parsed["start_date"] == _extract_start_date(message)
+        assert (parsed["budget_range"], parsed["total_budget"]) == _extract_budget(message) == ("luxury", None)
+        assert parsed["interests"] == _extract_interests(message) == ["beach", "food"]
+
+    def test_parse_message_cache_returns_independent_copies(self):
+        """Repeated messages hit the cache without sharing mutable results"""
+        _parse_message_cached.cache_clear()
+        message = "go to lisbon for 4 days, museums and food"
+
+        first = _parse_message(message)
+        first["interests"].append("nightlife")
+        second = _parse_message(message)
+
+        assert second["interests"] == ["culture", "food"]
+        assert _parse_message_cached.cache_info().hits == 1
+
+    def test_start_date_fast_path(self):
+        """Numeric and month-name dates parse the way dateutil reads them"""
+        assert _extract_start_date("leaving 05/06/2025") == "2025-05-06"
+        assert _extract_start_date("leaving 24/12/2025") == "2025-12-24"
+        assert _extract_start_date("leaving 12/24/99") == "1999-12-24"
+        assert _extract_start_date("on 3 march").endswith("-03-03")
+        assert _extract_start_date("on feb 30") is None
+        assert _extract_start_date("room january 32") is None
+
+    def test_confirmation_words_never_trigger_extractors(self):
+        """Skipping the parse for confirmation replies loses no trip details"""
+        words = sorted(_CONFIRMATION_WORDS)
+        for first, second in itertools.product(words, repeat=2):
+            assert _parse_message_uncached(f"{first} {second}") == _NO_TRIP_FIELDS
+        assert _is_confirmation("yes, go ahead!")
+        assert _is_confirmation("ok,sounds good...")
+        assert not _is_confirmation("yes, 3 people")
+
+    def test_first_keyword_category_follows_table_order(self):
+        """The earliest category in the table wins, whatever the message order"""
+        for message in ["cheap but comfortable, maybe luxury", "a cheaper economy trip", "no preference"]:
+            categories = _keyword_categories(message, _BUDGET_KEYWORDS, _BUDGET_AC)
+            assert _first_keyword_category(message, _BUDGET_KEYWORDS, _BUDGET_AC) == (categories[0] if categories else None)
+
+    def test_occasion(self):
+        """The earliest occasion in the table wins, and the fused parser agrees"""
+        for message in ["wedding anniversary getaway", "a work trip, then a birthday dinner", "just going"]:
+            assert _parse_message(message)["occasion"] == _extract_occasion(message)
+        assert _extract_occasion("wedding anniversary getaway") == "anniversary"
+        assert _extract_occasion("a work trip, then a birthday dinner") == "birthday"
+        assert _extract_occasion("just going") is None
+
+    def test_word_numbers_only_replace_whole_words(self):
+        """Number words inside other words are left alone"""
+        assert _extract_travelers("traveling alone to berlin") == 1
+        assert _extract_travelers("we often starting late") is None
+        assert _extract_travelers("three travelers") == 3
+
+    def test_dates_without_a_year_are_upcoming(self):
+        """A month and day that already passed this year mean next year"""
+        today = date(2025, 10, 17)
+        assert _upcoming_date(today, 12, 24) == date(2025, 12, 24)
+        assert _upcoming_date(today, 10, 17) == date(2025, 10, 17)
+        assert _upcoming_date(today, 3, 3) == date(2026, 3, 3)
+        assert _upcoming_date(date(2024, 3, 1), 2, 29) == date(2024, 2, 29)
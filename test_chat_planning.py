@@ -0,0 +1,308 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock
+
+import pytest
+from fastapi import HTTPException
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+
+import api.chat_integration_router as chat_router
+from api.models import TripPlanningRequest
+from services.micro_batcher import AsyncBatcher
+from api.trip_planner_interface import (
+    TripPlanResponse, TripPlanMetadata, ProviderType, TripPlanQuality
+)
+
+
+def _plan_response(success=True):
+    return TripPlanResponse(
+        success=success,
+        itinerary={"days": [{"day": 1, "activities": ["Louvre"]}]} if success else {},
+        metadata=TripPlanMetadata(
+            provider=ProviderType.AI,
+            quality=TripPlanQuality.GOOD,
+            confidence_score=0.9,
+            data_freshness="real_time",
+            last_updated="2025-01-01T00:00:00"
+        ),
+        error_message=None if success else "provider down"
+    )
+
+
+def _trip_request(**overrides):
+    fields = {
+        "origin": "New York",
+        "destination": "Paris",
+        "duration_days": 5,
+        "start_date": "2025-09-01",
+        "travelers": 2,
+        "budget_range": "moderate",
+        "interests": ["food", "culture"],
+    }
+    fields.update(overrides)
+    return TripPlanningRequest(**fields)
+
+
+class TestChatTripPlanning:
+    """Test class for trip planning started from the chat router"""
+
+    def setup_method(self):
+        chat_router.trip_plan_cache.entries.clear()
+
+    def test_identical_trips_reuse_cached_plan(self):
+        """A repeated trip is served from the cache without a provider call"""
+        mock_plan = AsyncMock(return_value=_plan_response())
+        with patch.object(chat_router.enhanced_ai_provider, "plan_trip", mock_plan):
+            first = asyncio.run(chat_router._start_trip_planning(_trip_request()))
+            first["itinerary"]["days"].clear()
+            second = asyncio.run(chat_router._start_trip_planning(
+                _trip_request(origin="new york ", interests=["Culture", "food"])
+            ))
+
+        assert mock_plan.await_count == 1
+        assert second["success"] is True
+        assert second["itinerary"]["days"][0]["activities"] == ["Louvre"]
+
+    def test_failed_plans_are_not_cached(self):
+        """Provider failures are retried on the next request"""
+        mock_plan = AsyncMock(return_value=_plan_response(success=False))
+        with patch.object(chat_router.enhanced_ai_provider, "plan_trip", mock_plan):
+            asyncio.run(chat_router._start_trip_planning(_trip_request()))
+            asyncio.run(chat_router._start_trip_planning(_trip_request()))
+
+        assert mock_plan.await_count == 2
+
+    def test_planning_errors_are_not_sent_to_clients(self):
+        """Exception text stays in the logs; clients get a fixed message"""
+        failing = AsyncMock(side_effect=RuntimeError("secret-api-key rejected"))
+        with patch.object(chat_router.enhanced_ai_provider, "plan_trip", failing):
+            assert asyncio.run(chat_router._start_trip_planning(_trip_request(origin="Oslo"))) == {"success": False}
+            with pytest.raises(HTTPException) as error:
+                asyncio.run(chat_router.start_planning_from_chat(
+                    {"trip_request": {"origin": "Oslo", "destination": "Rome", "duration_days": 3}},
+                    chat_router.trip_plan_batcher
+                ))
+
+        assert error.value.status_code == 500
+        assert "secret" not in error.value.detail
+
+    def test_empty_chat_message_is_a_client_error(self):
+        """A blank message is a 400, not swallowed into a 500"""
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(chat_router.process_chat_message(
+                {"message": "   ", "session_id": "blank", "conversation_state": {}}, chat_router.trip_plan_batcher
+            ))
+        assert error.value.status_code == 400
+
+    def test_concurrent_identical_requests_share_one_provider_call(self):
+        """Requests in the same batch window are planned once per distinct trip"""
+        mock_plan = AsyncMock(return_value=_plan_response())
+        batcher = chat_router.TripPlanBatcher(chat_router.enhanced_ai_provider, window_ms=20)
+        paris = chat_router.TripPlanRequest(origin="NYC", destination="Paris", duration_days=5)
+        rome = chat_router.TripPlanRequest(origin="NYC", destination="Rome", duration_days=3)
+
+        async def run():
+            return await asyncio.gather(batcher.submit(paris), batcher.submit(paris), batcher.submit(rome))
+
+        with patch.object(chat_router.enhanced_ai_provider, "plan_trip", mock_plan):
+            results = asyncio.run(run())
+
+        assert mock_plan.await_count == 2
+        assert all(result.success for result in results)
+        assert results[0] is not results[1]
+
+    def test_extract_trip_info_runs_analysis_alongside_extraction(self):
+        """Smart destination analysis overlaps with trip extraction"""
+        extraction_started = asyncio.Event()
+
+        async def smart_request(message):
+            # Only completes if extraction runs while analysis is in flight
+            await asyncio.wait_for(extraction_started.wait(), timeout=1)
+            return {"trip_type": "single_destination"}
+
+        async def extraction(message, conversation_state):
+            extraction_started.set()
+            return None
+
+        with patch.object(chat_router.smart_destination_service, "create_smart_itinerary_request", smart_request), \
+                patch.object(chat_router, "_extract_trip_request", extraction):
+            result = asyncio.run(chat_router.extract_trip_information({"message": "go to rome"}))
+
+        assert result["extracted_info"] == {"trip_type": "single_destination"}
+        assert result["trip_request"] is None
+
+    def test_field_status_drives_sufficiency_and_suggestions(self):
+        """One field pass yields missing info, confidence and suggestions"""
+        trip_request = _trip_request(start_date=None, end_date="2025-09-06")
+
+        mask, missing = chat_router._field_status(trip_request)
+
+        assert missing == ["start date"]
+        assert not chat_router._has_sufficient_info(trip_request)
+        assert chat_router._calculate_extraction_confidence(mask) == 5 / 6
+        assert chat_router._generate_suggestions(trip_request, missing) == [
+            "When would you like to start your trip? (e.g., 2025-09-20)"
+        ]
+        assert chat_router._has_sufficient_info(_trip_request())
+
+    def test_trip_plan_request_from_trip_planning(self):
+        """The unvalidated fast path builds the same request as validation would"""
+        trip_request = _trip_request()
+
+        fast = chat_router.TripPlanRequest.from_trip_planning(trip_request, {"trip_type": "multi_city"})
+
+        assert fast == chat_router.TripPlanRequest(
+            origin="New York", destination="Paris", duration_days=5, start_date="2025-09-01",
+            travelers=2, budget_range="moderate", trip_type="leisure", interests=["food", "culture"],
+            special_requirements="", smart_trip_data={"trip_type": "multi_city"}
+        )
+        assert type(fast.budget_range) is str
+
+        # Chat turns may assign the raw string from conversation_state after validation
+        trip_request.budget_range = "luxury"
+        assert chat_router.TripPlanRequest.from_trip_planning(trip_request).budget_range == "luxury"
+
+    def test_trip_plan_batcher_dependency_prefers_app_state(self):
+        """Endpoints use the lifespan batcher when the app has one"""
+        lifespan_batcher = chat_router.TripPlanBatcher(chat_router.enhanced_ai_provider)
+        request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(trip_plan_batcher=lifespan_batcher)))
+        bare_request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+
+        assert chat_router.get_trip_plan_batcher(request) is lifespan_batcher
+        assert chat_router.get_trip_plan_batcher(bare_request) is chat_router.trip_plan_batcher
+
+    def test_complete_message_is_planned_once_end_to_end(self):
+        """A complete message is planned in the same response; a follow-up /start-planning reuses it"""
+        mock_plan = AsyncMock(return_value=_plan_response())
+        message = ("Plan a trip from New York to Paris for 5 days for 2 people on 09/01/2027, "
+                   "moderate budget, museums and food, anniversary")
+        with patch.object(chat_router.enhanced_ai_provider, "plan_trip", mock_plan):
+            response = asyncio.run(chat_router.process_chat_message(
+                {"message": message, "session_id": "s1", "conversation_state": {}}, chat_router.trip_plan_batcher
+            ))
+            follow_up = asyncio.run(chat_router.start_planning_from_chat(
+                {"trip_request": response["trip_request"]}, chat_router.trip_plan_batcher
+            ))
+
+        assert response["planning_result"]["success"] is True
+        assert follow_up["success"] is True
+        assert mock_plan.await_count == 1
+
+    def test_process_message_parses_the_message_once(self):
+        """Every branch of a chat turn reads from one fused parse"""
+        chat_router._parse_message_cached.cache_clear()
+        with patch.object(chat_router, "_parse_message_uncached", wraps=chat_router._parse_message_uncached) as parse:
+            response = asyncio.run(chat_router.process_chat_message(
+                {"message": "I want to visit Rome for 4 days", "session_id": "s1", "conversation_state": {}},
+                chat_router.trip_plan_batcher
+            ))
+
+        assert parse.call_count == 1
+        assert response["missing_info"] == ["origin"]
+        assert response["conversation_state"]["duration_days"] == 4
+
+    def test_session_state_is_kept_server_side(self):
+        """A client can omit conversation_state and continue its stored session"""
+        with patch.object(chat_router.enhanced_ai_provider, "plan_trip", AsyncMock(return_value=_plan_response())):
+            asyncio.run(chat_router.process_chat_message(
+                {"message": "I want to visit Rome for 4 days", "session_id": "stored-session", "conversation_state": {}},
+                chat_router.trip_plan_batcher
+            ))
+            stored = asyncio.run(chat_router.conversation_session_store.load("stored-session"))
+            response = asyncio.run(chat_router.process_chat_message(
+                {"message": "make it 2 people", "session_id": "stored-session"}, chat_router.trip_plan_batcher
+            ))
+
+        assert stored["destination"] == "Rome"
+        assert response["conversation_state"]["destination"] == "Rome"
+        assert response["conversation_state"]["duration_days"] == 4
+
+    def test_concurrent_identical_messages_share_one_smart_analysis(self):
+        """Smart destination analysis is batched and deduplicated per window"""
+        calls = []
+
+        async def smart_request(message):
+            calls.append(message)
+            return {"trip_type": "national_park", "destination": "yosemite"}
+
+        async def run():
+            return await asyncio.gather(
+                chat_router.smart_itinerary_batcher.submit("Yosemite trip"),
+                chat_router.smart_itinerary_batcher.submit("yosemite trip "),
+            )
+
+        with patch.object(chat_router.smart_destination_service, "create_smart_itinerary_request", smart_request):
+            first, second = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert first == second and first is not second
+
+    def test_batcher_failures_stay_with_their_own_items(self):
+        """A bad key or a missing result fails only that item, never the rest of the window"""
+        async def echo_all_but_last(items):
+            return [item.upper() for item in items[:-1]]
+
+        batcher = AsyncBatcher(echo_all_but_last, key=lambda item: item.strip().lower(), window_ms=20)
+
+        async def run():
+            return await asyncio.wait_for(asyncio.gather(
+                batcher.submit("paris"), batcher.submit(None), batcher.submit("rome"), return_exceptions=True
+            ), 1)
+
+        paris, bad_key, rome = asyncio.run(run())
+        assert paris == "PARIS"
+        assert isinstance(bad_key, AttributeError)
+        assert isinstance(rome, RuntimeError)
+
+    def test_extract_trip_info_rejects_non_string_messages(self):
+        """A non-string message is a client error, not something to batch"""
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(chat_router.extract_trip_information({"message": None}))
+        assert error.value.status_code == 400
+
+    def test_trip_request_survives_smart_analysis_failure(self):
+        """A failing destination lookup drops only the smart data, not the request"""
+        failing = AsyncMock(side_effect=RuntimeError("maps down"))
+        with patch.object(chat_router.smart_destination_service, "analyze_trip_type", failing):
+            trip_request = asyncio.run(chat_router._extract_trip_request("from boston to rome for 4 days", {}))
+
+        assert trip_request.destination == "Rome"
+        assert asyncio.run(chat_router._extract_trip_request("from boston to rome", {"travelers": "many"})) is None
+
+    def test_malformed_client_input_yields_no_trip_request(self):
+        """Bad message or state types give no request instead of an error"""
+        assert asyncio.run(chat_router._extract_trip_request(None, {})) is None
+        assert asyncio.run(chat_router._extract_trip_request("from boston to rome", None)) is None
+
+        state = {"interests": "museums"}
+        trip_request = asyncio.run(chat_router._extract_trip_request("from boston to rome for 4 days, I love food", state))
+        assert trip_request.destination == "Rome"
+        assert isinstance(state["interests"], list)
+
+    def test_quick_replies_skip_extraction(self):
+        """Quick-reply commands are dispatched directly instead of being parsed as trip details"""
+        state = {
+            "origin": "New York", "destination": "Paris", "duration_days": 5, "start_date": "2027-09-01",
+            "travelers": 2, "budget_range": "moderate", "missing_info": ["origin"]
+        }
+        mock_plan = AsyncMock(return_value=_plan_response())
+        with patch.object(chat_router, "_parse_message", side_effect=AssertionError("parsed")), \
+                patch.object(chat_router.enhanced_ai_provider, "plan_trip", mock_plan):
+            shown = asyncio.run(chat_router.process_chat_message(
+                {"message": "Show me the plan", "session_id": "quick", "conversation_state": dict(state)},
+                chat_router.trip_plan_batcher
+            ))
+            reset = asyncio.run(chat_router.process_chat_message(
+                {"message": "Start over", "session_id": "quick"}, chat_router.trip_plan_batcher
+            ))
+            stored = asyncio.run(chat_router.conversation_session_store.load("quick"))
+
+        assert shown["planning_result"]["success"] is True
+        assert mock_plan.await_count == 1
+        assert reset["state"] == "greeting"
+        assert stored == {}
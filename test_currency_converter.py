@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from api.currency_converter import CurrencyConverter
+
+
+def _rates_session(rates, status=200):
+    """A stand-in aiohttp session whose GET returns the given rates"""
+    response = MagicMock(status=status)
+    response.json = AsyncMock(return_value={"rates": rates})
+    session = MagicMock(closed=False)
+    session.get.return_value.__aenter__ = AsyncMock(return_value=response)
+    session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+    return session
+
+
+class TestCurrencyConverter:
+    """Test cases for CurrencyConverter."""
+
+    def test_attached_session_is_reused(self):
+        """Test that rate lookups go through the attached session without closing it."""
+        converter = CurrencyConverter()
+        converter.http_session = _rates_session({"USD": 0.012})
+
+        rate = asyncio.run(converter.get_exchange_rate("INR", "USD"))
+
+        assert rate == 0.012
+        converter.http_session.get.assert_called_once()
+        converter.http_session.close.assert_not_called()
+
+    def test_concurrent_misses_share_one_fetch(self):
+        """Test that simultaneous lookups for a cold pair make a single API call."""
+        converter = CurrencyConverter()
+        converter.http_session = _rates_session({"USD": 1.1})
+
+        async def lookups():
+            return await asyncio.gather(*(converter.get_exchange_rate("EUR", "USD") for _ in range(5)))
+
+        assert asyncio.run(lookups()) == [1.1] * 5
+        converter.http_session.get.assert_called_once()
+        assert converter._inflight == {}
+
+    def test_stale_rate_is_served_while_refreshing(self):
+        """Test that a stale rate is returned at once and refreshed in the background."""
+        converter = CurrencyConverter()
+        converter.http_session = _rates_session({"USD": 0.8})
+
+        asyncio.run(converter.get_exchange_rate("GBP", "USD"))
+        asyncio.run(converter.get_exchange_rate("GBP", "USD"))
+        assert converter.http_session.get.call_count == 1
+
+        _, usable_until, _ = converter.cache["GBP_USD"]
+        converter.cache["GBP_USD"] = (time.monotonic() - 1, usable_until, 0.7)
+
+        async def stale_lookup():
+            rate = await converter.get_exchange_rate("GBP", "USD")
+            await asyncio.gather(*converter._inflight.values())
+            return rate
+
+        assert asyncio.run(stale_lookup()) == 0.7
+        assert converter.http_session.get.call_count == 2
+        assert converter.cache["GBP_USD"][2] == 0.8
+
+    def test_expired_rate_is_refetched(self):
+        """Test that a rate past its stale window blocks on a new fetch."""
+        converter = CurrencyConverter()
+        converter.http_session = _rates_session({"USD": 0.8})
+        converter.cache["GBP_USD"] = (time.monotonic() - 2, time.monotonic() - 1, 0.7)
+
+        assert asyncio.run(converter.get_exchange_rate("GBP", "USD")) == 0.8
+        converter.http_session.get.assert_called_once()
+
+    def test_one_fetch_serves_both_directions(self):
+        """Test that a base-currency response also answers the reverse display conversion."""
+        converter = CurrencyConverter()
+        converter.http_session = _rates_session({"USD": 1.0, "INR": 80.0, "EUR": 0.5})
+
+        assert asyncio.run(converter.get_exchange_rate("USD", "INR")) == 80.0
+        assert asyncio.run(converter.convert_price_for_display(10, "USD", "EUR")) == 5.0
+        assert asyncio.run(converter.get_exchange_rate("INR", "USD")) == 1 / 80.0
+        converter.http_session.get.assert_called_once()
+
+    def test_codes_are_normalized_and_validated(self):
+        """Test that codes share a cache entry across spellings and bogus codes make no API call."""
+        converter = CurrencyConverter()
+        converter.http_session = _rates_session({"USD": 0.012})
+
+        assert asyncio.run(converter.get_exchange_rate("inr ", "usd")) == 0.012
+        assert asyncio.run(converter.get_exchange_rate("INR", "USD")) == 0.012
+        assert asyncio.run(converter.get_exchange_rate("XYZ", "USD")) is None
+        assert asyncio.run(converter.convert_price(10, "usd", "USD")) == 10.0
+        converter.http_session.get.assert_called_once()
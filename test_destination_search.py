@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import Response
+
+from services.destination_index import DestinationIndex
+
+MAJOR = [
+    {"column_1": "LAX", "airport_name": "Los Angeles International", "city_name": "Los Angeles, CA", "country_name": "United States"},
+    {"column_1": "BOS", "airport_name": "Logan International", "city_name": "Boston, MA", "country_name": "United States"},
+]
+FULL = [
+    {"column_1": "MHT", "airport_name": "Manchester-boston Regional Airport", "city_name": "Manchester", "country_name": "United States"},
+    {"column_1": "FXM", "airport_name": "Flaxman Island", "city_name": "Flaxman Island", "country_name": "United States"},
+    {"column_1": "LAX", "airport_name": "Los Angeles International", "city_name": "Los Angeles", "country_name": "United States"},
+]
+
+
+class TestDestinationIndex:
+    """Test cases for the destination autocomplete index."""
+
+    def test_matches_from_any_word_start(self):
+        """Test that queries match at word starts, across fields and list order."""
+        index = DestinationIndex(MAJOR, FULL)
+
+        assert index.search("los an") == [0, 4]
+        assert index.search("boston") == [1, 2]
+        assert index.search("lax") == [0, 4]
+        assert index.search("intern") == [0, 1, 4]
+
+    def test_mid_word_text_does_not_match(self):
+        """Test that text inside a word is not an autocomplete match."""
+        index = DestinationIndex(MAJOR, FULL)
+
+        assert 3 not in index.search("lax")
+        assert index.search("ngeles") == []
+
+    def test_keystrokes_narrow_the_previous_range(self):
+        """Test that typing a query one character at a time finds what a cold lookup finds."""
+        typed = DestinationIndex(MAJOR, FULL)
+        for end in range(1, len("los angeles") + 1):
+            typed.search("los angeles"[:end])
+
+        assert typed.search("los angeles") == DestinationIndex(MAJOR, FULL).search("los angeles")
+        assert typed._prefix_range("los angeles") == DestinationIndex(MAJOR, FULL)._prefix_range("los angeles")
+
+    def test_multi_word_query_matches_any_whole_word(self):
+        """Test that a query like "paris france" still finds airports by one of its words."""
+        index = DestinationIndex(MAJOR, FULL)
+
+        assert index.search("manchester uk") == [2]
+
+
+class TestDestinationSearch:
+    """Test cases for the /api/destinations/search endpoint."""
+
+    def test_search_prefers_major_airports_and_skips_duplicates(self):
+        """Test that results are ranked, limited and listed once per IATA code."""
+        os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+        import api.destination_router as destination_router
+
+        response = asyncio.run(destination_router.search_destinations("los angeles", Response(), limit=10))
+        result = json.loads(response.body)
+        codes = [destination["iata_code"] for destination in result["destinations"]]
+
+        assert codes[0] == "LAX"
+        assert len(codes) == len(set(codes))
+        assert result["total_found"] == len(codes)
+        assert result["destinations"][0]["relevance_score"] > result["destinations"][-1]["relevance_score"]
+        assert response.headers["cache-control"] == "public, max-age=600"
+        assert asyncio.run(destination_router.search_destinations("l", Response(), limit=10)) == {"destinations": []}
+
+    def test_repeated_queries_are_served_from_cache(self):
+        """Test that retyping a query reuses its results without searching the index again."""
+        os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+        import api.destination_router as destination_router
+
+        destination_router._search_cached.cache_clear()
+        with patch.object(destination_router.destination_index, "search", wraps=destination_router.destination_index.search) as search:
+            first = asyncio.run(destination_router.search_destinations("Pari", Response(), limit=5))
+            second = asyncio.run(destination_router.search_destinations("pari ", Response(), limit=5))
+
+        assert search.call_count == 1
+        assert json.loads(first.body)["destinations"] == json.loads(second.body)["destinations"]
+        assert json.loads(second.body)["query"] == "pari "
+
+    def test_query_with_lone_surrogate_is_echoed_safely(self):
+        """Test that a query the client can't round-trip through UTF-8 still gets a JSON response."""
+        os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+        import api.destination_router as destination_router
+
+        response = asyncio.run(destination_router.search_destinations("paris\ud800", Response(), limit=5))
+
+        assert json.loads(response.body)["query"] == "paris\ufffd"
+
+    def test_popular_destinations_body_is_prebuilt(self):
+        """Test that the popular list is served from its encoded body with a cache header."""
+        os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+        import api.destination_router as destination_router
+
+        response = asyncio.run(destination_router.get_popular_destinations())
+
+        assert response.headers["cache-control"] == "public, max-age=86400"
+        assert json.loads(response.body)["destinations"][0]["iata_code"] == "JFK"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+from datetime import datetime
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("RAPID_API_KEY", "test_key_for_testing")
+
+import api.enhanced_parser as enhanced_parser
+from api.enhanced_parser import _resolve_relative_dates
+
+
+class _FixedDatetime(datetime):
+    """datetime whose now() is Monday 2025-06-23, 12:00"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 6, 23, 12)
+
+
+class TestResolveRelativeDates:
+    """Test cases for resolving relative dates before a query is parsed."""
+
+    def setup_method(self):
+        self.fixed_now = patch.object(enhanced_parser, "datetime", _FixedDatetime)
+        self.fixed_now.start()
+
+    def teardown_method(self):
+        self.fixed_now.stop()
+
+    def test_month_day_dates(self):
+        """Test that every month-day mention is resolved, rolling past dates into next year."""
+        assert _resolve_relative_dates("Paris June 30th to July 4th") == "paris 2025-06-30 to 2025-07-04"
+        assert _resolve_relative_dates("march 15th and december 1") == "2026-03-15 and 2025-12-01"
+        # Today at midnight is already behind the current time
+        assert _resolve_relative_dates("june 23rd") == "2026-06-23"
+
+    def test_relative_words(self):
+        """Test that tomorrow, next week and next month become dates."""
+        assert _resolve_relative_dates("leaving tomorrow") == "leaving 2025-06-24"
+        assert _resolve_relative_dates("next week or next month") == "2025-06-30 or 2025-07-23"
+
+    def test_weekdays_use_the_earliest_day_of_the_week(self):
+        """Test that only the earliest weekday in the week is resolved, and today means next week."""
+        assert _resolve_relative_dates("sunday or wednesday") == "sunday or 2025-06-25"
+        assert _resolve_relative_dates("this monday") == "this 2025-06-30"
+
+    def test_month_names_use_the_earliest_month_of_the_year(self):
+        """Test that a bare month resolves to its first day, skipping month-day dates."""
+        assert _resolve_relative_dates("august or march") == "august or 2026-03-01"
+        assert _resolve_relative_dates("august 15th in august") == "2025-08-15 in 2025-08-01"
+        assert _resolve_relative_dates("in february") == "in 2026-02-01"
+
+    def test_words_containing_date_names_are_left_alone(self):
+        """Test that only whole-word months and weekdays are resolved."""
+        assert _resolve_relative_dates("Mayfair to Sundayville") == "mayfair to sundayville"
+        assert _resolve_relative_dates("flight to nyc") == "flight to nyc"
+        assert _resolve_relative_dates("may_1 or friday2") == "may_1 or friday2"
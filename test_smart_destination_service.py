@@ -10,6 +10,7 @@ from unittest.mock import Mock, patch, AsyncMock
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from services.smart_destination_service import SmartDestinationService
+from services.http_session import client_session
 
 class TestSmartDestinationService:
     """Test cases for SmartDestinationService."""
@@ -321,6 +322,41 @@ class TestSmartDestinationService:
         
         # Service should still be created but log an error
         assert service is not None
+    
+    def test_airport_recommendation_is_reused_for_same_destination(self, service):
+        """Test that repeat lookups are served from the recommendation cache."""
+        
+        recommendation = {"primary_airport": "FAT.AIRPORT", "airport_name": "Fresno Yosemite"}
+        with patch.object(service, "_fetch_smart_airport_recommendation", AsyncMock(return_value=recommendation)) as mock_fetch:
+            first = asyncio.run(service.get_smart_airport_recommendation("Yosemite", "national_park"))
+            first["airport_name"] = "changed"
+            second = asyncio.run(service.get_smart_airport_recommendation("yosemite ", "national_park"))
+        
+        assert mock_fetch.await_count == 1
+        assert second["airport_name"] == "Fresno Yosemite"
+    
+    def test_failed_airport_recommendation_is_not_cached(self, service):
+        """Test that empty recommendations are fetched again."""
+        
+        with patch.object(service, "_fetch_smart_airport_recommendation", AsyncMock(return_value=None)) as mock_fetch:
+            asyncio.run(service.get_smart_airport_recommendation("Zion", "national_park"))
+            asyncio.run(service.get_smart_airport_recommendation("Zion", "national_park"))
+        
+        assert mock_fetch.await_count == 2
+    
+    def test_attached_http_session_is_shared(self, service):
+        """Test that an attached session is used by the service and its maps service."""
+        
+        shared = Mock(closed=False)
+        service.attach_http_session(shared)
+        
+        async def session_used():
+            async with client_session(service.http_session) as session:
+                return session
+        
+        assert asyncio.run(session_used()) is shared
+        if service.maps_weather_service:
+            assert service.maps_weather_service.http_session is shared
 
 def run_integration_tests():
     """Run integration tests with real API calls (optional)."""